@@ -4,28 +4,86 @@ from __future__ import annotations
 
 import logging
 
-from pygryfsmart.api import GryfApi, GryfExpert
+from pygryfsmart.api import GryfExpert
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers.discovery import async_load_platform
 from homeassistant.helpers.typing import ConfigType
 
-from .schema import CONFIG_SCHEMA
+from .schema import (
+    CONFIG_SCHEMA,
+    SEARCH_MODULES_SCHEMA,
+    SET_OUTPUTS_SCHEMA,
+    YAML_SEARCH_MODULES_SCHEMA,
+    YAML_SET_OUTPUTS_SCHEMA,
+)
+from .batcher import OUTPUT_ACTIONS
+from .connection import async_get_connection_pool
 from .const import (
     CONF_API,
+    CONF_BATCHER,
     CONF_COMMUNICATION,
+    CONF_CONCURRENCY,
     CONF_DEVICE_DATA,
+    CONF_DISPATCHER,
+    CONF_FADER,
+    CONF_FIRST,
+    CONF_LAST,
+    CONF_METRICS,
+    CONF_OPTIMISTIC,
     CONF_PORT,
+    CONF_POLLER,
+    CONF_SCHEDULER,
+    CONF_SEARCH,
+    CONF_STALE_TIMEOUT,
+    CONF_TIMEOUT,
+    CONF_TOPOLOGY,
+    CONF_TRACE,
+    CONF_UPDATE_INTERVAL,
+    DEFAULT_OPTIMISTIC,
+    DEFAULT_STALE_TIMEOUT,
+    DEFAULT_UPDATE_INTERVAL,
     DOMAIN,
     CONF_GRYF_EXPERT,
+    CONF_ID,
     CONF_MODULE_COUNT,
+    CONF_OUTPUTS,
+    CONF_STATE,
     HOMEASSISTANT_PLATFORMS,
 )
+from .search import GryfModuleSearch
 
 _LOGGER = logging.getLogger(__name__)
 
+
+def _output_actions(call: ServiceCall) -> dict[tuple[int, int], int]:
+    """Return the (module, pin) actions requested by a set_outputs call."""
+
+    return {
+        (output[CONF_ID] // 10, output[CONF_ID] % 10): OUTPUT_ACTIONS[output[CONF_STATE]]
+        for output in call.data[CONF_OUTPUTS]
+    }
+
+
+async def _async_search_modules(
+    search: GryfModuleSearch, call: ServiceCall, module_count: int
+) -> ServiceResponse:
+    """Search the addresses requested by a search_modules call."""
+
+    return await search.async_search(
+        range(call.data[CONF_FIRST], call.data.get(CONF_LAST, module_count) + 1),
+        call.data[CONF_CONCURRENCY],
+        call.data[CONF_TIMEOUT],
+    )
+
+
 async def async_setup(
     hass: HomeAssistant,
     config: ConfigType,
@@ -36,19 +94,30 @@ async def async_setup(
         return True
 
     try:
-        port = config[DOMAIN][CONF_PORT]
-        module_count = config[DOMAIN][CONF_MODULE_COUNT]
-
-        api = await hass.async_add_executor_job(GryfApi, port)
-        await hass.async_add_executor_job(api.start_connection)
-        await hass.async_add_executor_job(api.start_update_interval, 1)
-        await hass.async_add_executor_job(api.set_module_count, module_count)
+        connection = await async_get_connection_pool(hass).async_acquire(
+            config[DOMAIN][CONF_PORT],
+            config[DOMAIN][CONF_MODULE_COUNT],
+            config[DOMAIN][CONF_UPDATE_INTERVAL],
+            config[DOMAIN][CONF_STALE_TIMEOUT],
+        )
     except ConnectionError:
         _LOGGER.error("Unable to connect: %s", ConnectionError)
         return False
 
+    api = connection.api
+    batcher = connection.batcher
+
     hass.data[DOMAIN] = config.get(DOMAIN)
     hass.data[DOMAIN][CONF_API] = api
+    hass.data[DOMAIN][CONF_SCHEDULER] = connection.scheduler
+    hass.data[DOMAIN][CONF_POLLER] = connection.poller
+    hass.data[DOMAIN][CONF_DISPATCHER] = connection.dispatcher
+    hass.data[DOMAIN][CONF_BATCHER] = batcher
+    hass.data[DOMAIN][CONF_FADER] = connection.fader
+    hass.data[DOMAIN][CONF_METRICS] = connection.metrics
+    hass.data[DOMAIN][CONF_TRACE] = connection.trace
+    hass.data[DOMAIN][CONF_TOPOLOGY] = connection.topology
+    hass.data[DOMAIN][CONF_SEARCH] = connection.search
 
     async def handle_reset(call: ServiceCall):
         await api.reset(0, True)
@@ -67,12 +136,28 @@ async def async_setup(
             
             await hass.data[CONF_GRYF_EXPERT].stop_server()
 
-    async def handle_search_modules(call: ServiceCall):
-        await api.search_modules(config[DOMAIN][CONF_MODULE_COUNT])
+    async def handle_search_modules(call: ServiceCall) -> ServiceResponse:
+        return await _async_search_modules(
+            connection.search, call, config[DOMAIN][CONF_MODULE_COUNT]
+        )
+
+    async def handle_set_outputs(call: ServiceCall):
+        await batcher.async_set_outputs(_output_actions(call))
 
     hass.services.async_register(DOMAIN, "yaml_reset", handle_reset)
     hass.services.async_register(DOMAIN, "yaml_gryf_expert", handle_gryf_expert)
-    hass.services.async_register(DOMAIN, "yaml_search_modules", handle_search_modules)
+    hass.services.async_register(
+        DOMAIN,
+        "yaml_search_modules",
+        handle_search_modules,
+        schema=YAML_SEARCH_MODULES_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(DOMAIN, "yaml_set_outputs", handle_set_outputs, schema=YAML_SET_OUTPUTS_SCHEMA)
+
+    hass.async_create_background_task(
+        connection.async_sweep(), "gryfsmart initial sweep"
+    )
 
     for PLATFORM in HOMEASSISTANT_PLATFORMS:
         await async_load_platform(hass , PLATFORM , DOMAIN , None , config)
@@ -86,26 +171,33 @@ async def async_setup_entry(
 ) -> bool:
     """Config flow for Gryf Smart Integration."""
 
-    if DOMAIN in hass.data and hass.data[DOMAIN][CONF_API] and hass.data[DOMAIN][CONF_API].port == entry.data[CONF_COMMUNICATION][CONF_PORT]:
-        api = hass.data[DOMAIN][CONF_API]
-        entry.runtime_data = {}
-        entry.runtime_data[CONF_API] = api
-
-    else:
-        try:
-            port = entry.data[CONF_COMMUNICATION][CONF_PORT]
-            module_count = entry.data[CONF_COMMUNICATION][CONF_MODULE_COUNT]
-
-            api = await hass.async_add_executor_job(GryfApi, port)
-            await hass.async_add_executor_job(api.start_connection)
-            await hass.async_add_executor_job(api.start_update_interval, 1)
-            await hass.async_add_executor_job(api.set_module_count, module_count)
+    communication = entry.data[CONF_COMMUNICATION]
+    try:
+        connection = await async_get_connection_pool(hass).async_acquire(
+            communication[CONF_PORT],
+            communication[CONF_MODULE_COUNT],
+            communication.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL),
+            communication.get(CONF_STALE_TIMEOUT, DEFAULT_STALE_TIMEOUT),
+        )
+    except ConnectionError:
+        raise ConfigEntryNotReady("Unable to connect with device") from ConnectionError
 
-        except ConnectionError:
-            raise ConfigEntryNotReady("Unable to connect with device") from ConnectionError
+    api = connection.api
 
     entry.runtime_data = {}
     entry.runtime_data[CONF_API] = api
+    entry.runtime_data[CONF_SCHEDULER] = connection.scheduler
+    entry.runtime_data[CONF_POLLER] = connection.poller
+    entry.runtime_data[CONF_DISPATCHER] = connection.dispatcher
+    entry.runtime_data[CONF_BATCHER] = connection.batcher
+    entry.runtime_data[CONF_FADER] = connection.fader
+    entry.runtime_data[CONF_OPTIMISTIC] = communication.get(
+        CONF_OPTIMISTIC, DEFAULT_OPTIMISTIC
+    )
+    entry.runtime_data[CONF_METRICS] = connection.metrics
+    entry.runtime_data[CONF_TRACE] = connection.trace
+    entry.runtime_data[CONF_TOPOLOGY] = connection.topology
+    entry.runtime_data[CONF_SEARCH] = connection.search
     entry.runtime_data[CONF_DEVICE_DATA] = {
         "identifiers": {(DOMAIN, "Gryf Smart", entry.unique_id)},
         "name": f"Gryf Smart {entry.unique_id}",
@@ -149,7 +241,21 @@ async def async_setup_entry(
             
             await entry.runtime_data[CONF_GRYF_EXPERT].stop_server()
 
-    async def handle_search_modules(call: ServiceCall):
+    async def handle_search_modules(call: ServiceCall) -> ServiceResponse:
+        entry_id = call.data["entry_id"]
+
+        entry = hass.config_entries.async_get_entry(entry_id)
+        if entry is None:
+            _LOGGER.error(f"Config entry: {entry_id} not found")
+            return None
+
+        return await _async_search_modules(
+            entry.runtime_data[CONF_SEARCH],
+            call,
+            entry.data[CONF_COMMUNICATION][CONF_MODULE_COUNT],
+        )
+
+    async def handle_set_outputs(call: ServiceCall):
         entry_id = call.data["entry_id"]
 
         entry = hass.config_entries.async_get_entry(entry_id)
@@ -157,20 +263,35 @@ async def async_setup_entry(
             _LOGGER.error(f"Config entry: {entry_id} not found")
             return
 
-        api = entry.runtime_data[CONF_API]
-        await api.search_modules(entry.data.get(CONF_MODULE_COUNT, None))
+        batcher = entry.runtime_data[CONF_BATCHER]
+        await batcher.async_set_outputs(_output_actions(call))
 
     hass.services.async_register(DOMAIN, "reset", handle_reset)
     hass.services.async_register(DOMAIN, "gryf_expert", handle_gryf_expert)
-    hass.services.async_register(DOMAIN, "search_modules", handle_search_modules)
+    hass.services.async_register(
+        DOMAIN,
+        "search_modules",
+        handle_search_modules,
+        schema=SEARCH_MODULES_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(DOMAIN, "set_outputs", handle_set_outputs, schema=SET_OUTPUTS_SCHEMA)
+
+    entry.async_create_background_task(
+        hass, connection.async_sweep(), "gryfsmart initial sweep"
+    )
 
     await hass.config_entries.async_forward_entry_setups(entry, HOMEASSISTANT_PLATFORMS)
 
-    await api.async_update_states()
-
     return True
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
 
-    return await hass.config_entries.async_unload_platforms(entry, HOMEASSISTANT_PLATFORMS)
+    if not await hass.config_entries.async_unload_platforms(entry, HOMEASSISTANT_PLATFORMS):
+        return False
+
+    await async_get_connection_pool(hass).async_release(
+        entry.data[CONF_COMMUNICATION][CONF_PORT]
+    )
+    return True
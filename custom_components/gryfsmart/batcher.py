@@ -0,0 +1,298 @@
+"""Batch Gryf Smart output and shutter commands into one frame per module."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Collection
+from dataclasses import dataclass, field
+import logging
+import time
+
+from pygryfsmart.const import DriverActions, DriverFunctions, OutputActions, ShutterStates
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    COVER_CLOSING,
+    COVER_OPENING,
+    COVER_STOPPED,
+    OUTPUT_CONFIRM_TIMEOUT,
+    OUTPUT_RETRIES,
+)
+from .dispatcher import GryfDispatcher
+from .frames import cover_frame, output_frame
+from .metrics import GryfMetrics
+from .scheduler import GryfCommandScheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+OUTPUT_ACTIONS = {
+    "on": OutputActions.ON,
+    "off": OutputActions.OFF,
+    "toggle": OutputActions.TOGGLE,
+}
+
+# The state a shutter reports once it carries out an operation.
+COVER_OPERATION_STATES = {
+    ShutterStates.OPEN: COVER_OPENING,
+    ShutterStates.CLOSE: COVER_CLOSING,
+    ShutterStates.STOP: COVER_STOPPED,
+}
+
+
+@dataclass
+class _Flush:
+    """The callers waiting on the commands of one flush."""
+
+    done: asyncio.Future[set[tuple[int, int]]]
+    written: list[Callable[[], None]] = field(default_factory=list)
+
+
+class GryfOutputBatcher:
+    """Group output and shutter commands issued in the same loop iteration.
+
+    Commands are collected until the event loop gets to the scheduled
+    flush, then every module gets a single AT+SetOut frame for all of its
+    pending outputs and a single AT+SetRol frame for all of its pending
+    shutters, so shutters driven together start together. The frame is
+    repeated for pins the module did not confirm in time, and callers are
+    told which of their pins stayed unconfirmed.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        scheduler: GryfCommandScheduler,
+        dispatcher: GryfDispatcher,
+        metrics: GryfMetrics,
+    ) -> None:
+        """Init the batcher."""
+
+        self._hass = hass
+        self._metrics = metrics
+        self._scheduler = scheduler
+        self._dispatcher = dispatcher
+        self._pending: dict[int, dict[int, int]] = {}
+        self._pending_covers: dict[int, dict[int, tuple[int, int]]] = {}
+        self._latest: dict[tuple[str, int, int], object] = {}
+        self._flushed: _Flush | None = None
+
+    async def async_set_out(
+        self,
+        module: int,
+        pin: int,
+        action: int,
+        written: Callable[[], None] | None = None,
+    ) -> bool:
+        """Set a single output, return whether the module confirmed it.
+
+        The written callback is called once the frames of the flush were
+        written, before waiting for the confirmation.
+        """
+
+        return not await self.async_set_outputs({(module, pin): action}, written)
+
+    async def async_set_outputs(
+        self,
+        actions: dict[tuple[int, int], int],
+        written: Callable[[], None] | None = None,
+    ) -> set[tuple[int, int]]:
+        """Set many outputs, return the (module, pin) the module did not confirm."""
+
+        for (module, pin), action in actions.items():
+            self._pending.setdefault(module, {})[pin] = action
+
+        return await self._async_wait_flush(written) & actions.keys()
+
+    async def async_set_cover(
+        self, module: int, pin: int, operation: int, travel_time: int
+    ) -> bool:
+        """Drive a shutter, return whether the module confirmed it."""
+
+        self._pending_covers.setdefault(module, {})[pin] = (operation, travel_time)
+
+        return (module, pin) not in await self._async_wait_flush()
+
+    async def _async_wait_flush(
+        self, written: Callable[[], None] | None = None
+    ) -> set[tuple[int, int]]:
+        """Schedule the flush if needed and wait for it."""
+
+        if self._flushed is None:
+            self._flushed = _Flush(self._hass.loop.create_future())
+            self._hass.loop.call_soon(self._schedule_flush)
+
+        if written is not None:
+            self._flushed.written.append(written)
+
+        return await asyncio.shield(self._flushed.done)
+
+    @callback
+    def _schedule_flush(self) -> None:
+        """Hand the collected commands over to a flush task."""
+
+        pending, self._pending = self._pending, {}
+        covers, self._pending_covers = self._pending_covers, {}
+        flushed, self._flushed = self._flushed, None
+
+        self._hass.async_create_background_task(
+            self._async_flush(pending, covers, flushed), "gryfsmart output flush"
+        )
+
+    async def _async_flush(
+        self,
+        pending: dict[int, dict[int, int]],
+        covers: dict[int, dict[int, tuple[int, int]]],
+        flushed: _Flush,
+    ) -> None:
+        """Send one frame per module and function."""
+
+        unwritten = len(pending) + len(covers)
+
+        def written() -> None:
+            nonlocal unwritten
+            unwritten -= 1
+            if not unwritten:
+                for listener in flushed.written:
+                    listener()
+
+        try:
+            results = await asyncio.gather(
+                *(
+                    self._async_send_module(module, actions, written)
+                    for module, actions in pending.items()
+                ),
+                *(
+                    self._async_send_covers(module, operations, written)
+                    for module, operations in covers.items()
+                ),
+            )
+        except Exception as e:  # noqa: BLE001
+            flushed.done.set_exception(e)
+        else:
+            flushed.done.set_result(set().union(*results))
+
+    async def _async_send_covers(
+        self,
+        module: int,
+        operations: dict[int, tuple[int, int]],
+        written: Callable[[], None],
+    ) -> set[tuple[int, int]]:
+        """Send the module shutter frame and repeat it until the module confirms.
+
+        The frame has a single time for all shutters, so the longest one is
+        used. Shutters with a shorter travel reach their end and stop there.
+        """
+
+        travel_time = max(seconds for _, seconds in operations.values())
+
+        return await self._async_send_confirmed(
+            module,
+            DriverFunctions.COVER,
+            DriverActions.SET_COVER,
+            set(operations),
+            {
+                pin: COVER_OPERATION_STATES[operation]
+                for pin, (operation, _) in operations.items()
+            },
+            lambda pins: cover_frame(
+                module, travel_time, {pin: operations[pin][0] for pin in pins}
+            ),
+            written,
+        )
+
+    async def _async_send_module(
+        self, module: int, actions: dict[int, int], written: Callable[[], None]
+    ) -> set[tuple[int, int]]:
+        """Send the module frame and repeat it until the module confirms."""
+
+        return await self._async_send_confirmed(
+            module,
+            DriverFunctions.OUTPUTS,
+            DriverActions.SET_OUT,
+            set(actions),
+            {
+                pin: int(action == OutputActions.ON)
+                for pin, action in actions.items()
+                if action in (OutputActions.ON, OutputActions.OFF)
+            },
+            lambda pins: output_frame(module, {pin: actions[pin] for pin in pins}),
+            written,
+        )
+
+    async def _async_send_confirmed(
+        self,
+        module: int,
+        function: str,
+        action: str,
+        pins: Collection[int],
+        expected: dict[int, int],
+        build: Callable[[Collection[int]], str],
+        written: Callable[[], None],
+    ) -> set[tuple[int, int]]:
+        """Send the frame for the pins, repeat it for the unconfirmed ones.
+
+        A pin counts as confirmed once the module reports the expected
+        state for it. A newer command for the same pin takes it over, so
+        the old one is not repeated over it. Return the (module, pin) left
+        unconfirmed.
+        """
+
+        command = object()
+        for pin in pins:
+            self._latest[(action, module, pin)] = command
+        confirmed = asyncio.Event()
+
+        def confirm(pin: int):
+            async def async_confirm(state) -> None:
+                if expected.get(pin) == state:
+                    del expected[pin]
+                    if not expected:
+                        confirmed.set()
+
+            return async_confirm
+
+        unsubscribes = [
+            self._dispatcher.subscribe(module, pin, function, confirm(pin))
+            for pin in expected
+        ]
+
+        started = time.monotonic()
+        sent: float | None = None
+        try:
+            for _ in range(OUTPUT_RETRIES):
+                await self._scheduler.async_send(
+                    build(pins), key=(action, module, tuple(sorted(pins)))
+                )
+                if sent is None:
+                    sent = time.monotonic()
+                    written()
+                if not expected:
+                    return set()
+
+                try:
+                    async with asyncio.timeout(OUTPUT_CONFIRM_TIMEOUT):
+                        await confirmed.wait()
+                    now = time.monotonic()
+                    self._metrics.record_command_latency(now - started)
+                    self._metrics.record_confirm_latency(now - sent)
+                    return set()
+                except TimeoutError:
+                    for pin in tuple(expected):
+                        if self._latest.get((action, module, pin)) is not command:
+                            del expected[pin]
+                    if not expected:
+                        return set()
+                    pins = set(expected)
+
+            self._metrics.record_timeout(module)
+            _LOGGER.warning(
+                "Module %s did not confirm %s for pins %s", module, action, sorted(expected)
+            )
+            return {(module, pin) for pin in expected}
+        finally:
+            for unsubscribe in unsubscribes:
+                unsubscribe()
+            for pin in pins:
+                if self._latest.get((action, module, pin)) is command:
+                    del self._latest[(action, module, pin)]
@@ -1,6 +1,6 @@
 """Handle the Gryf Smart binary sensor platform functionality."""
 
-from pygryfsmart.device import _GryfDevice, GryfInput
+from pygryfsmart.const import DriverFunctions
 
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
@@ -13,7 +13,6 @@ from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 from homeassistant.helpers.restore_state import RestoreEntity
 
 from .const import (
-    CONF_API,
     CONF_DEVICES,
     CONF_EXTRA,
     CONF_ID,
@@ -25,6 +24,7 @@ from .const import (
     DOMAIN,
     Platforms
 )
+from .device import GryfDevice
 from .entity import GryfConfigFlowEntity , GryfYamlEntity
 
 async def async_setup_platform(
@@ -38,11 +38,10 @@ async def async_setup_platform(
     binary_sensors = []
 
     for conf in hass.data[DOMAIN].get(Platforms.BINARY_SENSOR, {}):
-        device = GryfInput(
+        device = GryfDevice(
             conf.get(CONF_NAME),
             conf.get(CONF_ID) // 10,
             conf.get(CONF_ID) % 10,
-            hass.data[DOMAIN][CONF_API],
         )
         binary_sensors.append(GryfYamlBinarySensor(device , conf.get(CONF_DEVICE_CLASS)))
 
@@ -60,11 +59,10 @@ async def async_setup_entry(
 
     for conf in config_entry.data[CONF_DEVICES]:
         if conf.get(CONF_TYPE) == Platforms.BINARY_SENSOR:
-            device = GryfInput(
+            device = GryfDevice(
                 conf.get(CONF_NAME),
                 conf.get(CONF_ID) // 10,
                 conf.get(CONF_ID) % 10,
-                config_entry.runtime_data[CONF_API],
             )
             binary_sensors.append(
                 GryfConfigFlowBinarySensor(
@@ -81,28 +79,36 @@ async def async_setup_entry(
 class _GryfBinarySensorBase(BinarySensorEntity, RestoreEntity):
     """Gryf Binary Sensor base."""
 
-    _is_on = False
+    # An open input (0) reads as on.
+    _is_on = True
+    _function = DriverFunctions.INPUTS
     _attr_device_class = BinarySensorDeviceClass.OPENING
     _negation = 0
 
     @property
     def is_on(self) -> bool:
-        return not self._is_on
+        return self._is_on
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
 
-        if(last_state := await self.async_get_last_state()) is not None:
-            self._attr_is_on = last_state.state == "on"
+        # The state snapshot seeds the dispatcher, fall back to the last
+        # state only for pins it doesn't know yet.
+        if self._dispatcher.state(
+            self._device.id, self._device.pin, self._function
+        ) is None and (last_state := await self.async_get_last_state()) is not None:
+            self._is_on = last_state.state == "on"
 
     async def async_update(self, state):
         if state in [0, 1]:
 
             if self._negation:
-                self._is_on = not state
-            else:
-                self._is_on = state
+                state = not state
 
+            if not self._publish_value(bool(state)):
+                return
+
+            self._is_on = not state
             self.async_write_ha_state()
 
 
@@ -111,7 +117,7 @@ class GryfConfigFlowBinarySensor(GryfConfigFlowEntity, _GryfBinarySensorBase):
 
     def __init__(
         self,
-        device: _GryfDevice,
+        device: GryfDevice,
         config_entry: ConfigEntry,
         device_class: BinarySensorDeviceClass | None,
         negation: bool,
@@ -119,7 +125,6 @@ class GryfConfigFlowBinarySensor(GryfConfigFlowEntity, _GryfBinarySensorBase):
         """Init the gryf binary sensor."""
 
         super().__init__(config_entry, device)
-        device.subscribe(self.async_update)
 
         if device_class:
             self._attr_device_class = device_class
@@ -129,13 +134,12 @@ class GryfYamlBinarySensor(GryfYamlEntity, _GryfBinarySensorBase):
 
     def __init__(
         self,
-        device: _GryfDevice,
+        device: GryfDevice,
         device_class: BinarySensorDeviceClass | None,
     ) -> None:
         """Init the gryf input line."""
 
         super().__init__(device)
-        device.subscribe(self.async_update)
 
         if device_class:
             self._attr_device_class = device_class
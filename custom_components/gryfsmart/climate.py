@@ -2,7 +2,7 @@
 
 from typing import Any
 
-from pygryfsmart.device import _GryfDevice, GryfThermostat
+from pygryfsmart.const import DriverFunctions, OutputActions
 
 from homeassistant.components.climate import ClimateEntity, ClimateEntityFeature, UnitOfTemperature
 from homeassistant.config_entries import ConfigEntry
@@ -13,10 +13,10 @@ from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 from homeassistant.components.climate.const import HVACAction, HVACMode
 from homeassistant.helpers.restore_state import RestoreEntity
 
+from .device import GryfThermostatDevice
 from .entity import GryfYamlEntity, GryfConfigFlowEntity
 from .const import (
     DOMAIN,
-    CONF_API,
     CONF_DEVICES,
     CONF_EXTRA,
     CONF_ID,
@@ -40,13 +40,13 @@ async def async_setup_platform(
     climates = []
 
     for conf in hass.data[DOMAIN].get(Platforms.CLIMATE, []):
-        device = GryfThermostat(
+        device = GryfThermostatDevice(
             conf.get(CONF_NAME),
             conf.get(CONF_OUT) // 10,
             conf.get(CONF_OUT) % 10,
             conf.get(CONF_TEMP) // 10,
             conf.get(CONF_TEMP) % 10,
-            0, hass.data[DOMAIN][CONF_API],)
+        )
         climates.append(GryfYamlClimate(device))
     
     async_add_entities(climates)
@@ -61,13 +61,12 @@ async def async_setup_entry(
     climates = []
     for conf in config_entry.data[CONF_DEVICES]:
         if conf.get(CONF_TYPE) == Platforms.CLIMATE:
-            device = GryfThermostat(
+            device = GryfThermostatDevice(
                 conf.get(CONF_NAME),
                 conf.get(CONF_ID) // 10,
                 conf.get(CONF_ID) % 10,
                 int(conf.get(CONF_EXTRA)) // 10,
                 int(conf.get(CONF_EXTRA)) % 10,
-                0, config_entry.runtime_data[CONF_API],
             )
             climates.append(GryfConfigFlowClimate(device, config_entry))
 
@@ -101,66 +100,139 @@ class GryfClimteBase(ClimateEntity , RestoreEntity):
     _attr_hvac_action = HVACAction.OFF
     _attr_hvac_mode = HVACMode.OFF
     _attr_target_temperature = 21.0
+    _applied_hvac_mode: HVACMode | None = None
+    _differential = 0
+    _output_state: bool | None = None
 
-    _device: _GryfDevice
+    _device: GryfThermostatDevice
+
+    def _subscriptions(self):
+        """Listen to the heating output and its thermometer."""
+
+        return [
+            (self._device.id, self._device.pin, DriverFunctions.OUTPUTS, self.async_update_output),
+            (
+                self._device.temperature_id,
+                self._device.temperature_pin,
+                DriverFunctions.TEMP,
+                self.async_update_temperature,
+            ),
+        ]
 
     async def async_added_to_hass(self):
         await super().async_added_to_hass()
         if (last_state := await self.async_get_last_state()) is not None:
             
-            self._target_temperature = last_state.attributes.get(ATTR_TEMPERATURE, 21.0)
-            self._hvac_mode = last_state.state if last_state.state in self.hvac_modes else HVACMode.OFF
-            self._hvac_action = last_state.attributes.get("hvac_action", HVACAction.OFF)
+            self._attr_target_temperature = last_state.attributes.get(ATTR_TEMPERATURE, 21.0)
+            self._attr_hvac_mode = last_state.state if last_state.state in self.hvac_modes else HVACMode.OFF
+            # The output state replayed from the dispatcher is fresher.
+            if self._output_state is None:
+                self._attr_hvac_action = last_state.attributes.get("hvac_action", HVACAction.OFF)
 
         self.async_write_ha_state()
+        # Don't hold up the platform setup until the module confirmed.
+        self.hass.async_create_background_task(
+            self._async_apply_hvac_mode(self._attr_hvac_mode), "gryfsmart thermostat"
+        )
 
     @property
     def current_temperature(self):
         return self._current_temperature
     
-    async def async_update(self, states):
-        """Update state."""
+    async def async_update_temperature(self, temperature):
+        """Update the temperature and regulate the output."""
+
+        self._current_temperature = temperature
+
+        # Frames are routed one after another, don't hold them up until
+        # the module confirmed the output.
+        self.hass.async_create_background_task(
+            self._async_regulate(), "gryfsmart thermostat"
+        )
+        self._async_publish()
 
-        self._current_temperature = states.get("T")
+    async def async_update_output(self, is_on):
+        """Update the heating state."""
 
-        if states.get("O"):
+        self._output_state = bool(is_on)
+
+        if is_on:
             self._attr_hvac_action = HVACAction.HEATING
         else:
             self._attr_hvac_action = HVACAction.OFF
 
-        await self.async_set_hvac_mode(self._attr_hvac_mode)
+        self._async_publish()
 
-        self.async_write_ha_state()
+    def _async_publish(self) -> None:
+        """Write the state if the temperature or heating changed."""
 
-    async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
-        self._attr_hvac_mode = hvac_mode
+        if self._publish_value((self._current_temperature, self._attr_hvac_action)):
+            self.async_write_ha_state()
 
-        if self._attr_hvac_mode == HVACMode.OFF:
-            self._device.enable(False)
+    async def _async_regulate(self) -> None:
+        """Switch the output when the temperature left the differential."""
+
+        # The thermometer must have reported, _current_temperature starts
+        # from a made up value.
+        temperature = self._dispatcher.state(
+            self._device.temperature_id, self._device.temperature_pin, DriverFunctions.TEMP
+        )
+        if self._applied_hvac_mode in (None, HVACMode.OFF) or temperature is None:
+            return
+
+        target = self._attr_target_temperature
+        if temperature > target + self._differential:
+            heat = False
+        elif temperature < target - self._differential:
+            heat = True
         else:
-            self._device.enable(True)
+            return
 
-        self.async_write_ha_state()
+        if heat != self._output_state:
+            await self._batcher.async_set_out(
+                self._device.id,
+                self._device.pin,
+                OutputActions.ON if heat else OutputActions.OFF,
+            )
 
-    async def async_turn_on(self) -> None:
-        self._device.enable(True)
+    async def _async_apply_hvac_mode(self, hvac_mode: HVACMode) -> None:
+        """Enable or disable the thermostat only when the mode changes.
 
-        self._attr_hvac_mode = HVACMode.HEAT
-        self.async_write_ha_state()
+        Turning it off switches the heating off, turning it on regulates
+        right away instead of waiting for the next temperature report.
+        """
 
-    async def async_turn_off(self) -> None:
-        self._device.enable(False)
+        if hvac_mode == self._applied_hvac_mode:
+            return
+
+        self._applied_hvac_mode = hvac_mode
+
+        if hvac_mode != HVACMode.OFF:
+            await self._async_regulate()
+        elif self._output_state:
+            await self._batcher.async_set_out(
+                self._device.id, self._device.pin, OutputActions.OFF
+            )
 
-        self._attr_hvac_mode = HVACMode.OFF
+    async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
+        self._attr_hvac_mode = hvac_mode
         self.async_write_ha_state()
 
+        await self._async_apply_hvac_mode(hvac_mode)
+
+    async def async_turn_on(self) -> None:
+        await self.async_set_hvac_mode(HVACMode.HEAT)
+
+    async def async_turn_off(self) -> None:
+        await self.async_set_hvac_mode(HVACMode.OFF)
+
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         if preset_mode == NORMAL_HEATING_MODE:
-            self._device.change_differential(0)
+            self._differential = 0
         elif preset_mode == SLOWEST_HEATING_MODE:
-            self._device.change_differential(1)
+            self._differential = 1
         else:
-            self._device.change_differential(2)
+            self._differential = 2
 
         self._attr_preset_mode = preset_mode
         self.async_write_ha_state()
@@ -168,32 +240,30 @@ class GryfClimteBase(ClimateEntity , RestoreEntity):
     async def async_set_temperature(self, **kwargs: Any) -> None:
 
         if ATTR_TEMPERATURE in kwargs:
-            await self._device.set_target_temperature(kwargs[ATTR_TEMPERATURE])
             self._attr_target_temperature = kwargs[ATTR_TEMPERATURE]
-
             self.async_write_ha_state()
 
+            await self._async_regulate()
+
 class GryfConfigFlowClimate(GryfConfigFlowEntity, GryfClimteBase):
     """Gryf smart config flow climate class."""
 
     def __init__(
         self,
-        device: GryfThermostat,
+        device: GryfThermostatDevice,
         config_entry: ConfigEntry,
     ) -> None:
         """Init the gryf smart climate."""
 
         self._config_entry = config_entry
         super().__init__(config_entry, device)
-        self._device.subscribe(self.async_update)
 
 class GryfYamlClimate(GryfYamlEntity, GryfClimteBase):
     """Gryf smart yaml climate class."""
 
     def __init__(
             self,
-            device: GryfThermostat,
+            device: GryfThermostatDevice,
         ) -> None:
             """Init the gryf climate."""
             super().__init__(device)
-            device.subscribe(self.async_update)
@@ -26,8 +26,26 @@ from .const import (
     CONF_TEMP_ID,
     CONF_OUT_ID,
     CONF_HYSTERESIS_LOOP,
+    CONF_POSITION_STEP,
+    CONF_PULSE_WIDTH,
+    CONF_TILT_TIME,
+    CONF_STALE_TIMEOUT,
+    CONF_TEMPERATURE_DEADBAND,
+    CONF_PWM_DEBOUNCE,
+    CONF_LINE_WRITE_INTERVAL,
+    CONF_OPTIMISTIC,
+    CONF_UPDATE_INTERVAL,
 
     DEFAULT_PORT,
+    DEFAULT_POSITION_STEP,
+    DEFAULT_PULSE_WIDTH,
+    DEFAULT_TILT_TIME,
+    DEFAULT_STALE_TIMEOUT,
+    DEFAULT_TEMPERATURE_DEADBAND,
+    DEFAULT_PWM_DEBOUNCE,
+    DEFAULT_LINE_WRITE_INTERVAL,
+    DEFAULT_OPTIMISTIC,
+    DEFAULT_UPDATE_INTERVAL,
     DOMAIN,
     SWITCH_DEVICE_CLASS,
 
@@ -79,6 +97,12 @@ class GryfSmartConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input:
             self._config_data[CONF_COMMUNICATION][CONF_PORT] = user_input[CONF_PORT]
             self._config_data[CONF_COMMUNICATION][CONF_MODULE_COUNT] = user_input[CONF_MODULE_COUNT]
+            self._config_data[CONF_COMMUNICATION][CONF_UPDATE_INTERVAL] = user_input[CONF_UPDATE_INTERVAL]
+            self._config_data[CONF_COMMUNICATION][CONF_STALE_TIMEOUT] = user_input[CONF_STALE_TIMEOUT]
+            self._config_data[CONF_COMMUNICATION][CONF_TEMPERATURE_DEADBAND] = user_input[CONF_TEMPERATURE_DEADBAND]
+            self._config_data[CONF_COMMUNICATION][CONF_PWM_DEBOUNCE] = user_input[CONF_PWM_DEBOUNCE]
+            self._config_data[CONF_COMMUNICATION][CONF_LINE_WRITE_INTERVAL] = user_input[CONF_LINE_WRITE_INTERVAL]
+            self._config_data[CONF_COMMUNICATION][CONF_OPTIMISTIC] = user_input[CONF_OPTIMISTIC]
 
             self._unique_id = user_input[CONF_PORT]
 
@@ -93,6 +117,12 @@ class GryfSmartConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 {
                     vol.Required(CONF_PORT, default=DEFAULT_PORT): str,
                     vol.Required(CONF_MODULE_COUNT, default=1): int,
+                    vol.Required(CONF_UPDATE_INTERVAL, default=DEFAULT_UPDATE_INTERVAL): vol.All(int, vol.Range(min=1)),
+                    vol.Required(CONF_STALE_TIMEOUT, default=DEFAULT_STALE_TIMEOUT): vol.All(int, vol.Range(min=0)),
+                    vol.Required(CONF_TEMPERATURE_DEADBAND, default=DEFAULT_TEMPERATURE_DEADBAND): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                    vol.Required(CONF_PWM_DEBOUNCE, default=DEFAULT_PWM_DEBOUNCE): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                    vol.Required(CONF_LINE_WRITE_INTERVAL, default=DEFAULT_LINE_WRITE_INTERVAL): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                    vol.Required(CONF_OPTIMISTIC, default=DEFAULT_OPTIMISTIC): bool,
                 }
             ),
             errors=errors,
@@ -223,6 +253,8 @@ class GryfSmartConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     CONF_ID: user_input[CONF_ID],
                     CONF_NAME: user_input[CONF_NAME],
                     CONF_EXTRA: user_input[CONF_TIME],
+                    CONF_POSITION_STEP: user_input[CONF_POSITION_STEP],
+                    CONF_TILT_TIME: user_input[CONF_TILT_TIME],
                 }
                 self._config_data[CONF_DEVICES].append(entity_data)
                 self._last_id = user_input[CONF_ID]
@@ -236,6 +268,8 @@ class GryfSmartConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     vol.Optional(CONF_NAME, default=edited[CONF_NAME] if edited else self._last_name): str, 
                     vol.Optional(CONF_ID, default=edited[CONF_ID] if edited else self._last_id): int,
                     vol.Required(CONF_TIME, default=edited[CONF_EXTRA] if edited else 100): int,
+                    vol.Required(CONF_POSITION_STEP, default=edited.get(CONF_POSITION_STEP, DEFAULT_POSITION_STEP) if edited else DEFAULT_POSITION_STEP): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+                    vol.Required(CONF_TILT_TIME, default=edited.get(CONF_TILT_TIME, DEFAULT_TILT_TIME) if edited else DEFAULT_TILT_TIME): vol.All(vol.Coerce(float), vol.Range(min=0)),
                 }
             )
         )
@@ -396,6 +430,7 @@ class GryfSmartConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     CONF_TYPE: Platforms.GATE,
                     CONF_ID: user_input[CONF_ID],
                     CONF_NAME: user_input[CONF_NAME],
+                    CONF_PULSE_WIDTH: user_input[CONF_PULSE_WIDTH],
                 }
                 self._config_data[CONF_DEVICES].append(entity_data)
                 self._last_id = user_input[CONF_ID]
@@ -408,6 +443,7 @@ class GryfSmartConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 {
                     vol.Optional(CONF_NAME, default=edited[CONF_NAME] if edited else self._last_name): str, 
                     vol.Optional(CONF_ID, default=edited[CONF_NAME] if edited else self._last_id): int,
+                    vol.Required(CONF_PULSE_WIDTH, default=edited.get(CONF_PULSE_WIDTH, DEFAULT_PULSE_WIDTH) if edited else DEFAULT_PULSE_WIDTH): vol.All(vol.Coerce(float), vol.Range(min=0.1)),
                 }
             )
         )
@@ -491,6 +527,12 @@ class GryfSmartOptionsFlow(OptionsFlow, GryfSmartConfigFlow):
         if user_input:
             self._config_data[CONF_COMMUNICATION][CONF_PORT] = user_input[CONF_PORT]
             self._config_data[CONF_COMMUNICATION][CONF_MODULE_COUNT] = user_input[CONF_MODULE_COUNT]
+            self._config_data[CONF_COMMUNICATION][CONF_UPDATE_INTERVAL] = user_input[CONF_UPDATE_INTERVAL]
+            self._config_data[CONF_COMMUNICATION][CONF_STALE_TIMEOUT] = user_input[CONF_STALE_TIMEOUT]
+            self._config_data[CONF_COMMUNICATION][CONF_TEMPERATURE_DEADBAND] = user_input[CONF_TEMPERATURE_DEADBAND]
+            self._config_data[CONF_COMMUNICATION][CONF_PWM_DEBOUNCE] = user_input[CONF_PWM_DEBOUNCE]
+            self._config_data[CONF_COMMUNICATION][CONF_LINE_WRITE_INTERVAL] = user_input[CONF_LINE_WRITE_INTERVAL]
+            self._config_data[CONF_COMMUNICATION][CONF_OPTIMISTIC] = user_input[CONF_OPTIMISTIC]
 
             return await self.async_step_device_menu()
 
@@ -500,6 +542,12 @@ class GryfSmartOptionsFlow(OptionsFlow, GryfSmartConfigFlow):
                 {
                     vol.Required(CONF_PORT, default=self._config_data[CONF_COMMUNICATION][CONF_PORT]): str,
                     vol.Required(CONF_MODULE_COUNT, default=self._config_data[CONF_COMMUNICATION][CONF_MODULE_COUNT]): int,
+                    vol.Required(CONF_UPDATE_INTERVAL, default=self._config_data[CONF_COMMUNICATION].get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)): vol.All(int, vol.Range(min=1)),
+                    vol.Required(CONF_STALE_TIMEOUT, default=self._config_data[CONF_COMMUNICATION].get(CONF_STALE_TIMEOUT, DEFAULT_STALE_TIMEOUT)): vol.All(int, vol.Range(min=0)),
+                    vol.Required(CONF_TEMPERATURE_DEADBAND, default=self._config_data[CONF_COMMUNICATION].get(CONF_TEMPERATURE_DEADBAND, DEFAULT_TEMPERATURE_DEADBAND)): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                    vol.Required(CONF_PWM_DEBOUNCE, default=self._config_data[CONF_COMMUNICATION].get(CONF_PWM_DEBOUNCE, DEFAULT_PWM_DEBOUNCE)): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                    vol.Required(CONF_LINE_WRITE_INTERVAL, default=self._config_data[CONF_COMMUNICATION].get(CONF_LINE_WRITE_INTERVAL, DEFAULT_LINE_WRITE_INTERVAL)): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                    vol.Required(CONF_OPTIMISTIC, default=self._config_data[CONF_COMMUNICATION].get(CONF_OPTIMISTIC, DEFAULT_OPTIMISTIC)): bool,
                 }
             ),
             errors=errors,
@@ -0,0 +1,188 @@
+"""Shared Gryf Smart port connections."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from pygryfsmart.api import GryfApi
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers.event import async_call_later
+
+from .batcher import GryfOutputBatcher
+from .const import (
+    CONF_CONNECTIONS,
+    CONNECT_TIMEOUT,
+    CONNECTION_RELEASE_DELAY,
+    DOMAIN,
+)
+from .dispatcher import GryfDispatcher
+from .fade import GryfFader
+from .metrics import GryfMetrics
+from .poller import GryfPoller
+from .scheduler import GryfCommandScheduler
+from .search import GryfModuleSearch
+from .snapshot import GryfSnapshot
+from .topology import GryfTopology
+from .trace import GryfFrameTrace
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_CONNECTIONS = f"{DOMAIN}_{CONF_CONNECTIONS}"
+
+
+class GryfConnection:
+    """A port together with the helpers which talk over it."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: GryfApi,
+        port: str,
+        module_count: int,
+        interval: float,
+        stale_timeout: float,
+    ) -> None:
+        """Init the connection."""
+
+        self.api = api
+        self.module_count = module_count
+        self.scheduler = GryfCommandScheduler(hass, api)
+        self.metrics = GryfMetrics(hass, api, self.scheduler)
+        self.trace = GryfFrameTrace(api)
+        self.topology = GryfTopology(hass, api, port)
+        self.search = GryfModuleSearch(hass, api, self.scheduler, port)
+        self.poller = GryfPoller(
+            hass, api, self.scheduler, self.metrics, module_count, interval, stale_timeout
+        )
+        self.dispatcher = GryfDispatcher(api, self.metrics)
+        self.snapshot = GryfSnapshot(hass, self.dispatcher, port)
+        self.batcher = GryfOutputBatcher(
+            hass, self.scheduler, self.dispatcher, self.metrics
+        )
+        self.fader = GryfFader(hass, self.scheduler)
+        self.users = 0
+        self.unsub_close: CALLBACK_TYPE | None = None
+
+    def start(self) -> None:
+        """Start writing and polling."""
+
+        self.metrics.start()
+        self.scheduler.start()
+        self.poller.start()
+
+    async def async_sweep(self) -> None:
+        """Sweep the modules found before, or every module the first time.
+
+        Other modules are left to the regular polling, which finds out in
+        the background whether they are there.
+        """
+
+        known = [module for module in self.topology.modules if module <= self.module_count]
+        await self.poller.async_sweep(known or None)
+
+    def configure(self, module_count: int, interval: float, stale_timeout: float) -> None:
+        """Apply the settings of a setup joining the connection."""
+
+        self.module_count = max(self.module_count, module_count)
+        self.api.set_module_count(self.module_count)
+        self.poller.set_module_count(self.module_count)
+        self.poller.set_interval(interval, stale_timeout)
+
+    async def async_close(self) -> None:
+        """Stop polling and writing and close the port."""
+
+        self.metrics.stop()
+        self.fader.stop()
+        await self.poller.async_stop()
+        await self.scheduler.async_stop()
+        await self.api.stop_connection()
+
+
+class GryfConnectionPool:
+    """Hand out one connection per port, counting its users.
+
+    When the last user releases a port the connection is kept open for
+    CONNECTION_RELEASE_DELAY seconds, so a reloading config entry picks up
+    the same connection instead of opening the port again.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Init the pool."""
+
+        self._hass = hass
+        self._connections: dict[str, GryfConnection] = {}
+        self._lock = asyncio.Lock()
+
+    async def async_acquire(
+        self,
+        port: str,
+        module_count: int,
+        interval: float,
+        stale_timeout: float,
+    ) -> GryfConnection:
+        """Return the live connection to the port, opening it if needed."""
+
+        async with self._lock:
+            connection = self._connections.get(port)
+
+            if connection is None:
+                api = GryfApi(port)
+                try:
+                    async with asyncio.timeout(CONNECT_TIMEOUT):
+                        await api.start_connection()
+                except TimeoutError as err:
+                    raise ConnectionError(f"Timed out connecting to {port}") from err
+                api.set_module_count(module_count)
+
+                connection = GryfConnection(
+                    self._hass, api, port, module_count, interval, stale_timeout
+                )
+                await connection.topology.async_load()
+                await connection.snapshot.async_load()
+                connection.start()
+                self._connections[port] = connection
+            else:
+                _LOGGER.debug("Reusing connection to %s", port)
+                if connection.unsub_close is not None:
+                    connection.unsub_close()
+                    connection.unsub_close = None
+                connection.configure(module_count, interval, stale_timeout)
+
+            connection.users += 1
+            return connection
+
+    async def async_release(self, port: str) -> None:
+        """Drop a user of the port, closing it shortly after the last one."""
+
+        async with self._lock:
+            connection = self._connections.get(port)
+            if connection is None:
+                return
+
+            connection.users -= 1
+            if connection.users > 0:
+                return
+
+            async def async_close(_now=None) -> None:
+                async with self._lock:
+                    if connection.users > 0 or self._connections.get(port) is not connection:
+                        return
+                    del self._connections[port]
+                    connection.unsub_close = None
+
+                _LOGGER.debug("Closing connection to %s", port)
+                await connection.async_close()
+
+            connection.unsub_close = async_call_later(
+                self._hass, CONNECTION_RELEASE_DELAY, async_close
+            )
+
+
+def async_get_connection_pool(hass: HomeAssistant) -> GryfConnectionPool:
+    """Return the integration wide connection pool."""
+
+    if (pool := hass.data.get(DATA_CONNECTIONS)) is None:
+        pool = hass.data[DATA_CONNECTIONS] = GryfConnectionPool(hass)
+    return pool
@@ -28,6 +28,31 @@ CONF_NEGATION = "negation"
 CONF_TEMP_ID = "Sensor ID"
 CONF_OUT_ID = "Output ID"
 CONF_HYSTERESIS_LOOP = "hysteresis loop"
+CONF_POLLER = "poller"
+CONF_CONNECTIONS = "connections"
+CONF_METRICS = "metrics"
+CONF_TRACE = "trace"
+CONF_TOPOLOGY = "topology"
+CONF_SEARCH = "search"
+CONF_FIRST = "first"
+CONF_LAST = "last"
+CONF_CONCURRENCY = "concurrency"
+CONF_TIMEOUT = "timeout"
+CONF_POSITION_STEP = "position_step"
+CONF_TILT_TIME = "tilt_time"
+CONF_DISPATCHER = "dispatcher"
+CONF_BATCHER = "batcher"
+CONF_FADER = "fader"
+CONF_SCHEDULER = "scheduler"
+CONF_OUTPUTS = "outputs"
+CONF_STATE = "state"
+CONF_PULSE_WIDTH = "pulse_width"
+CONF_UPDATE_INTERVAL = "update_interval"
+CONF_STALE_TIMEOUT = "stale_timeout"
+CONF_TEMPERATURE_DEADBAND = "temperature_deadband"
+CONF_PWM_DEBOUNCE = "pwm_debounce"
+CONF_LINE_WRITE_INTERVAL = "line_write_interval"
+CONF_OPTIMISTIC = "optimistic"
 
 class Platforms():
     PWM = "pwm"
@@ -66,9 +91,66 @@ HOMEASSISTANT_PLATFORMS: list[Platform] = [
 ]
 
 DEFAULT_PORT = "/dev/ttyUSB0"
+DEFAULT_UPDATE_INTERVAL = 1
+DEFAULT_STALE_TIMEOUT = 30
+DEFAULT_TEMPERATURE_DEADBAND = 0.0
+DEFAULT_PWM_DEBOUNCE = 0.2
+DEFAULT_LINE_WRITE_INTERVAL = 0.5
+DEFAULT_OPTIMISTIC = True
+DEFAULT_PULSE_WIDTH = 1.0
+DEFAULT_POSITION_STEP = 10
+DEFAULT_TILT_TIME = 2
+
+CONNECTION_RELEASE_DELAY = 5
+CONNECT_TIMEOUT = 10
+
+POLL_BUSY_FRAME_RATE = 10
+POLL_MAX_BACKOFF = 16
+POLL_COMMAND_DELAY = 0.1
+SWEEP_CONCURRENCY = 4
+SWEEP_MODULE_TIMEOUT = 2
+POLL_ANSWER_TIMEOUT = 2
+REPROBE_MIN_INTERVAL = 5
+REPROBE_MAX_INTERVAL = 300
+
+SEARCH_CONCURRENCY = 8
+SEARCH_TIMEOUT = 0.5
+EVENT_MODULE_FOUND = f"{DOMAIN}_module_found"
+
+# Shutter states reported in R frames.
+COVER_STOPPED = 0
+COVER_OPENING = 1
+COVER_CLOSING = 2
+
+TOPOLOGY_SAVE_DELAY = 10
+TOPOLOGY_SEEN_RESOLUTION = 3600
+TOPOLOGY_EXPIRY = 30 * 24 * 3600
+
+SNAPSHOT_SAVE_DELAY = 10
+
+SCHEDULER_QUEUE_SIZE = 64
+PRIORITY_COMMAND = 0
+PRIORITY_BACKGROUND = 1
+PRIORITY_POLL = 2
+
+METRICS_INTERVAL = 10
+METRICS_LATENCY_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+FRAME_TRACE_SIZE = 500
+FRAME_TRACE_FRAME_BYTES = 64
+
+FADE_TICK = 0.1
+FADE_MAX_RATE = 25
+
+OUTPUT_CONFIRM_TIMEOUT = 0.3
+OUTPUT_RETRIES = 3
 GRYF_IN_NAME = "Gryf IN"
 GRYF_OUT_NAME = "Gryf OUT"
 
+LINE_SENSOR_BUFFER_SIZE = 200
+SERVICE_GET_LINE_FRAMES = "get_line_frames"
+SERVICE_MOVE_COVERS = "move_covers"
+
 NORMAL_HEATING_MODE = "away"
 SLOWEST_HEATING_MODE = "eco"
 THE_SLOWEST_HEATING_MODE = "sleep"
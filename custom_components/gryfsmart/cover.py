@@ -1,29 +1,51 @@
 """Handle the Gryf Smart Cover platform funtionality."""
 
-from pygryfsmart.device import GryfCover, GryfPercentCover
-from pygryfsmart.const import ShutterStates
+import math
 
-from homeassistant.components.cover import CoverEntity, CoverDeviceClass, CoverEntityFeature, CoverState
+import voluptuous as vol
+
+from pygryfsmart.const import DriverFunctions, ShutterStates
+
+from homeassistant.components.cover import (
+    ATTR_CURRENT_POSITION,
+    ATTR_CURRENT_TILT_POSITION,
+    ATTR_POSITION,
+    ATTR_TILT_POSITION,
+    CoverEntity,
+    CoverDeviceClass,
+    CoverEntityFeature,
+)
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_TYPE
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 
+from .device import GryfCoverDevice
 from .entity import GryfConfigFlowEntity, GryfYamlEntity
 from .const import (
-    CONF_API,
     CONF_DEVICES,
     CONF_ID,
     CONF_EXTRA,
     CONF_NAME,
+    CONF_POSITION_STEP,
+    CONF_TILT_TIME,
     CONF_TIME,
+    COVER_CLOSING,
+    COVER_OPENING,
+    COVER_STOPPED,
+    DEFAULT_POSITION_STEP,
+    DEFAULT_TILT_TIME,
     DOMAIN,
+    SERVICE_MOVE_COVERS,
     Platforms,
 )
+from .motion import GryfCoverMotion
 
 import logging
-import asyncio
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -38,16 +60,22 @@ async def async_setup_platform(
     covers = []
 
     for conf in hass.data[DOMAIN].get(Platforms.COVER, {}):
-        device = GryfPercentCover(
+        device = GryfCoverDevice(
             conf.get(CONF_NAME),
             conf.get(CONF_ID) // 10,
             conf.get(CONF_ID) % 10,
             conf.get(CONF_TIME),
-            hass.data[DOMAIN][CONF_API],
         )
-        covers.append(GryfYamlCover(device))
+        covers.append(
+            GryfYamlCover(
+                device,
+                conf.get(CONF_POSITION_STEP, DEFAULT_POSITION_STEP),
+                conf.get(CONF_TILT_TIME, DEFAULT_TILT_TIME),
+            )
+        )
 
     async_add_entities(covers)
+    _async_register_services()
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -58,119 +86,251 @@ async def async_setup_entry(
     covers = []
     for conf in config_entry.data[CONF_DEVICES]:
         if conf.get(CONF_TYPE) == Platforms.COVER:
-            device = GryfPercentCover(
+            device = GryfCoverDevice(
                 conf.get(CONF_NAME),
                 conf.get(CONF_ID) // 10,
                 conf.get(CONF_ID) % 10,
                 conf.get(CONF_EXTRA),
-                config_entry.runtime_data[CONF_API],
             )
-            covers.append(GryfConfigFlowCover(device, config_entry))
+            covers.append(
+                GryfConfigFlowCover(
+                    device,
+                    config_entry,
+                    conf.get(CONF_POSITION_STEP, DEFAULT_POSITION_STEP),
+                    conf.get(CONF_TILT_TIME, DEFAULT_TILT_TIME),
+                )
+            )
 
     async_add_entities(covers)
-
-class GryfCoverBase(CoverEntity):
-    """Gryf Cover entity base."""
-
-    _device: GryfCover
-    _wait_for_stop = False
-    _trying_to_stop = False
-    _attr_is_closed = False
-    _attr_is_opening = False
-    _attr_is_closing = False
-    _attr_current_cover_position = 100
-    _position: int=0
-    _attr_current_cover_tilt_position = 0
+    _async_register_services()
+
+def _async_register_services() -> None:
+    """Register the cover entity services."""
+
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_MOVE_COVERS,
+        {
+            vol.Required(ATTR_POSITION): vol.All(
+                vol.Coerce(int), vol.Range(min=0, max=100)
+            ),
+        },
+        "async_set_cover_position",
+    )
+
+class GryfCoverBase(CoverEntity, RestoreEntity):
+    """Gryf Cover entity base.
+
+    The position and tilt come from a GryfCoverMotion model started and
+    stopped by the states the module reports. While the shutter travels
+    the state is only written when the position crosses a multiple of the
+    position step, and once more when it stops. Position and tilt targets
+    are reached by stopping the shutter when the model says it got there.
+
+    The position and tilt are restored from the last state, so moves after
+    a restart run only the difference instead of re-homing the shutter.
+    """
+
+    _device: GryfCoverDevice
+    _function = DriverFunctions.COVER
     _attr_device_class = CoverDeviceClass.SHUTTER
     _attr_supported_features = CoverEntityFeature.OPEN | CoverEntityFeature.CLOSE | CoverEntityFeature.OPEN_TILT | CoverEntityFeature.STOP | CoverEntityFeature.CLOSE_TILT | CoverEntityFeature.SET_TILT_POSITION | CoverEntityFeature.SET_POSITION
-    _attr_state = CoverState.CLOSED
-    _tilt_position: int=0
+    _motion: GryfCoverMotion
+    _position_step: int = DEFAULT_POSITION_STEP
+    _target_position: float | None = None
+    _target_tilt: float | None = None
+    _unsub_target: CALLBACK_TYPE | None = None
+    _unsub_milestone: CALLBACK_TYPE | None = None
+
+    def _setup_motion(
+        self, travel_time: float, position_step: int, tilt_time: float
+    ) -> None:
+        """Create the position model of the shutter."""
+
+        self._motion = GryfCoverMotion(travel_time, tilt_time)
+        self._position_step = position_step
 
     async def async_added_to_hass(self):
-        self._device._timer.set_secound_timer_callback(self.update_cover_position)
+        await super().async_added_to_hass()
 
-        self._device.set_tilt_position_callback_ptr(self.update_cover_tilt_position)
-        self._device.set_tilt_opening_time(30)
-        self._device.load_last_shutter_position(100)
+        if (last_state := await self.async_get_last_state()) is not None:
+            position = last_state.attributes.get(ATTR_CURRENT_POSITION)
+            tilt = last_state.attributes.get(ATTR_CURRENT_TILT_POSITION)
+            if position is not None and tilt is not None:
+                self._motion.set(position, tilt)
+
+        self.async_on_remove(self._cancel_timers)
+        self.async_on_remove(self._poller.watch_shutters(self._device.id))
+
+    @property
+    def current_cover_position(self) -> int:
+        return round(self._motion.position)
+
+    @property
+    def current_cover_tilt_position(self) -> int:
+        return round(self._motion.tilt)
+
+    @property
+    def is_opening(self) -> bool:
+        return self._motion.direction == COVER_OPENING
+
+    @property
+    def is_closing(self) -> bool:
+        return self._motion.direction == COVER_CLOSING
+
+    @property
+    def is_closed(self) -> bool:
+        return self.current_cover_position == 0
 
     async def async_open_cover(self, **kwargs):
-        await self._device.turn_on()
+        await self._async_move_to(position=100)
 
     async def async_close_cover(self, **kwargs):
-        await self._device.turn_off()
+        await self._async_move_to(position=0)
 
     async def async_stop_cover(self, **kwargs):
-        self._trying_to_stop = True
+        self._target_position = self._target_tilt = None
 
-        await self._device.stop()
+        await self._async_send(ShutterStates.STOP)
+
+    async def async_set_cover_position(self, **kwargs):
+        await self._async_move_to(position=kwargs[ATTR_POSITION])
 
     async def async_set_cover_tilt_position(self, **kwargs):
-        tilt_position = kwargs.get("tilt_position", 0)
+        await self._async_move_to(tilt=kwargs[ATTR_TILT_POSITION])
 
-        await self._device.set_cover_tilt_position(tilt_position)       
-        self._tilt_position = tilt_position
+    async def async_open_cover_tilt(self, **kwargs):
+        await self._async_move_to(tilt=100)
 
-    async def async_set_cover_position(self, **kwargs):
-        self._position = kwargs.get("position", 0)
+    async def async_close_cover_tilt(self, **kwargs):
+        await self._async_move_to(tilt=0)
+
+    async def _async_move_to(
+        self,
+        position: float | None = None,
+        tilt: float | None = None,
+    ) -> None:
+        """Move towards a position or a tilt and stop there.
+
+        Fully opening or closing leaves the stop to the module, so the
+        shutter reaches its end even if the model drifted.
+        """
+
+        if position is not None:
+            target, current = position, self._motion.position
+            if position in (0, 100):
+                self._target_position = None
+            elif abs(position - current) < 1:
+                return
+            else:
+                self._target_position = position
+            self._target_tilt = None
+        else:
+            target, current = tilt, self._motion.tilt
+            if abs(tilt - current) < 1:
+                return
+            self._target_position = None
+            self._target_tilt = tilt
+
+        direction = COVER_OPENING if target > current or target == 100 else COVER_CLOSING
+        if self._motion.direction == direction:
+            self._schedule()
+            return
+
+        await self._async_send(
+            ShutterStates.OPEN if direction == COVER_OPENING else ShutterStates.CLOSE
+        )
+        if self._motion.direction != direction:
+            # The module never started, don't stop a later move at this target.
+            self._target_position = self._target_tilt = None
+
+    async def _async_send(self, operation: int) -> None:
+        """Send a shutter operation to the module."""
+
+        await self._batcher.async_set_cover(
+            self._device.id,
+            self._device.pin,
+            operation,
+            math.ceil(self._motion.travel_time + self._motion.tilt_time),
+        )
 
-        await self._device.set_cover_position(self._position)
+    @callback
+    def _cancel_timers(self) -> None:
+        """Cancel the pending target stop and milestone write."""
 
-    async def async_open_cover_tilt(self, **kwargs):
-        if self._attr_state in [CoverState.OPENING, CoverState.CLOSING]:
-            self._trying_to_stop = True
+        if self._unsub_target is not None:
+            self._unsub_target()
+            self._unsub_target = None
+        if self._unsub_milestone is not None:
+            self._unsub_milestone()
+            self._unsub_milestone = None
 
-        await self._device.toggle()
+    @callback
+    def _schedule(self) -> None:
+        """Plan the stop at the target and the next milestone write."""
 
-    async def async_close_cover_tilt(self, **kwargs):
-        await self._device._api.set_cover(self._device._id, self._device._pin, 25, ShutterStates.OPEN)
+        self._cancel_timers()
 
-    async def update_cover_position(self, position):
-        self._attr_current_cover_position = int(position)
+        if self._target_position is not None or self._target_tilt is not None:
+            self._unsub_target = async_call_later(
+                self.hass,
+                self._motion.time_to(self._target_position, self._target_tilt),
+                self._async_reached_target,
+            )
 
-        self.async_write_ha_state()
+        self._schedule_milestone()
+
+    @callback
+    def _schedule_milestone(self) -> None:
+        """Plan the write when the position crosses the next step."""
+
+        self._unsub_milestone = None
+        if (delay := self._motion.time_to_milestone(self._position_step)) is not None:
+            self._unsub_milestone = async_call_later(self.hass, delay, self._async_milestone)
 
-    async def update_cover_tilt_position(self, position):
-        self._attr_current_cover_tilt_position = int(position)
+    @callback
+    def _async_milestone(self, _now=None) -> None:
+        """Publish the position reached and plan the next milestone."""
 
         self.async_write_ha_state()
+        self._schedule_milestone()
+
+    async def _async_reached_target(self, _now=None) -> None:
+        """Stop the shutter at its target."""
+
+        self._unsub_target = None
+        self._target_position = self._target_tilt = None
+        await self._async_send(ShutterStates.STOP)
 
     async def async_update(self, state):
-        if state == 1:
-            self._attr_is_opening = True
-            self._attr_is_closing = False
-            self._wait_for_stop = 1
-            self._attr_current_cover_tilt_position = 100
-        elif state == 2:
-            self._attr_is_opening = False
-            self._attr_is_closing = True
-            self._wait_for_stop = 1
-            self._attr_current_cover_tilt_position = 0
+        if state == self._motion.direction:
+            return
+
+        if state == COVER_STOPPED:
+            self._motion.stop()
+            self._cancel_timers()
         else:
-            if self._attr_is_opening and self._wait_for_stop:
-                self._attr_is_closed = False
-            elif self._wait_for_stop:
-                self._attr_is_closed = True
-            if self._trying_to_stop:
-                self._trying_to_stop = True
-                self._attr_is_closed = None
-            self._attr_is_opening = False
-            self._attr_is_closing = False
-
-            if self._device.tilt_is_waiting_to_set and not(self._attr_is_opening or self._attr_is_closing):
-                await self.async_set_cover_tilt_position(tilt_position=self._tilt_position)
-            
+            self._motion.start(state)
+            self._schedule()
+
         self.async_write_ha_state()
 
 class GryfYamlCover(GryfYamlEntity, GryfCoverBase):
 
-    def __init__(self, device: GryfCover):
+    def __init__(self, device: GryfCoverDevice, position_step: int, tilt_time: float):
 
         super().__init__(device)
-        device.subscribe(self.async_update)
+        self._setup_motion(device.time, position_step, tilt_time)
 
 class GryfConfigFlowCover(GryfConfigFlowEntity, GryfCoverBase):
 
-    def __init__(self, device: GryfCover, config_entry: ConfigEntry):
+    def __init__(
+        self,
+        device: GryfCoverDevice,
+        config_entry: ConfigEntry,
+        position_step: int,
+        tilt_time: float,
+    ):
         self._config_entry = config_entry
         super().__init__(config_entry, device)
-        device.subscribe(self.async_update)
+        self._setup_motion(device.time, position_step, tilt_time)
@@ -0,0 +1,55 @@
+"""Addresses of the Gryf Smart devices behind the entities."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class GryfDevice:
+    """The name and the module pin of a device.
+
+    Entities get their frames from the dispatcher and write through the
+    batcher, so unlike the pygryfsmart devices this doesn't subscribe to
+    the library's feedback, which would hand every frame to every entity.
+    """
+
+    name: str
+    id: int
+    pin: int
+
+    @property
+    def extra_attributes(self) -> dict[str, Any]:
+        """Return the address as state attributes."""
+        return {"id": self.id, "pin": self.pin}
+
+
+@dataclass(frozen=True)
+class GryfCoverDevice(GryfDevice):
+    """A shutter and its full travel time in seconds."""
+
+    time: int
+
+    @property
+    def extra_attributes(self) -> dict[str, Any]:
+        """Return the address and travel time as state attributes."""
+        return {"id": self.id, "pin": self.pin, "time": self.time}
+
+
+@dataclass(frozen=True)
+class GryfThermostatDevice(GryfDevice):
+    """A heating output and the thermometer it is driven by."""
+
+    temperature_id: int
+    temperature_pin: int
+
+    @property
+    def extra_attributes(self) -> dict[str, Any]:
+        """Return both addresses as state attributes."""
+        return {
+            "id out": self.id,
+            "pin out": self.pin,
+            "id temp": self.temperature_id,
+            "pin temp": self.temperature_pin,
+        }
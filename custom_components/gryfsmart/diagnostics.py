@@ -0,0 +1,79 @@
+"""Diagnostics support for Gryf Smart."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_COMMUNICATION,
+    CONF_DEVICES,
+    CONF_DISPATCHER,
+    CONF_ID,
+    CONF_METRICS,
+    CONF_MODULE_COUNT,
+    CONF_NAME,
+    CONF_POLLER,
+    CONF_TOPOLOGY,
+    CONF_TRACE,
+    CONF_TYPE,
+)
+from .poller import GryfPoller
+from .topology import GryfTopology
+
+
+def _topology(
+    entry: ConfigEntry, found: GryfTopology, poller: GryfPoller
+) -> dict[int, Any]:
+    """Return what is known about every module and the devices on it."""
+
+    modules = set(range(1, entry.data[CONF_COMMUNICATION][CONF_MODULE_COUNT] + 1))
+    modules.update(found.modules)
+
+    topology: dict[int, Any] = {}
+    for module in sorted(modules):
+        info = dict(found.modules.get(module, {}))
+        if last_seen := info.get("last_seen"):
+            info["last_seen"] = dt_util.utc_from_timestamp(last_seen).isoformat()
+        topology[module] = {
+            **info,
+            "available": poller.module_available(module),
+            "devices": [],
+        }
+
+    for conf in entry.data[CONF_DEVICES]:
+        module = topology.get(conf[CONF_ID] // 10)
+        if module is not None:
+            module["devices"].append(
+                {
+                    CONF_NAME: conf.get(CONF_NAME),
+                    CONF_TYPE: conf.get(CONF_TYPE),
+                    "pin": conf[CONF_ID] % 10,
+                }
+            )
+
+    return topology
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+
+    runtime_data = entry.runtime_data
+    poller: GryfPoller = runtime_data[CONF_POLLER]
+
+    return {
+        "entry": {
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "topology": _topology(entry, runtime_data[CONF_TOPOLOGY], poller),
+        "states": runtime_data[CONF_DISPATCHER].as_dict(),
+        "poller": poller.as_dict(),
+        "metrics": runtime_data[CONF_METRICS].as_dict(),
+        "frames": runtime_data[CONF_TRACE].as_list(),
+    }
@@ -0,0 +1,155 @@
+"""Route Gryf Smart bus frames to the entities that listen to them."""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+import logging
+from typing import Any
+
+from pygryfsmart.api import GryfApi
+from pygryfsmart.const import DriverFunctions
+
+from homeassistant.core import CALLBACK_TYPE
+
+from .metrics import GryfMetrics
+from .poller import frame_module_id
+
+_LOGGER = logging.getLogger(__name__)
+
+RouteKey = tuple[int, int, str]
+FrameCallback = Callable[[Any], Awaitable[None]]
+
+_PIN_STATE_FUNCTIONS = {
+    DriverFunctions.INPUTS,
+    DriverFunctions.OUTPUTS,
+    DriverFunctions.COVER,
+}
+_PRESS_STATES = {
+    DriverFunctions.PRESS_SHORT: 2,
+    DriverFunctions.PRESS_LONG: 3,
+}
+
+
+def parse_frame(line: str) -> list[tuple[RouteKey, Any]]:
+    """Parse a raw bus frame into (module, pin, function) keyed values.
+
+    Frames of functions nobody routes give an empty list, malformed frames
+    raise ValueError or IndexError.
+    """
+
+    function, _, payload = line.partition("=")
+    function = function.upper()
+    states = payload.split(";")[0].split(",")
+
+    if function in _PIN_STATE_FUNCTIONS:
+        module = int(states[0])
+        return [
+            ((module, pin, function), int(state))
+            for pin, state in enumerate(states[1:], 1)
+        ]
+    if function in _PRESS_STATES:
+        return [((int(states[0]), int(states[1]), DriverFunctions.INPUTS), _PRESS_STATES[function])]
+    if function == DriverFunctions.TEMP:
+        return [((int(states[0]), int(states[1]), function), float(f"{states[2]}.{states[3]}"))]
+    if function == DriverFunctions.PWM:
+        return [((int(states[0]), int(states[1]), function), int(states[2]))]
+
+    return []
+
+
+class GryfDispatcher:
+    """Parse every frame once and route it by (module, pin, function).
+
+    The last value of every pin is cached so entities added later start
+    from it, and state listeners are told when a frame changed the cache.
+    """
+
+    def __init__(self, api: GryfApi, metrics: GryfMetrics) -> None:
+        """Init the dispatcher."""
+
+        self._metrics = metrics
+        self._routes: dict[RouteKey, list[FrameCallback]] = {}
+        self._states: dict[RouteKey, Any] = {}
+        self._state_listeners: list[CALLBACK_TYPE] = []
+        api.subscribe_input_message(self.async_dispatch)
+
+    @property
+    def states(self) -> dict[RouteKey, Any]:
+        """Return the last value seen for every pin."""
+        return self._states
+
+    def seed(self, states: dict[RouteKey, Any]) -> None:
+        """Fill in values known from before for pins not seen yet."""
+
+        for key, value in states.items():
+            self._states.setdefault(key, value)
+
+    def add_state_listener(self, listener: CALLBACK_TYPE) -> None:
+        """Call back whenever a frame changed the cached states."""
+
+        self._state_listeners.append(listener)
+
+    def subscribe(
+        self,
+        module: int,
+        pin: int,
+        function: str,
+        callback: FrameCallback,
+    ) -> CALLBACK_TYPE:
+        """Subscribe to a single pin, return the unsubscribe callback."""
+
+        key = (module, pin, function)
+        self._routes.setdefault(key, []).append(callback)
+
+        def unsubscribe() -> None:
+            callbacks = self._routes.get(key, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+            if not callbacks:
+                self._routes.pop(key, None)
+
+        return unsubscribe
+
+    def state(self, module: int, pin: int, function: str) -> Any | None:
+        """Return the last value seen for a pin, None if it never reported."""
+
+        return self._states.get((module, pin, function))
+
+    def as_dict(self) -> dict[int, dict[str, dict[int, Any]]]:
+        """Return the state cache as module -> function -> pin -> value."""
+
+        modules: dict[int, dict[str, dict[int, Any]]] = {}
+        for (module, pin, function), value in sorted(self._states.items()):
+            modules.setdefault(module, {}).setdefault(function, {})[pin] = value
+        return modules
+
+    async def async_dispatch(self, line: str) -> None:
+        """Route a raw frame to its subscribers."""
+
+        # Presses are events, not states, so they are not replayed later.
+        is_press = line.partition("=")[0].upper() in _PRESS_STATES
+
+        try:
+            values = parse_frame(line)
+        except (IndexError, ValueError):
+            _LOGGER.debug("Unable to parse frame: %s", line)
+            self._metrics.record_malformed(frame_module_id(line))
+            return
+
+        changed = False
+        for key, value in values:
+            if not is_press and self._states.get(key) != value:
+                self._states[key] = value
+                changed = True
+            if (callbacks := self._routes.get(key)) is None:
+                continue
+
+            for callback in tuple(callbacks):
+                try:
+                    await callback(value)
+                except Exception:
+                    _LOGGER.exception("Error handling %s for %s", line, key)
+
+        if changed:
+            for listener in self._state_listeners:
+                listener()
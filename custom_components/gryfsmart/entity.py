@@ -2,14 +2,37 @@
 
 from __future__ import annotations
 
-from pygryfsmart.api import GryfApi
-from pygryfsmart.device import _GryfDevice
+import logging
+from typing import Any
+
 
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity import Entity
 
-from .const import CONF_DEVICE_DATA
+from .batcher import GryfOutputBatcher
+from .const import (
+    CONF_BATCHER,
+    CONF_DEVICE_DATA,
+    CONF_DISPATCHER,
+    CONF_FADER,
+    CONF_OPTIMISTIC,
+    CONF_POLLER,
+    CONF_SCHEDULER,
+    CONF_TRACE,
+    DOMAIN,
+)
+from .device import GryfDevice
+from .dispatcher import FrameCallback, GryfDispatcher
+from .fade import GryfFader
+from .poller import GryfPoller
+from .scheduler import GryfCommandScheduler
+from .trace import GryfFrameTrace
+
+_LOGGER = logging.getLogger(__name__)
+
+_UNPUBLISHED = object()
 
 
 class _GryfSmartEntityBase(Entity):
@@ -18,31 +41,176 @@ class _GryfSmartEntityBase(Entity):
     _attr_should_poll = False
     _attr_entity_registry_enabled_default = True
 
-    _api: GryfApi
-    _device: _GryfDevice
+    _device: GryfDevice
     _attr_unique_id: str | None
+    # The shared objects of the connection.
+    _runtime_data: dict[str, Any]
+    _published_value: Any = _UNPUBLISHED
+
+    # Platform classes come after this one in the MRO, so the hooks they
+    # may define (_function, _subscriptions) are looked up with getattr
+    # rather than given defaults here, which would shadow them.
+    _function: str
+
+    # The command whose expected state is shown until the module confirms it.
+    _optimistic_command: object | None = None
+    _optimistic_value: Any = None
 
     @property
     def name(self) -> str:
         return self._device.name
 
+    @property
+    def _dispatcher(self) -> GryfDispatcher:
+        """Return the bus frame dispatcher."""
+        return self._runtime_data[CONF_DISPATCHER]
+
+    @property
+    def _batcher(self) -> GryfOutputBatcher:
+        """Return the output command batcher."""
+        return self._runtime_data[CONF_BATCHER]
+
+    @property
+    def _fader(self) -> GryfFader:
+        """Return the PWM fade scheduler."""
+        return self._runtime_data[CONF_FADER]
+
+    @property
+    def _scheduler(self) -> GryfCommandScheduler:
+        """Return the port write queue."""
+        return self._runtime_data[CONF_SCHEDULER]
+
+    @property
+    def _poller(self) -> GryfPoller:
+        """Return the state poller."""
+        return self._runtime_data[CONF_POLLER]
+
+    @property
+    def _trace(self) -> GryfFrameTrace:
+        """Return the raw frame trace of the port."""
+        return self._runtime_data[CONF_TRACE]
+
+    @property
+    def _optimistic(self) -> bool:
+        """Return whether output states are shown before they are confirmed."""
+        return self._runtime_data[CONF_OPTIMISTIC]
+
+    @property
+    def available(self) -> bool:
+        """Return False while a module the entity listens to is silent."""
+        return all(self._poller.module_available(module) for module in self._modules())
+
+    def _modules(self) -> set[int]:
+        """Return the modules the entity listens to."""
+        return {module for module, *_ in self._routes()}
+
+    def _routes(self) -> list[tuple[int, int, str, FrameCallback]]:
+        """Return the (module, pin, function, callback) routes to listen to.
+
+        Platform classes set _function to follow the entity's own pin or
+        define _subscriptions to listen to anything else.
+        """
+
+        if (subscriptions := getattr(self, "_subscriptions", None)) is not None:
+            return subscriptions()
+        if (function := getattr(self, "_function", None)) is None:
+            return []
+        return [(self._device.id, self._device.pin, function, self.async_update)]
+
+    def _publish_value(self, value: Any, deadband: float = 0.0) -> bool:
+        """Remember value as published, return False if it has not changed.
+
+        Values closer than deadband to the last published one count as
+        unchanged.
+        """
+
+        last = self._published_value
+        if last is not _UNPUBLISHED and (
+            value == last or (deadband and abs(value - last) < deadband)
+        ):
+            return False
+
+        self._published_value = value
+        return True
+
+    def _optimistic_state(self, reported: Any) -> Any:
+        """Return the state expected by an unconfirmed command, or the reported one."""
+
+        if self._optimistic_command is not None:
+            return self._optimistic_value
+        return reported
+
+    async def _async_set_output(self, action: int, expected: Any) -> None:
+        """Drive the entity's output pin.
+
+        In optimistic mode the expected state is shown as soon as the frame
+        was written, until the module confirms it. If the module doesn't,
+        the state it reported last is shown again.
+        """
+
+        module, pin = self._device.id, self._device.pin
+        if not self._optimistic:
+            await self._batcher.async_set_out(module, pin, action)
+            return
+
+        command = object()
+
+        @callback
+        def async_written() -> None:
+            self._optimistic_command = command
+            self._optimistic_value = expected
+            self.async_write_ha_state()
+
+        confirmed = False
+        try:
+            confirmed = await self._batcher.async_set_out(module, pin, action, async_written)
+        finally:
+            if self._optimistic_command is command:
+                self._optimistic_command = None
+                if not confirmed:
+                    _LOGGER.warning(
+                        "Module %s did not confirm %s, restoring its state",
+                        module,
+                        self.entity_id,
+                    )
+                    self.async_write_ha_state()
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to bus frames and pick up states reported before."""
+
+        await super().async_added_to_hass()
+
+        for module, pin, function, callback in self._routes():
+            self.async_on_remove(
+                self._dispatcher.subscribe(module, pin, function, callback)
+            )
+
+            if (value := self._dispatcher.state(module, pin, function)) is not None:
+                await callback(value)
+
+        for module in self._modules():
+            self.async_on_remove(
+                self._poller.subscribe_availability(module, self.async_write_ha_state)
+            )
+
 
 class GryfConfigFlowEntity(_GryfSmartEntityBase):
     """Gryf Config flow entity class."""
 
     _attr_has_entity_name = True
-    _device: _GryfDevice
+    _device: GryfDevice
     _config_entry: ConfigEntry
 
     def __init__(
         self,
         config_entry: ConfigEntry,
-        device: _GryfDevice,
+        device: GryfDevice,
     ) -> None:
         """Init Gryf config flow entity."""
 
         self._device = device
         self._config_entry = config_entry
+        self._runtime_data = config_entry.runtime_data
         super().__init__()
 
     @property
@@ -64,13 +232,19 @@ class GryfYamlEntity(_GryfSmartEntityBase):
     """Gryf yaml entity class."""
 
     _attr_has_entity_name = True
-    _device: _GryfDevice
+    _device: GryfDevice
 
-    def __init__(self, device: _GryfDevice) -> None:
+    def __init__(self, device: GryfDevice) -> None:
         """Init Gryf yaml entity."""
         super().__init__()
         self._device = device
 
+    async def async_added_to_hass(self) -> None:
+        """Pick up the shared objects of the connection."""
+
+        self._runtime_data = self.hass.data[DOMAIN]
+        await super().async_added_to_hass()
+
     @property
     def unique_id(self) -> str | None:
         """Return unique id."""
@@ -80,6 +254,6 @@ class GryfYamlEntity(_GryfSmartEntityBase):
     def extra_state_attributes(self):
         """Retrun extra state attributes."""
         return {
-            "id": self._device._id,
-            "pin": self._device._pin
+            "id": self._device.id,
+            "pin": self._device.pin
         }
@@ -0,0 +1,141 @@
+"""Host side PWM fades for Gryf Smart."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Hashable
+from dataclasses import dataclass
+from datetime import timedelta
+import logging
+import time
+
+from pygryfsmart.const import DriverActions
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import FADE_MAX_RATE, FADE_TICK, PRIORITY_BACKGROUND
+from .frames import PWM_STATE_REQUEST, pwm_frame, pwm_state_frame
+from .scheduler import GryfCommandScheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class _Fade:
+    """A PWM output moving from one level to another."""
+
+    start: int
+    target: int
+    started: float
+    duration: float
+    sent: int
+
+    def level(self, now: float) -> int:
+        """Return the level the output should have at a monotonic time."""
+
+        if now >= self.started + self.duration:
+            return self.target
+        return round(
+            self.start + (self.target - self.start) * (now - self.started) / self.duration
+        )
+
+
+class GryfFader:
+    """Run every PWM fade of a port on one common tick.
+
+    Every FADE_TICK seconds each fade works out the level it should have
+    by now and the outputs whose level changed get a SetLED frame. At
+    most FADE_MAX_RATE frames per second are written for all fades
+    together, the outputs furthest behind first, so fades never crowd out
+    user commands. A module whose fades all ended is asked for its levels
+    once, instead of after every step.
+    """
+
+    def __init__(self, hass: HomeAssistant, scheduler: GryfCommandScheduler) -> None:
+        """Init the fader."""
+
+        self._hass = hass
+        self._scheduler = scheduler
+        self._fades: dict[tuple[int, int], _Fade] = {}
+        self._unsub_tick: CALLBACK_TYPE | None = None
+
+    def is_fading(self, module: int, pin: int) -> bool:
+        """Return whether the output is being faded."""
+        return (module, pin) in self._fades
+
+    @callback
+    def fade(self, module: int, pin: int, start: int, target: int, duration: float) -> None:
+        """Fade an output from a level to another over duration seconds."""
+
+        self._fades[(module, pin)] = _Fade(start, target, time.monotonic(), duration, start)
+
+        if self._unsub_tick is None:
+            self._unsub_tick = async_track_time_interval(
+                self._hass, self._tick, timedelta(seconds=FADE_TICK)
+            )
+
+    @callback
+    def cancel(self, module: int, pin: int) -> int | None:
+        """Stop fading an output, return the last level sent if it was fading."""
+
+        if (fade := self._fades.pop((module, pin), None)) is None:
+            return None
+        return fade.sent
+
+    @callback
+    def stop(self) -> None:
+        """Drop every fade and stop the tick."""
+
+        self._fades.clear()
+        if self._unsub_tick is not None:
+            self._unsub_tick()
+            self._unsub_tick = None
+
+    @callback
+    def _tick(self, _now=None) -> None:
+        """Send the levels the fades reached."""
+
+        now = time.monotonic()
+        behind = []
+        for key, fade in self._fades.items():
+            level = fade.level(now)
+            if level != fade.sent:
+                behind.append((abs(level - fade.sent), key, level))
+
+        behind.sort(reverse=True)
+        frames = []
+        for _, (module, pin), level in behind[: max(1, int(FADE_MAX_RATE * FADE_TICK))]:
+            self._fades[(module, pin)].sent = level
+            frames.append((pwm_frame(module, pin, level), (DriverActions.SET_PWM, module, pin)))
+
+        ended = [key for key, fade in self._fades.items() if fade.sent == fade.target]
+        for key in ended:
+            del self._fades[key]
+
+        fading = {module for module, _ in self._fades}
+        for module in {module for module, _ in ended} - fading:
+            frames.append((pwm_state_frame(module), (PWM_STATE_REQUEST, module)))
+
+        if frames:
+            self._hass.async_create_background_task(
+                self._async_send(frames), "gryfsmart fade step"
+            )
+
+        if not self._fades and self._unsub_tick is not None:
+            self._unsub_tick()
+            self._unsub_tick = None
+
+    async def _async_send(self, frames: list[tuple[str, Hashable]]) -> None:
+        """Queue the frames of a tick, a newer step replaces a queued one."""
+
+        results = await asyncio.gather(
+            *(
+                self._scheduler.async_send(frame, PRIORITY_BACKGROUND, key)
+                for frame, key in frames
+            ),
+            return_exceptions=True,
+        )
+        for (frame, _), result in zip(frames, results, strict=True):
+            if isinstance(result, Exception):
+                _LOGGER.debug("Unable to send fade step %s: %s", frame.strip(), result)
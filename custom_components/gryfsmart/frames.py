@@ -0,0 +1,63 @@
+"""Build the command frames sent to Gryf Smart modules."""
+
+from __future__ import annotations
+
+# The shutter state request is only defined by the api constants.
+from pygryfsmart.api.const import DriverActions
+
+PWM_STATE_REQUEST = "stateLED"
+
+
+def output_frame(module: int, actions: dict[int, int]) -> str:
+    """Return the AT+SetOut frame setting many pins of one module."""
+
+    states = ["0"] * (8 if max(actions) > 6 else 6)
+    for pin, action in actions.items():
+        states[pin - 1] = str(int(action))
+
+    return f"{DriverActions.SET_OUT}={module}," + ",".join(states) + "\n\r"
+
+
+def pwm_frame(module: int, pin: int, level: int) -> str:
+    """Return the frame setting a PWM output level."""
+
+    return f"{DriverActions.SET_PWM}={module},{pin},{level},1\n\r"
+
+
+def pwm_state_frame(module: int) -> str:
+    """Return the frame asking a module for its PWM levels."""
+
+    return f"{PWM_STATE_REQUEST}={module}\n\r"
+
+
+def input_state_frame(module: int) -> str:
+    """Return the frame asking a module for its input states."""
+
+    return f"{DriverActions.GET_IN_STATE}={module}\n\r"
+
+
+def output_state_frame(module: int) -> str:
+    """Return the frame asking a module for its output states."""
+
+    return f"{DriverActions.GET_OUT_STATE}={module}\n\r"
+
+
+def shutter_state_frame(module: int) -> str:
+    """Return the frame asking a module for its shutter states."""
+
+    return f"{DriverActions.GET_SHUTTER_STATE}={module}\n\r"
+
+
+def cover_frame(module: int, time: int, operations: dict[int, int]) -> str:
+    """Return the AT+SetRol frame driving many shutters of one module."""
+
+    states = [0] * 4
+    for pin, operation in operations.items():
+        states[pin - 1] = int(operation)
+
+    checksum = module + time + sum(states)
+    return (
+        f"{DriverActions.SET_COVER}={module},{time},"
+        + ",".join(str(state) for state in states)
+        + f",{checksum}\n\r"
+    )
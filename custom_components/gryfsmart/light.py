@@ -1,24 +1,35 @@
 """Handle the Gryf Smart light platform functionality."""
 
+import time
 from typing import Any
 
-from pygryfsmart.device import _GryfDevice, GryfOutput, GryfPwm
+from pygryfsmart.const import DriverActions, DriverFunctions, OutputActions
 
-from homeassistant.components.light import ColorMode, LightEntity
+from homeassistant.components.light import (
+    ATTR_TRANSITION,
+    ColorMode,
+    LightEntity,
+    LightEntityFeature,
+)
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_TYPE
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.util.color import value_to_brightness, brightness_to_value
 
+from .device import GryfDevice
 from .entity import GryfConfigFlowEntity, GryfYamlEntity
+from .frames import PWM_STATE_REQUEST, pwm_frame, pwm_state_frame
 from .const import (
-    CONF_API,
+    CONF_COMMUNICATION,
     CONF_DEVICES,
     CONF_ID,
     CONF_NAME,
+    CONF_PWM_DEBOUNCE,
+    DEFAULT_PWM_DEBOUNCE,
     DOMAIN,
     Platforms
 )
@@ -35,22 +46,20 @@ async def async_setup_platform(
     pwm = []
 
     for conf in hass.data[DOMAIN].get(Platforms.LIGHT, {}):
-        device = GryfOutput(
+        device = GryfDevice(
             conf.get(CONF_NAME),
             conf.get(CONF_ID) // 10,
             conf.get(CONF_ID) % 10,
-            hass.data[DOMAIN][CONF_API],
         )
         lights.append(GryfYamlLight(device))
 
     for conf in hass.data[DOMAIN].get(Platforms.PWM, {}):
-        device = GryfPwm(
+        device = GryfDevice(
             conf.get(CONF_NAME),
             conf.get(CONF_ID) // 10,
             conf.get(CONF_ID) % 10,
-            hass.data[DOMAIN][CONF_API],
         )
-        pwm.append(GryfYamlPwm(device))
+        pwm.append(GryfYamlPwm(device, hass.data[DOMAIN][CONF_PWM_DEBOUNCE]))
 
     async_add_entities(lights)
     async_add_entities(pwm)
@@ -67,21 +76,27 @@ async def async_setup_entry(
 
     for conf in config_entry.data[CONF_DEVICES]:
         if conf.get(CONF_TYPE) == Platforms.LIGHT:
-            device = GryfOutput(
+            device = GryfDevice(
                 conf.get(CONF_NAME),
                 conf.get(CONF_ID) // 10,
                 conf.get(CONF_ID) % 10,
-                config_entry.runtime_data[CONF_API],
             )
             lights.append(GryfConfigFlowLight(device, config_entry))
         elif conf.get(CONF_TYPE) == Platforms.PWM:
-            device = GryfPwm(
+            device = GryfDevice(
                 conf.get(CONF_NAME),
                 conf.get(CONF_ID) // 10,
                 conf.get(CONF_ID) % 10,
-                config_entry.runtime_data[CONF_API],
             )
-            pwm.append(GryfConfigFlowPwm(device, config_entry))
+            pwm.append(
+                GryfConfigFlowPwm(
+                    device,
+                    config_entry,
+                    config_entry.data[CONF_COMMUNICATION].get(
+                        CONF_PWM_DEBOUNCE, DEFAULT_PWM_DEBOUNCE
+                    ),
+                )
+            )
 
     async_add_entities(lights)
     async_add_entities(pwm)
@@ -91,7 +106,8 @@ class GryfLightBase(LightEntity, RestoreEntity):
     """Gryf Light entity base."""
 
     _is_on = False
-    _device: _GryfDevice
+    _device: GryfDevice
+    _function = DriverFunctions.OUTPUTS
     _attr_color_mode = ColorMode.ONOFF
     _attr_supported_color_modes = {ColorMode.ONOFF}
 
@@ -99,17 +115,24 @@ class GryfLightBase(LightEntity, RestoreEntity):
     def is_on(self):
         """Return is on."""
 
-        return self._is_on
+        return self._optimistic_state(self._is_on)
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
 
-        if(last_state := await self.async_get_last_state()) is not None:
-            self._attr_is_on = last_state.state == "on"
+        # The state snapshot seeds the dispatcher, fall back to the last
+        # state only for pins it doesn't know yet.
+        if self._dispatcher.state(
+            self._device.id, self._device.pin, self._function
+        ) is None and (last_state := await self.async_get_last_state()) is not None:
+            self._is_on = last_state.state == "on"
 
     async def async_update(self, is_on):
         """Update state."""
 
+        if not self._publish_value(is_on):
+            return
+
         self._is_on = is_on
         if is_on:
             self._attr_icon = "mdi:lightbulb"
@@ -121,12 +144,12 @@ class GryfLightBase(LightEntity, RestoreEntity):
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn light on."""
 
-        await self._device.turn_on()
+        await self._async_set_output(OutputActions.ON, True)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn light off."""
 
-        await self._device.turn_off()
+        await self._async_set_output(OutputActions.OFF, False)
 
 
 class GryfConfigFlowLight(GryfConfigFlowEntity, GryfLightBase):
@@ -134,34 +157,54 @@ class GryfConfigFlowLight(GryfConfigFlowEntity, GryfLightBase):
 
     def __init__(
         self,
-        device: _GryfDevice,
+        device: GryfDevice,
         config_entry: ConfigEntry,
     ) -> None:
         """Init the Gryf Light."""
 
         self._config_entry = config_entry
         super().__init__(config_entry, device)
-        self._device.subscribe(self.async_update)
 
 
 class GryfYamlLight(GryfYamlEntity, GryfLightBase):
     """Gryf Smart Yaml Light class."""
 
-    def __init__(self, device: _GryfDevice) -> None:
+    def __init__(self, device: GryfDevice) -> None:
         """Init the Gryf Light."""
 
         super().__init__(device)
-        device.subscribe(self.async_update)
 
 class GryfPwmBase(LightEntity):
-    """Gryf Pwm entity base."""
+    """Gryf Pwm entity base.
+
+    Levels are debounced: a level is sent right away unless another one
+    was sent less than the debounce window ago. Then it waits for the end
+    of the window, replaced by any later level, so a dragged slider sends
+    at most one frame per window and always ends with its final level.
+    The brightness is shown as soon as it is asked for.
+
+    Transitions are handed to the connection's fader, which steps every
+    fading light of the port on a common tick.
+    """
 
     _is_on = False
     _brightness = 0
-    _device: _GryfDevice
+    _device: GryfDevice
+    _function = DriverFunctions.PWM
     _attr_color_mode = ColorMode.BRIGHTNESS
     _attr_supported_color_modes = {ColorMode.BRIGHTNESS}
-    _last_brightness = 0
+    _attr_supported_features = LightEntityFeature.TRANSITION
+    _level = 0
+    _last_level = 100
+    _debounce = DEFAULT_PWM_DEBOUNCE
+    _last_sent = 0.0
+    _pending_level: int | None = None
+    _unsub_level: CALLBACK_TYPE | None = None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+
+        self.async_on_remove(self._cancel_level)
 
     @property
     def brightness(self) -> int | None:
@@ -177,26 +220,104 @@ class GryfPwmBase(LightEntity):
     async def async_update(self, brightness):
         """Update state."""
 
-        self._is_on = bool(int(brightness))
-        self._brightness = value_to_brightness((0, 100), int(brightness))
+        # A newer level is on its way, the module reports an older one.
+        if self._unsub_level is not None or self._fader.is_fading(
+            self._device.id, self._device.pin
+        ):
+            return
+
+        if not self._publish_value(int(brightness)):
+            return
+
+        self._show_level(int(brightness))
         self.async_write_ha_state()
 
+    def _show_level(self, level: int) -> None:
+        """Set the state shown for a level."""
+
+        self._level = level
+        self._is_on = bool(level)
+        self._brightness = value_to_brightness((0, 100), level)
+
+    async def _async_set_level(self, level: int, transition: float | None = None) -> None:
+        """Show the level and send it, at most once per debounce window.
+
+        With a transition the level is faded to instead.
+        """
+
+        module, pin = self._device.id, self._device.pin
+        start = self._fader.cancel(module, pin)
+        if start is None:
+            start = self._level
+
+        self._publish_value(level)
+        self._show_level(level)
+        self.async_write_ha_state()
+
+        if transition:
+            self._cancel_level()
+            self._fader.fade(module, pin, start, level, transition)
+            return
+
+        if self._unsub_level is not None:
+            self._pending_level = level
+            return
+
+        delay = self._last_sent + self._debounce - time.monotonic()
+        if delay > 0:
+            self._pending_level = level
+            self._unsub_level = async_call_later(self.hass, delay, self._async_send_pending)
+            return
+
+        await self._async_send_level(level)
+
+    async def _async_send_pending(self, _now=None) -> None:
+        """Send the last level asked for during the debounce window."""
+
+        self._unsub_level = None
+        level, self._pending_level = self._pending_level, None
+        await self._async_send_level(level)
+
+    @callback
+    def _cancel_level(self) -> None:
+        """Drop the level waiting for the end of the debounce window."""
+
+        if self._unsub_level is not None:
+            self._unsub_level()
+            self._unsub_level = None
+        self._pending_level = None
+
+    async def _async_send_level(self, level: int) -> None:
+        """Queue the level frame, later levels replace a pending one."""
+
+        self._last_sent = time.monotonic()
+        module, pin = self._device.id, self._device.pin
+
+        await self._scheduler.async_send(
+            pwm_frame(module, pin, level), key=(DriverActions.SET_PWM, module, pin)
+        )
+        await self._scheduler.async_send(
+            pwm_state_frame(module), key=(PWM_STATE_REQUEST, module)
+        )
+
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn pwm on."""
         brightness = kwargs.get("brightness")
         if brightness is not None:
             percentage_brightness = int(brightness_to_value((0, 100), brightness))
-            await self._device.set_level(percentage_brightness)
+            if percentage_brightness:
+                self._last_level = percentage_brightness
 
-            if brightness:
-                self._last_brightness = brightness
+            await self._async_set_level(
+                percentage_brightness, kwargs.get(ATTR_TRANSITION)
+            )
         else:
-            await self._device.set_level(self._last_brightness)
+            await self._async_set_level(self._last_level, kwargs.get(ATTR_TRANSITION))
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn pwm off."""
 
-        await self._device.set_level(0)
+        await self._async_set_level(0, kwargs.get(ATTR_TRANSITION))
 
 
 class GryfConfigFlowPwm(GryfConfigFlowEntity, GryfPwmBase):
@@ -204,21 +325,22 @@ class GryfConfigFlowPwm(GryfConfigFlowEntity, GryfPwmBase):
 
     def __init__(
         self,
-        device: _GryfDevice,
+        device: GryfDevice,
         config_entry: ConfigEntry,
+        debounce: float,
     ) -> None:
         """Init the Gryf Light."""
 
         self._config_entry = config_entry
         super().__init__(config_entry, device)
-        self._device.subscribe(self.async_update)
+        self._debounce = debounce
 
 
 class GryfYamlPwm(GryfYamlEntity, GryfPwmBase):
     """Gryf Smart Yaml Light class."""
 
-    def __init__(self, device: _GryfDevice) -> None:
+    def __init__(self, device: GryfDevice, debounce: float) -> None:
         """Init the Gryf Light."""
 
         super().__init__(device)
-        device.subscribe(self.async_update)
+        self._debounce = debounce
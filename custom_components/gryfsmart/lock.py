@@ -1,17 +1,17 @@
 """Hanlde the GryfSmart Lock platform functionality."""
 
-from pygryfsmart.device import _GryfDevice, GryfOutput
+from pygryfsmart.const import DriverFunctions, OutputActions
 
 from homeassistant.components.lock import LockEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.const import CONF_TYPE
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 
+from .device import GryfDevice
 from .entity import GryfConfigFlowEntity, GryfYamlEntity
 from .const import (
-    CONF_API,
     CONF_DEVICES,
     CONF_ID,
     CONF_NAME,
@@ -29,11 +29,10 @@ async def async_setup_platform(
 
     locks = []
     for conf in hass.data[DOMAIN].get(Platforms.LOCK, []):
-        device = GryfOutput(
+        device = GryfDevice(
             conf.get(CONF_NAME),
             conf.get(CONF_ID) // 10,
             conf.get(CONF_ID) % 10,
-            hass.data[DOMAIN][CONF_API],
         )
 
 async def async_setup_entry(
@@ -46,11 +45,10 @@ async def async_setup_entry(
     locks = []
     for conf in config_entry.data[CONF_DEVICES]:
         if conf.get(CONF_TYPE) == Platforms.LOCK:
-            device = GryfOutput(
+            device = GryfDevice(
                 conf.get(CONF_NAME),
                 conf.get(CONF_ID) // 10,
                 conf.get(CONF_ID) % 10,
-                config_entry.runtime_data[CONF_API],
             )
             locks.append(GryfConfigFlowLock(device, config_entry))
 
@@ -59,22 +57,29 @@ async def async_setup_entry(
 class GryfLockBase(LockEntity):
     """Gryf Lock entity base."""
 
-    _device: GryfOutput
+    _device: GryfDevice
+    _function = DriverFunctions.OUTPUTS
     _attr_is_locked = False
     _attr_is_locking = False
     _attr_is_unlocking = False
 
+    @property
+    def is_locked(self) -> bool | None:
+        return self._optimistic_state(self._attr_is_locked)
+
     async def async_lock(self, **kwargs):
-        await self._device.turn_on()
+        if not self._optimistic:
+            self._attr_is_locking = True
+            self._async_write_lock_state()
 
-        self._attr_is_locking = True
-        self.async_write_ha_state()
+        await self._async_set_output(OutputActions.ON, True)
 
     async def async_unlock(self, **kwargs):
-        await self._device.turn_off()
+        if not self._optimistic:
+            self._attr_is_unlocking = True
+            self._async_write_lock_state()
 
-        self._attr_is_locking = False
-        self.async_write_ha_state()
+        await self._async_set_output(OutputActions.OFF, False)
 
     async def async_update(self, state):
         self._attr_is_locked = state
@@ -82,16 +87,24 @@ class GryfLockBase(LockEntity):
         self._attr_is_unlocking = False
         self._attr_is_locking = False
 
-        self.async_write_ha_state()
+        self._async_write_lock_state()
+
+    @callback
+    def _async_write_lock_state(self) -> None:
+        """Write state if the lock state changed."""
+
+        if self._publish_value(
+            (bool(self._attr_is_locked), self._attr_is_locking, self._attr_is_unlocking)
+        ):
+            self.async_write_ha_state()
 
 class GryfConfigFlowLock(GryfConfigFlowEntity, GryfLockBase):
     
     def __init__(
         self,
-        device: _GryfDevice,
+        device: GryfDevice,
         config_entry: ConfigEntry,
     ) -> None:
 
         self._config_entry = config_entry
         super().__init__(config_entry, device)
-        self._device.subscribe(self.async_update)
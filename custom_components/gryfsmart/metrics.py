@@ -0,0 +1,209 @@
+"""Bus and command path metrics of a Gryf Smart port."""
+
+from __future__ import annotations
+
+import bisect
+from collections import Counter
+from datetime import timedelta
+import time
+from typing import Any
+
+from pygryfsmart.api import GryfApi
+from pygryfsmart.api.const import BAUDRATE
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import METRICS_INTERVAL, METRICS_LATENCY_BUCKETS
+from .scheduler import GryfCommandScheduler
+
+# A frame on the wire carries a start and a stop bit per byte plus the
+# line terminator the reader strips.
+_BITS_PER_BYTE = 10
+_LINE_END = 2
+
+
+class GryfHistogram:
+    """Count samples in fixed millisecond buckets."""
+
+    def __init__(self, buckets: tuple[float, ...] = METRICS_LATENCY_BUCKETS) -> None:
+        """Init the histogram."""
+
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0
+
+    def record(self, value: float) -> None:
+        """Add a sample in milliseconds."""
+
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += 1
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return the upper bound of the bucket holding the percentile."""
+
+        if not self.total:
+            return None
+
+        rank = fraction * self.total
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.buckets[min(index, len(self.buckets) - 1)]
+        return self.buckets[-1]
+
+    def as_dict(self) -> dict[str, int]:
+        """Return the bucket counts keyed by their upper bound."""
+
+        labels = [f"le_{bucket:g}" for bucket in self.buckets] + ["le_inf"]
+        return dict(zip(labels, self.counts, strict=True))
+
+
+class GryfMetrics:
+    """Collect what happens on a port and publish it every interval.
+
+    Counters are totals since the connection was opened. Rates and the bus
+    utilisation are worked out when the interval elapses, then listeners
+    are called so the diagnostic sensors can write their state.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: GryfApi,
+        scheduler: GryfCommandScheduler,
+    ) -> None:
+        """Init the metrics."""
+
+        self._hass = hass
+        self._scheduler = scheduler
+        self.frames_in = 0
+        self.frames_out = 0
+        self.frames_in_rate = 0.0
+        self.frames_out_rate = 0.0
+        self.bus_utilisation = 0.0
+        self.poll_duration: float | None = None
+        self.command_latency = GryfHistogram()
+        self.confirm_latency = GryfHistogram()
+        self.command_timeouts: Counter[int] = Counter()
+        self.malformed_frames: Counter[int | None] = Counter()
+        self._bytes = 0
+        self._last = (time.monotonic(), 0, 0, 0)
+        self._listeners: list[CALLBACK_TYPE] = []
+        self._unsub_interval: CALLBACK_TYPE | None = None
+
+        api.subscribe_input_message(self._async_frame_in)
+        api.subscribe_output_message(self._async_frame_out)
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of frames waiting to be written."""
+        return self._scheduler.depth
+
+    @property
+    def peak_queue_depth(self) -> int:
+        """Return the deepest the write queue has been."""
+        return self._scheduler.peak_depth
+
+    async def _async_frame_in(self, line: str) -> None:
+        self.frames_in += 1
+        self._bytes += len(line) + _LINE_END
+
+    async def _async_frame_out(self, line: str) -> None:
+        self.frames_out += 1
+        self._bytes += len(line)
+
+    def record_poll(self, seconds: float) -> None:
+        """Record how long a module poll took."""
+        self.poll_duration = round(seconds * 1000, 1)
+
+    def record_command_latency(self, seconds: float) -> None:
+        """Record the time from a command frame to its confirmation."""
+        self.command_latency.record(seconds * 1000)
+
+    def record_confirm_latency(self, seconds: float) -> None:
+        """Record the time from a written command frame to its confirmation."""
+        self.confirm_latency.record(seconds * 1000)
+
+    def record_timeout(self, module: int) -> None:
+        """Record a command the module never confirmed."""
+        self.command_timeouts[module] += 1
+
+    def record_malformed(self, module: int | None) -> None:
+        """Record a frame which could not be parsed."""
+        self.malformed_frames[module] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics."""
+
+        return {
+            "frames_in": self.frames_in,
+            "frames_out": self.frames_out,
+            "frames_in_rate": self.frames_in_rate,
+            "frames_out_rate": self.frames_out_rate,
+            "bus_utilisation": self.bus_utilisation,
+            "queue_depth": self.queue_depth,
+            "peak_queue_depth": self.peak_queue_depth,
+            "command_latency": {
+                "p50": self.command_latency.percentile(0.5),
+                "p95": self.command_latency.percentile(0.95),
+                "histogram": self.command_latency.as_dict(),
+            },
+            "confirm_latency": {
+                "p50": self.confirm_latency.percentile(0.5),
+                "p95": self.confirm_latency.percentile(0.95),
+                "histogram": self.confirm_latency.as_dict(),
+            },
+            "command_timeouts": dict(self.command_timeouts),
+            "malformed_frames": dict(self.malformed_frames),
+        }
+
+    @callback
+    def async_add_listener(self, listener: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call back whenever the rates were updated."""
+
+        self._listeners.append(listener)
+
+        @callback
+        def remove() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return remove
+
+    @callback
+    def _async_update(self, _now=None) -> None:
+        """Work out the rates of the last interval."""
+
+        now = time.monotonic()
+        last_time, frames_in, frames_out, sent_bytes = self._last
+        elapsed = now - last_time or 1
+
+        self.frames_in_rate = round((self.frames_in - frames_in) / elapsed, 1)
+        self.frames_out_rate = round((self.frames_out - frames_out) / elapsed, 1)
+        self.bus_utilisation = round(
+            min(100.0, (self._bytes - sent_bytes) * _BITS_PER_BYTE / BAUDRATE / elapsed * 100),
+            1,
+        )
+        self._last = (now, self.frames_in, self.frames_out, self._bytes)
+
+        for listener in tuple(self._listeners):
+            listener()
+
+    @callback
+    def start(self) -> None:
+        """Start publishing every METRICS_INTERVAL seconds."""
+
+        if self._unsub_interval is None:
+            self._unsub_interval = async_track_time_interval(
+                self._hass, self._async_update, timedelta(seconds=METRICS_INTERVAL)
+            )
+
+    @callback
+    def stop(self) -> None:
+        """Stop publishing."""
+
+        if self._unsub_interval is not None:
+            self._unsub_interval()
+            self._unsub_interval = None
@@ -0,0 +1,128 @@
+"""Position model of Gryf Smart shutters."""
+
+from __future__ import annotations
+
+import math
+import time
+
+from .const import COVER_CLOSING, COVER_OPENING, COVER_STOPPED
+
+# A timer firing a hair before its milestone still counts as on it.
+_EPSILON = 1e-3
+
+
+class GryfCoverMotion:
+    """Work out a shutter's position and tilt from how long it has moved.
+
+    Nothing runs while the shutter travels: the position is computed from
+    where it started, the direction and the elapsed time whenever it is
+    read. When a shutter starts moving its slats turn first, which takes
+    up to tilt_time seconds, then it travels 100% in travel_time seconds.
+    """
+
+    def __init__(
+        self,
+        travel_time: float,
+        tilt_time: float,
+        position: float = 100.0,
+        tilt: float = 100.0,
+    ) -> None:
+        """Init the motion."""
+
+        self.travel_time = travel_time
+        self.tilt_time = tilt_time
+        self.direction = COVER_STOPPED
+        self._position = position
+        self._tilt = tilt
+        self._started = 0.0
+
+    def _tilt_span(self, direction: int, tilt: float) -> float:
+        """Return the seconds the slats turn before the shutter travels."""
+
+        left = 100.0 - tilt if direction == COVER_OPENING else tilt
+        return left / 100.0 * self.tilt_time
+
+    def _at(self, now: float) -> tuple[float, float]:
+        """Return the position and tilt at a monotonic time."""
+
+        if self.direction == COVER_STOPPED:
+            return self._position, self._tilt
+
+        sign = 1 if self.direction == COVER_OPENING else -1
+        elapsed = now - self._started
+        span = self._tilt_span(self.direction, self._tilt)
+
+        if self.tilt_time:
+            tilt = self._tilt + sign * min(elapsed, span) / self.tilt_time * 100.0
+        else:
+            tilt = 100.0 if sign > 0 else 0.0
+        position = self._position + sign * max(0.0, elapsed - span) / self.travel_time * 100.0
+
+        return min(100.0, max(0.0, position)), min(100.0, max(0.0, tilt))
+
+    @property
+    def position(self) -> float:
+        """Return the current position, 0 is closed."""
+        return self._at(time.monotonic())[0]
+
+    @property
+    def tilt(self) -> float:
+        """Return the current tilt, 0 is closed."""
+        return self._at(time.monotonic())[1]
+
+    def start(self, direction: int) -> None:
+        """Start moving from wherever the shutter is now."""
+
+        now = time.monotonic()
+        self._position, self._tilt = self._at(now)
+        self.direction = direction
+        self._started = now
+
+    def stop(self) -> None:
+        """Stop where the shutter is now."""
+
+        self._position, self._tilt = self._at(time.monotonic())
+        self.direction = COVER_STOPPED
+
+    def set(self, position: float, tilt: float) -> None:
+        """Put a stopped shutter at a known position and tilt."""
+
+        self._position = position
+        self._tilt = tilt
+
+    def time_to(self, position: float | None = None, tilt: float | None = None) -> float:
+        """Return the seconds needed to reach a position or a tilt from here.
+
+        The shutter is assumed to move towards the target, turning its
+        slats first when it moves towards a position.
+        """
+
+        current, current_tilt = self._at(time.monotonic())
+
+        if position is not None:
+            direction = COVER_OPENING if position > current else COVER_CLOSING
+            return (
+                self._tilt_span(direction, current_tilt)
+                + abs(position - current) / 100.0 * self.travel_time
+            )
+
+        if tilt is not None and self.tilt_time:
+            return abs(tilt - current_tilt) / 100.0 * self.tilt_time
+
+        return 0.0
+
+    def time_to_milestone(self, step: float) -> float | None:
+        """Return the seconds until the moving shutter crosses a step multiple."""
+
+        if self.direction == COVER_STOPPED:
+            return None
+
+        current = self._at(time.monotonic())[0]
+        if self.direction == COVER_OPENING:
+            milestone = min(100.0, (math.floor(current / step + _EPSILON) + 1) * step)
+        else:
+            milestone = max(0.0, (math.ceil(current / step - _EPSILON) - 1) * step)
+
+        if abs(milestone - current) < _EPSILON:
+            return None
+        return self.time_to(position=milestone)
@@ -0,0 +1,382 @@
+"""Adaptive state refresh for the Gryf Smart bus."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+import logging
+import time
+from typing import Any
+
+from pygryfsmart.api import GryfApi
+from pygryfsmart.api.const import DriverActions
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+
+from .const import (
+    POLL_ANSWER_TIMEOUT,
+    POLL_BUSY_FRAME_RATE,
+    POLL_COMMAND_DELAY,
+    POLL_MAX_BACKOFF,
+    PRIORITY_POLL,
+    REPROBE_MAX_INTERVAL,
+    REPROBE_MIN_INTERVAL,
+    SWEEP_CONCURRENCY,
+    SWEEP_MODULE_TIMEOUT,
+)
+from .frames import input_state_frame, output_state_frame, shutter_state_frame
+from .metrics import GryfMetrics
+from .scheduler import GryfCommandScheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def frame_module_id(line: str) -> int | None:
+    """Return the module id a raw bus frame belongs to."""
+
+    try:
+        return int(line.split("=")[1].split(",")[0].split(";")[0])
+    except (IndexError, ValueError):
+        return None
+
+
+class GryfPoller:
+    """Refresh module states that went quiet on the bus.
+
+    Modules report changes with unsolicited frames, so a module is only
+    asked for its state when nothing was heard from it for longer than the
+    staleness budget. At most one module is polled per interval and polling
+    backs off while the bus is busy with other traffic or commands are
+    waiting to be written.
+
+    Modules with shutters are asked for their shutter states as well, so a
+    lost stop report doesn't leave a shutter moving in Home Assistant.
+
+    A module which doesn't answer a poll within POLL_ANSWER_TIMEOUT counts
+    as unavailable. It is left out of the regular polling and probed again
+    with an exponential backoff instead, so a dead module doesn't take bus
+    time from the live ones. When it speaks up on its own, only that module
+    is polled to bring its entities up to date.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: GryfApi,
+        scheduler: GryfCommandScheduler,
+        metrics: GryfMetrics,
+        module_count: int,
+        interval: float,
+        stale_timeout: float,
+    ) -> None:
+        """Init the poller."""
+
+        self._hass = hass
+        self._scheduler = scheduler
+        self._metrics = metrics
+        self._last_seen: dict[int, float] = {}
+        self._unavailable: set[int] = set()
+        self._answers: dict[int, asyncio.Event] = {}
+        self._pending: dict[int, float] = {}
+        self._retry_at: dict[int, float] = {}
+        self._retry_delay: dict[int, float] = {}
+        self._availability_listeners: dict[int, list[CALLBACK_TYPE]] = {}
+        self._shutter_modules: dict[int, int] = {}
+        self.sweep_progress = (0, 0)
+        self._frames = 0
+        self._backoff = 1
+        self._task: asyncio.Task | None = None
+
+        self.set_module_count(module_count)
+        self.set_interval(interval, stale_timeout)
+
+        api.subscribe_input_message(self._async_frame_in)
+        api.subscribe_output_message(self._async_frame_out)
+
+    def set_module_count(self, module_count: int) -> None:
+        """Set the modules the poller looks after."""
+
+        self._last_seen = {
+            module: self._last_seen.get(module, 0.0)
+            for module in range(1, module_count + 1)
+        }
+
+    def set_interval(self, interval: float, stale_timeout: float) -> None:
+        """Set the poll interval and the staleness budget."""
+
+        self._interval = interval
+        self._stale_timeout = stale_timeout
+
+    def module_available(self, module: int) -> bool:
+        """Return whether the module answered since it was last found silent."""
+        return module not in self._unavailable
+
+    def subscribe_availability(self, module: int, callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call back when the module goes silent or answers again."""
+
+        listeners = self._availability_listeners.setdefault(module, [])
+        listeners.append(callback)
+
+        def unsubscribe() -> None:
+            if callback in listeners:
+                listeners.remove(callback)
+
+        return unsubscribe
+
+    def watch_shutters(self, module: int) -> CALLBACK_TYPE:
+        """Poll the shutter states of the module too, until unsubscribed."""
+
+        self._shutter_modules[module] = self._shutter_modules.get(module, 0) + 1
+
+        def unsubscribe() -> None:
+            self._shutter_modules[module] -= 1
+            if not self._shutter_modules[module]:
+                del self._shutter_modules[module]
+
+        return unsubscribe
+
+    def _set_available(self, module: int, available: bool) -> None:
+        """Record a module availability change and tell the listeners."""
+
+        if available == self.module_available(module):
+            return
+
+        if available:
+            _LOGGER.info("Module %s is answering again", module)
+            self._unavailable.discard(module)
+            self._retry_at.pop(module, None)
+            self._retry_delay.pop(module, None)
+        else:
+            _LOGGER.warning("Module %s is not answering", module)
+            self._unavailable.add(module)
+
+        for listener in tuple(self._availability_listeners.get(module, ())):
+            listener()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the poll timing and when every module was last refreshed."""
+
+        now = time.monotonic()
+        return {
+            "interval": self._interval,
+            "stale_timeout": self._stale_timeout,
+            "backoff": self._backoff,
+            "last_poll_duration_ms": self._metrics.poll_duration,
+            "sweep_progress": list(self.sweep_progress),
+            "unavailable": sorted(self._unavailable),
+            "next_probe_in": {
+                module: round(retry_at - now, 1)
+                for module, retry_at in self._retry_at.items()
+            },
+            "seconds_since_refresh": {
+                module: round(now - last_seen, 1) if last_seen else None
+                for module, last_seen in self._last_seen.items()
+            },
+        }
+
+    async def _async_frame_in(self, line: str) -> None:
+        """Mark the module which sent the frame as fresh."""
+
+        self._frames += 1
+
+        module = frame_module_id(line)
+        if module not in self._last_seen:
+            return
+
+        self._last_seen[module] = time.monotonic()
+        solicited = self._pending.pop(module, None) is not None
+        if (answer := self._answers.get(module)) is not None:
+            answer.set()
+            solicited = True
+
+        if self.module_available(module):
+            return
+
+        self._set_available(module, True)
+        if not solicited:
+            self._hass.async_create_background_task(
+                self._async_resync(module), f"gryfsmart resync module {module}"
+            )
+
+    async def _async_frame_out(self, line: str) -> None:
+        """Count outgoing frames as bus load."""
+
+        self._frames += 1
+
+    def _module_failed(self, module: int) -> None:
+        """Mark a module unavailable and schedule its next probe."""
+
+        delay = self._retry_delay.get(module)
+        delay = REPROBE_MIN_INTERVAL if delay is None else min(delay * 2, REPROBE_MAX_INTERVAL)
+        self._retry_delay[module] = delay
+        self._retry_at[module] = time.monotonic() + delay
+
+        self._set_available(module, False)
+        _LOGGER.debug("Probing module %s again in %s s", module, delay)
+
+    def _expire_pending(self) -> None:
+        """Fail the modules which didn't answer their poll in time."""
+
+        now = time.monotonic()
+        for module, deadline in tuple(self._pending.items()):
+            if deadline <= now:
+                del self._pending[module]
+                self._module_failed(module)
+
+    def _due_module(self) -> int | None:
+        """Return an unavailable module due for its next probe."""
+
+        now = time.monotonic()
+        module = min(self._retry_at, key=self._retry_at.__getitem__, default=None)
+
+        if module is None or self._retry_at[module] > now:
+            return None
+        del self._retry_at[module]
+        return module
+
+    def _stalest_module(self) -> int | None:
+        """Return the module quiet for the longest time past the budget."""
+
+        deadline = time.monotonic() - self._stale_timeout
+        module = min(
+            (module for module in self._last_seen if module not in self._unavailable),
+            key=self._last_seen.__getitem__,
+            default=None,
+        )
+
+        if module is None or self._last_seen[module] > deadline:
+            return None
+        return module
+
+    async def _async_poll(self, module: int) -> None:
+        """Ask a single module for its input, output and shutter states."""
+
+        started = time.monotonic()
+        await self._scheduler.async_send(
+            input_state_frame(module),
+            PRIORITY_POLL,
+            (DriverActions.GET_IN_STATE, module),
+        )
+        await asyncio.sleep(POLL_COMMAND_DELAY)
+        await self._scheduler.async_send(
+            output_state_frame(module),
+            PRIORITY_POLL,
+            (DriverActions.GET_OUT_STATE, module),
+        )
+        if module in self._shutter_modules:
+            await asyncio.sleep(POLL_COMMAND_DELAY)
+            await self._scheduler.async_send(
+                shutter_state_frame(module),
+                PRIORITY_POLL,
+                (DriverActions.GET_SHUTTER_STATE, module),
+            )
+
+        # Don't poll the same module again before it had a chance to answer.
+        self._last_seen[module] = time.monotonic()
+        self._metrics.record_poll(self._last_seen[module] - started)
+
+    async def _async_resync(self, module: int) -> None:
+        """Poll a module which came back, without waiting for its slot."""
+
+        try:
+            await self._async_poll(module)
+        except Exception as e:  # noqa: BLE001
+            _LOGGER.error("Error polling module %s: %s", module, e)
+
+    async def _async_probe(self, module: int) -> bool:
+        """Poll a module and wait for it to answer."""
+
+        answer = self._answers[module] = asyncio.Event()
+        try:
+            await self._async_poll(module)
+            async with asyncio.timeout(SWEEP_MODULE_TIMEOUT):
+                await answer.wait()
+        except TimeoutError:
+            return False
+        except Exception as e:  # noqa: BLE001
+            _LOGGER.error("Error polling module %s: %s", module, e)
+            return False
+        finally:
+            self._answers.pop(module, None)
+
+        return True
+
+    async def async_sweep(self, modules: Iterable[int] | None = None) -> None:
+        """Ask the given modules, or every module, for their states.
+
+        Up to SWEEP_CONCURRENCY modules are waited on at once, so a silent
+        module only delays the modules queued behind it by its own timeout.
+        Modules which don't answer are marked unavailable.
+        """
+
+        modules = [
+            module
+            for module in (self._last_seen if modules is None else modules)
+            if module in self._last_seen
+        ]
+        window = asyncio.Semaphore(SWEEP_CONCURRENCY)
+        done = 0
+        self.sweep_progress = (done, len(modules))
+
+        async def async_sweep_module(module: int) -> None:
+            nonlocal done
+
+            async with window:
+                answered = await self._async_probe(module)
+
+            done += 1
+            self.sweep_progress = (done, len(modules))
+            _LOGGER.debug(
+                "State sweep %s/%s: module %s %s",
+                done,
+                len(modules),
+                module,
+                "answered" if answered else "is silent",
+            )
+            if not answered:
+                self._module_failed(module)
+
+        await asyncio.gather(*(async_sweep_module(module) for module in modules))
+
+    async def _async_run(self) -> None:
+        """Poll loop."""
+
+        while True:
+            period = self._interval * self._backoff
+            await asyncio.sleep(period)
+
+            frames, self._frames = self._frames, 0
+            if frames > POLL_BUSY_FRAME_RATE * period or self._scheduler.depth:
+                self._backoff = min(self._backoff * 2, POLL_MAX_BACKOFF)
+                _LOGGER.debug("Bus busy (%s frames), poll backoff %s", frames, self._backoff)
+                continue
+            self._backoff = 1
+
+            self._expire_pending()
+            if (module := self._due_module() or self._stalest_module()) is None:
+                continue
+
+            self._pending[module] = time.monotonic() + POLL_ANSWER_TIMEOUT
+            try:
+                await self._async_poll(module)
+            except Exception as e:  # noqa: BLE001
+                _LOGGER.error("Error polling module %s: %s", module, e)
+
+    def start(self) -> None:
+        """Start the poll loop."""
+
+        if self._task is None:
+            self._task = self._hass.async_create_background_task(
+                self._async_run(), "gryfsmart poller"
+            )
+
+    async def async_stop(self) -> None:
+        """Stop the poll loop."""
+
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
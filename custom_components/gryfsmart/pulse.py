@@ -0,0 +1,80 @@
+"""Momentary output pulses for gates, strikes and bells."""
+
+from __future__ import annotations
+
+from pygryfsmart.const import OutputActions
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .batcher import GryfOutputBatcher
+
+
+class GryfPulse:
+    """Switch an output on and release it after a fixed width.
+
+    Starting a pulse only queues the on frame and returns. The release
+    runs on a loop timer armed once the frame was written, so the output
+    is held for the full width however long the frame waited in the queue.
+    Starting a pulse while one is running restarts its width.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        batcher: GryfOutputBatcher,
+        module: int,
+        pin: int,
+        width: float,
+    ) -> None:
+        """Init the pulse."""
+
+        self._hass = hass
+        self._batcher = batcher
+        self._module = module
+        self._pin = pin
+        self._width = width
+        self._unsub_release: CALLBACK_TYPE | None = None
+
+    @property
+    def active(self) -> bool:
+        """Return whether the output is held on."""
+        return self._unsub_release is not None
+
+    @callback
+    def async_start(self) -> None:
+        """Queue switching the output on, without waiting for the module."""
+
+        self._hass.async_create_background_task(
+            self._batcher.async_set_out(
+                self._module, self._pin, OutputActions.ON, self._async_written
+            ),
+            "gryfsmart pulse",
+        )
+
+    @callback
+    def _async_written(self) -> None:
+        """Schedule the release once the on frame was written."""
+
+        if self._unsub_release is not None:
+            self._unsub_release()
+
+        self._unsub_release = async_call_later(
+            self._hass, self._width, self._async_release
+        )
+
+    async def _async_release(self, _now=None) -> None:
+        """Switch the output off."""
+
+        self._unsub_release = None
+        await self._batcher.async_set_out(self._module, self._pin, OutputActions.OFF)
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancel the pending release and switch the output off right away."""
+
+        if self._unsub_release is None:
+            return
+
+        self._unsub_release()
+        self._hass.async_create_task(self._async_release())
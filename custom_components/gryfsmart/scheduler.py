@@ -0,0 +1,145 @@
+"""Prioritised write queue for a Gryf Smart port."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Hashable
+from dataclasses import dataclass, field
+import heapq
+import itertools
+import logging
+
+from pygryfsmart.api import GryfApi
+
+from homeassistant.core import HomeAssistant
+
+from .const import PRIORITY_COMMAND, SCHEDULER_QUEUE_SIZE
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class _Command:
+    """A frame waiting to be written."""
+
+    frame: str
+    sent: asyncio.Future[None] = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+
+
+class GryfCommandScheduler:
+    """Serialise every frame the integration writes to the port.
+
+    Frames are written lowest priority value first, so user commands
+    overtake polls. A frame queued under the key of a frame which is still
+    pending replaces it, and once the queue holds SCHEDULER_QUEUE_SIZE
+    frames new senders wait for space.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: GryfApi,
+        max_size: int = SCHEDULER_QUEUE_SIZE,
+    ) -> None:
+        """Init the scheduler."""
+
+        self._hass = hass
+        self._api = api
+        self._max_size = max_size
+        self._heap: list[tuple[int, int, Hashable]] = []
+        self._pending: dict[Hashable, _Command] = {}
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self._task: asyncio.Task | None = None
+        self.peak_depth = 0
+
+    @property
+    def depth(self) -> int:
+        """Return the number of frames waiting to be written."""
+        return len(self._pending)
+
+    async def async_send(
+        self,
+        frame: str,
+        priority: int = PRIORITY_COMMAND,
+        key: Hashable | None = None,
+    ) -> None:
+        """Queue a frame and wait until it was written."""
+
+        if key is not None and (command := self._pending.get(key)) is not None:
+            command.frame = frame
+            await asyncio.shield(command.sent)
+            return
+
+        while len(self._pending) >= self._max_size:
+            _LOGGER.debug("Write queue full, waiting for space")
+            await self._not_full.wait()
+
+        if key is None:
+            key = object()
+
+        command = _Command(frame)
+        self._pending[key] = command
+        heapq.heappush(self._heap, (priority, next(self._counter), key))
+
+        self.peak_depth = max(self.peak_depth, len(self._pending))
+        if len(self._pending) >= self._max_size:
+            self._not_full.clear()
+        self._wakeup.set()
+
+        await asyncio.shield(command.sent)
+
+    async def _async_run(self) -> None:
+        """Write loop."""
+
+        while True:
+            if not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            _, _, key = heapq.heappop(self._heap)
+            command = self._pending.pop(key)
+            self._not_full.set()
+
+            try:
+                await self._api.send_data(command.frame)
+            except Exception as e:  # noqa: BLE001
+                _LOGGER.error("Error writing %s: %s", command.frame.strip(), e)
+                command.sent.set_exception(e)
+            else:
+                command.sent.set_result(None)
+            finally:
+                # Stopping cancels the loop in the middle of a write, fail
+                # the frame rather than leave its sender waiting forever.
+                if not command.sent.done():
+                    command.sent.cancel()
+
+    def start(self) -> None:
+        """Start the write loop."""
+
+        if self._task is None:
+            self._task = self._hass.async_create_background_task(
+                self._async_run(), "gryfsmart scheduler"
+            )
+
+    async def async_stop(self) -> None:
+        """Stop the write loop and fail the frames still queued or being written."""
+
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        for command in self._pending.values():
+            command.sent.cancel()
+        self._pending.clear()
+        self._heap.clear()
+        self._not_full.set()
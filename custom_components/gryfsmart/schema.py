@@ -6,6 +6,10 @@ from homeassistant.helpers import config_validation as cv
 
 from .const import (
     DOMAIN,
+    CONF_CONCURRENCY,
+    CONF_FIRST,
+    CONF_LAST,
+    CONF_TIMEOUT,
     CONF_TEMP,
     CONF_OUT,
     CONF_INPUTS,
@@ -15,6 +19,28 @@ from .const import (
     CONF_PORT,
     CONF_DEVICE_CLASS,
     CONF_TIME,
+    CONF_OUTPUTS,
+    CONF_POSITION_STEP,
+    CONF_PULSE_WIDTH,
+    CONF_TILT_TIME,
+    CONF_STATE,
+    CONF_STALE_TIMEOUT,
+    CONF_TEMPERATURE_DEADBAND,
+    CONF_PWM_DEBOUNCE,
+    CONF_LINE_WRITE_INTERVAL,
+    CONF_OPTIMISTIC,
+    CONF_UPDATE_INTERVAL,
+    DEFAULT_POSITION_STEP,
+    DEFAULT_PULSE_WIDTH,
+    DEFAULT_TILT_TIME,
+    DEFAULT_STALE_TIMEOUT,
+    DEFAULT_TEMPERATURE_DEADBAND,
+    DEFAULT_PWM_DEBOUNCE,
+    DEFAULT_LINE_WRITE_INTERVAL,
+    DEFAULT_OPTIMISTIC,
+    DEFAULT_UPDATE_INTERVAL,
+    SEARCH_CONCURRENCY,
+    SEARCH_TIMEOUT,
     Platforms
 )
 
@@ -43,6 +69,12 @@ COVER_SCHEMA = vol.Schema(
         vol.Required(CONF_NAME): cv.string,
         vol.Required(CONF_ID): cv.positive_int,
         vol.Required(CONF_TIME): cv.positive_int,
+        vol.Optional(CONF_POSITION_STEP, default=DEFAULT_POSITION_STEP): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+        vol.Optional(CONF_TILT_TIME, default=DEFAULT_TILT_TIME): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
     }
 )
 GATE_SCHEMA = vol.Schema(
@@ -50,6 +82,7 @@ GATE_SCHEMA = vol.Schema(
         vol.Required(CONF_NAME): cv.string,
         vol.Required(CONF_ID): cv.positive_int,
         vol.Optional(CONF_INPUTS): cv.positive_int,
+        vol.Optional(CONF_PULSE_WIDTH, default=DEFAULT_PULSE_WIDTH): cv.positive_float,
     }
 )
 
@@ -59,6 +92,12 @@ CONFIG_SCHEMA = vol.Schema(
             {
                 vol.Required(CONF_PORT): cv.string,
                 vol.Required(CONF_MODULE_COUNT): cv.positive_int,
+                vol.Optional(CONF_UPDATE_INTERVAL, default=DEFAULT_UPDATE_INTERVAL): vol.All(cv.positive_int, vol.Range(min=1)),
+                vol.Optional(CONF_STALE_TIMEOUT, default=DEFAULT_STALE_TIMEOUT): cv.positive_int,
+                vol.Optional(CONF_TEMPERATURE_DEADBAND, default=DEFAULT_TEMPERATURE_DEADBAND): cv.positive_float,
+                vol.Optional(CONF_PWM_DEBOUNCE, default=DEFAULT_PWM_DEBOUNCE): cv.positive_float,
+                vol.Optional(CONF_LINE_WRITE_INTERVAL, default=DEFAULT_LINE_WRITE_INTERVAL): cv.positive_float,
+                vol.Optional(CONF_OPTIMISTIC, default=DEFAULT_OPTIMISTIC): cv.boolean,
                 vol.Optional(Platforms.PWM): vol.All(cv.ensure_list, [STANDARD_SCHEMA]),
                 vol.Optional(Platforms.LIGHT): vol.All(cv.ensure_list , [STANDARD_SCHEMA]),
                 vol.Optional(Platforms.INPUT): vol.All(cv.ensure_list , [STANDARD_SCHEMA]),
@@ -73,3 +112,37 @@ CONFIG_SCHEMA = vol.Schema(
     },
     extra=vol.ALLOW_EXTRA,
 )
+
+OUTPUT_STATE_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_ID): cv.positive_int,
+        vol.Required(CONF_STATE): vol.In(["on", "off", "toggle"]),
+    }
+)
+YAML_SET_OUTPUTS_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_OUTPUTS): vol.All(cv.ensure_list, [OUTPUT_STATE_SCHEMA]),
+    }
+)
+SET_OUTPUTS_SCHEMA = YAML_SET_OUTPUTS_SCHEMA.extend(
+    {
+        vol.Required("entry_id"): cv.string,
+    }
+)
+YAML_SEARCH_MODULES_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_FIRST, default=1): cv.positive_int,
+        vol.Optional(CONF_LAST): cv.positive_int,
+        vol.Optional(CONF_CONCURRENCY, default=SEARCH_CONCURRENCY): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=32)
+        ),
+        vol.Optional(CONF_TIMEOUT, default=SEARCH_TIMEOUT): vol.All(
+            vol.Coerce(float), vol.Range(min=0.05, max=10)
+        ),
+    }
+)
+SEARCH_MODULES_SCHEMA = YAML_SEARCH_MODULES_SCHEMA.extend(
+    {
+        vol.Required("entry_id"): cv.string,
+    }
+)
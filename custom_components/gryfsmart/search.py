@@ -0,0 +1,121 @@
+"""Search the Gryf Smart bus for modules."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+import logging
+from typing import Any
+
+from pygryfsmart.api import GryfApi
+from pygryfsmart.const import DriverActions, DriverFunctions
+
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    EVENT_MODULE_FOUND,
+    PRIORITY_BACKGROUND,
+    SEARCH_CONCURRENCY,
+    SEARCH_TIMEOUT,
+)
+from .scheduler import GryfCommandScheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def search_frame(module: int) -> str:
+    """Return the frame asking a module to identify itself."""
+
+    return f"{DriverActions.SEARCH}=0,{module}\n\r"
+
+
+class GryfModuleSearch:
+    """Probe bus addresses for modules, several at a time.
+
+    Every address gets a search frame and up to a timeout for its answer.
+    Up to a window of addresses are waited on at once, and every module
+    found is announced with an EVENT_MODULE_FOUND event right away.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: GryfApi,
+        scheduler: GryfCommandScheduler,
+        port: str,
+    ) -> None:
+        """Init the search."""
+
+        self._hass = hass
+        self._scheduler = scheduler
+        self._port = port
+        self._waiters: dict[int, asyncio.Future[dict[str, Any]]] = {}
+
+        api.subscribe_input_message(self._async_frame_in)
+
+    async def _async_frame_in(self, line: str) -> None:
+        """Hand a search answer to whoever waits for it."""
+
+        function, _, payload = line.partition("=")
+        if function.upper() != DriverFunctions.FIND:
+            return
+
+        try:
+            module, mac, model = (int(value) for value in payload.split(",")[:3])
+        except ValueError:
+            _LOGGER.debug("Unable to parse search answer: %s", line)
+            return
+
+        waiter = self._waiters.get(module)
+        if waiter is not None and not waiter.done():
+            waiter.set_result({"id": module, "mac": mac, "model": model})
+
+    async def _async_probe(self, module: int, timeout: float) -> dict[str, Any] | None:
+        """Ask a single address, return the module answering on it."""
+
+        waiter = self._waiters.get(module)
+        if waiter is None or waiter.done():
+            waiter = self._waiters[module] = self._hass.loop.create_future()
+
+        try:
+            await self._scheduler.async_send(
+                search_frame(module), PRIORITY_BACKGROUND, (DriverActions.SEARCH, module)
+            )
+            async with asyncio.timeout(timeout):
+                found = await asyncio.shield(waiter)
+        except TimeoutError:
+            return None
+        finally:
+            if self._waiters.get(module) is waiter:
+                del self._waiters[module]
+
+        self._hass.bus.async_fire(EVENT_MODULE_FOUND, {"port": self._port, **found})
+        return found
+
+    async def async_search(
+        self,
+        modules: Iterable[int],
+        concurrency: int = SEARCH_CONCURRENCY,
+        timeout: float = SEARCH_TIMEOUT,
+    ) -> dict[str, Any]:
+        """Search the addresses, return the modules found and the silent ones."""
+
+        modules = sorted(set(modules))
+        window = asyncio.Semaphore(concurrency)
+
+        async def async_probe(module: int) -> dict[str, Any] | None:
+            async with window:
+                return await self._async_probe(module, timeout)
+
+        results = await asyncio.gather(*(async_probe(module) for module in modules))
+        found = [result for result in results if result is not None]
+        _LOGGER.debug("Search of %s addresses found %s modules", len(modules), len(found))
+
+        return {
+            "modules": found,
+            "missing": [
+                module
+                for module, result in zip(modules, results, strict=True)
+                if result is None
+            ],
+        }
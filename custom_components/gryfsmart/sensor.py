@@ -1,32 +1,153 @@
 """Handle the Gryf Smart Sensor platform functionality."""
 
-from pygryfsmart.device import (
-    _GryfDevice,
-    GryfInput,
-    GryfInputLine,
-    GryfOutputLine,
-    GryfTemperature,
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+import time
+from typing import Any
+
+from pygryfsmart.const import DriverFunctions
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
 )
-
-from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    HomeAssistant,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTime
+from homeassistant.helpers import entity_platform
+from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
+from homeassistant.util import dt as dt_util
 
 from .const import (
-    CONF_API,
+    CONF_COMMUNICATION,
+    CONF_DEVICE_DATA,
     CONF_DEVICES,
     CONF_ID,
     CONF_LINE_SENSOR_ICONS,
+    CONF_LINE_WRITE_INTERVAL,
+    CONF_METRICS,
     CONF_NAME,
+    CONF_TEMPERATURE_DEADBAND,
     CONF_TYPE,
+    DEFAULT_LINE_WRITE_INTERVAL,
+    DEFAULT_TEMPERATURE_DEADBAND,
     DOMAIN,
     GRYF_IN_NAME,
     GRYF_OUT_NAME,
+    LINE_SENSOR_BUFFER_SIZE,
+    SERVICE_GET_LINE_FRAMES,
     Platforms,
 )
+from .device import GryfDevice
 from .entity import GryfConfigFlowEntity, GryfYamlEntity
+from .metrics import GryfMetrics
+
+
+@dataclass(frozen=True, kw_only=True)
+class GryfMetricSensorDescription(SensorEntityDescription):
+    """Describe a bus metric sensor."""
+
+    value_fn: Callable[[GryfMetrics], StateType]
+    attributes_fn: Callable[[GryfMetrics], dict[str, Any]] | None = None
+
+
+METRIC_SENSORS: tuple[GryfMetricSensorDescription, ...] = (
+    GryfMetricSensorDescription(
+        key="frames_in",
+        name="Frames in",
+        native_unit_of_measurement="frames/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: metrics.frames_in_rate,
+    ),
+    GryfMetricSensorDescription(
+        key="frames_out",
+        name="Frames out",
+        native_unit_of_measurement="frames/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: metrics.frames_out_rate,
+    ),
+    GryfMetricSensorDescription(
+        key="bus_utilisation",
+        name="Bus utilisation",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: metrics.bus_utilisation,
+    ),
+    GryfMetricSensorDescription(
+        key="poll_duration",
+        name="Poll duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: metrics.poll_duration,
+    ),
+    GryfMetricSensorDescription(
+        key="queue_depth",
+        name="Command queue depth",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: metrics.queue_depth,
+        attributes_fn=lambda metrics: {"peak_depth": metrics.peak_queue_depth},
+    ),
+    GryfMetricSensorDescription(
+        key="command_latency",
+        name="Command latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: metrics.command_latency.percentile(0.95),
+        attributes_fn=lambda metrics: {
+            "p50": metrics.command_latency.percentile(0.5),
+            "samples": metrics.command_latency.total,
+            "histogram": metrics.command_latency.as_dict(),
+        },
+    ),
+    GryfMetricSensorDescription(
+        key="confirm_latency",
+        name="Confirmation latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: metrics.confirm_latency.percentile(0.95),
+        attributes_fn=lambda metrics: {
+            "p50": metrics.confirm_latency.percentile(0.5),
+            "samples": metrics.confirm_latency.total,
+            "histogram": metrics.confirm_latency.as_dict(),
+        },
+    ),
+    GryfMetricSensorDescription(
+        key="command_timeouts",
+        name="Command timeouts",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.command_timeouts.total(),
+        attributes_fn=lambda metrics: {
+            f"module_{module}": count
+            for module, count in metrics.command_timeouts.items()
+        },
+    ),
+    GryfMetricSensorDescription(
+        key="malformed_frames",
+        name="Malformed frames",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.malformed_frames.total(),
+        attributes_fn=lambda metrics: {
+            f"module_{module}": count
+            for module, count in metrics.malformed_frames.items()
+            if module is not None
+        },
+    ),
+)
 
 
 async def async_setup_platform(
@@ -37,25 +158,22 @@ async def async_setup_platform(
 ) -> None:
     """Set up the Sensor platform."""
 
+    _async_register_services()
     async_add_entities(
         [
             GryfYamlLine(
-                GryfInputLine(
-                    GRYF_IN_NAME,
-                    hass.data[DOMAIN][CONF_API],
-                ),
+                GryfDevice(GRYF_IN_NAME, 0, 0),
                 GRYF_IN_NAME,
+                hass.data[DOMAIN][CONF_LINE_WRITE_INTERVAL],
             )
         ]
     )
     async_add_entities(
         [
             GryfYamlLine(
-                GryfOutputLine(
-                    GRYF_OUT_NAME,
-                    hass.data[DOMAIN][CONF_API],
-                ),
+                GryfDevice(GRYF_OUT_NAME, 0, 0),
                 GRYF_OUT_NAME,
+                hass.data[DOMAIN][CONF_LINE_WRITE_INTERVAL],
             )
         ]
     )
@@ -64,22 +182,22 @@ async def async_setup_platform(
     termometers = []
 
     for conf in hass.data[DOMAIN].get(Platforms.INPUT, {}):
-        device = GryfInput(
+        device = GryfDevice(
             conf.get(CONF_NAME),
             conf.get(CONF_ID) // 10,
             conf.get(CONF_ID) % 10,
-            hass.data[DOMAIN][CONF_API],
         )
         inputs.append(GryfYamlInput(device))
 
     for conf in hass.data[DOMAIN].get(Platforms.TEMPERATURE, {}):
-        device = GryfTemperature(
+        device = GryfDevice(
             conf.get(CONF_NAME),
             conf.get(CONF_ID) // 10,
             conf.get(CONF_ID) % 10,
-            hass.data[DOMAIN][CONF_API],
         )
-        termometers.append(GryfYamlTemperature(device))
+        termometers.append(
+            GryfYamlTemperature(device, hass.data[DOMAIN][CONF_TEMPERATURE_DEADBAND])
+        )
 
     async_add_entities(inputs)
     async_add_entities(termometers)
@@ -90,27 +208,29 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Config flow for Sensor platform."""
+
+    _async_register_services()
     async_add_entities(
         [
             GryfConfigFlowLine(
-                GryfInputLine(
-                    GRYF_IN_NAME,
-                    config_entry.runtime_data[CONF_API],
-                ),
+                GryfDevice(GRYF_IN_NAME, 0, 0),
                 config_entry,
                 GRYF_IN_NAME,
+                config_entry.data[CONF_COMMUNICATION].get(
+                    CONF_LINE_WRITE_INTERVAL, DEFAULT_LINE_WRITE_INTERVAL
+                ),
             )
         ]
     )
     async_add_entities(
         [
             GryfConfigFlowLine(
-                GryfOutputLine(
-                    GRYF_OUT_NAME,
-                    config_entry.runtime_data[CONF_API],
-                ),
+                GryfDevice(GRYF_OUT_NAME, 0, 0),
                 config_entry,
                 GRYF_OUT_NAME,
+                config_entry.data[CONF_COMMUNICATION].get(
+                    CONF_LINE_WRITE_INTERVAL, DEFAULT_LINE_WRITE_INTERVAL
+                ),
             )
         ]
     )
@@ -120,48 +240,139 @@ async def async_setup_entry(
 
     for conf in config_entry.data[CONF_DEVICES]:
         if conf.get(CONF_TYPE) == Platforms.INPUT:
-            device = GryfInput(
+            device = GryfDevice(
                 conf.get(CONF_NAME),
                 conf.get(CONF_ID) // 10,
                 conf.get(CONF_ID) % 10,
-                config_entry.runtime_data[CONF_API],
             )
             inputs.append(GryfConfigFlowInput(device, config_entry))
         if conf.get(CONF_TYPE) == Platforms.TEMPERATURE:
-            temperature_device = GryfTemperature(
+            temperature_device = GryfDevice(
                 conf.get(CONF_NAME),
                 conf.get(CONF_ID) // 10,
                 conf.get(CONF_ID) % 10,
-                config_entry.runtime_data[CONF_API],
             )
             temperature.append(
-                GryfConfigFlowTemperature(temperature_device, config_entry)
+                GryfConfigFlowTemperature(
+                    temperature_device,
+                    config_entry,
+                    config_entry.data[CONF_COMMUNICATION].get(
+                        CONF_TEMPERATURE_DEADBAND, DEFAULT_TEMPERATURE_DEADBAND
+                    ),
+                )
             )
 
     async_add_entities(inputs)
     async_add_entities(temperature)
+    async_add_entities(
+        GryfMetricSensor(config_entry, description) for description in METRIC_SENSORS
+    )
+
+
+def _async_register_services() -> None:
+    """Register the line sensor entity services."""
+
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_GET_LINE_FRAMES,
+        None,
+        "async_get_frames",
+        supports_response=SupportsResponse.ONLY,
+    )
 
 
 class _GryfLineSensorBase(SensorEntity):
-    """Gryf line sensor base."""
+    """Gryf line sensor base.
+
+    Bus frames are coalesced: the entity state is written at most once per
+    line_write_interval seconds with the latest frame and a frame counter,
+    while the recent frames are kept in memory for the get_line_frames
+    service.
+    """
 
     _state = ""
     _last_icon = False
     _attr_icon = CONF_LINE_SENSOR_ICONS[GRYF_IN_NAME][0]
     _input: str
+    _write_interval: float
+    _frame_count = 0
+    _last_write = 0.0
+    _unsub_write: CALLBACK_TYPE | None = None
+    _frames: deque[tuple[float, str]]
+
+    def _init_line(self, input: str, write_interval: float) -> None:
+        """Init the line state."""
+
+        self._input = input
+        self._write_interval = write_interval
+        self._frames = deque(maxlen=LINE_SENSOR_BUFFER_SIZE)
+
+    async def async_added_to_hass(self) -> None:
+        """Listen to the frames of the line."""
+
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._trace.subscribe(self._input != GRYF_IN_NAME, self.async_update)
+        )
 
     @property
     def native_value(self) -> str:
         """Return state."""
         return self._state
 
+    @property
+    def _line_attributes(self) -> dict[str, int]:
+        """Return the frame counter attribute."""
+        return {"frames": self._frame_count}
+
     async def async_update(self, state):
         """Update state."""
 
         self._state = state
+        self._frame_count += 1
+        self._frames.append((time.time(), state))
+
+        if self.hass is None or self._unsub_write is not None:
+            return
+
+        delay = self._last_write + self._write_interval - time.monotonic()
+        if delay <= 0:
+            self._async_write_line_state()
+        else:
+            self._unsub_write = async_call_later(
+                self.hass, delay, self._async_write_line_state
+            )
+
+    @callback
+    def _async_write_line_state(self, _now=None) -> None:
+        """Write the coalesced state."""
+
+        self._unsub_write = None
+        self._last_write = time.monotonic()
         self._last_icon = not self._last_icon
         self.async_write_ha_state()
 
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel the pending state write."""
+
+        if self._unsub_write is not None:
+            self._unsub_write()
+            self._unsub_write = None
+
+    async def async_get_frames(self) -> ServiceResponse:
+        """Return the buffered frames."""
+
+        return {
+            "frames": [
+                {
+                    "time": dt_util.utc_from_timestamp(timestamp).isoformat(),
+                    "frame": frame,
+                }
+                for timestamp, frame in self._frames
+            ],
+            "count": self._frame_count,
+        }
+
     @property
     def icon(self) -> str:
         """Property icon."""
@@ -174,15 +385,20 @@ class GryfConfigFlowLine(GryfConfigFlowEntity, _GryfLineSensorBase):
 
     def __init__(
         self,
-        device: _GryfDevice,
+        device: GryfDevice,
         config_entry: ConfigEntry,
         input: str,
+        write_interval: float,
     ) -> None:
         """Init the gryf input line."""
 
-        self._input = input
+        self._init_line(input, write_interval)
         super().__init__(config_entry, device)
-        device.subscribe(self.async_update)
+
+    @property
+    def extra_state_attributes(self):
+        """Return extra state attributes."""
+        return self._line_attributes
 
 
 class GryfYamlLine(GryfYamlEntity, _GryfLineSensorBase):
@@ -190,21 +406,27 @@ class GryfYamlLine(GryfYamlEntity, _GryfLineSensorBase):
 
     def __init__(
         self,
-        device: _GryfDevice,
+        device: GryfDevice,
         input: str,
+        write_interval: float,
     ) -> None:
         """Init the gryf input line."""
 
-        self._input = input
+        self._init_line(input, write_interval)
         super().__init__(device)
-        device.subscribe(self.async_update)
+
+    @property
+    def extra_state_attributes(self):
+        """Return extra state attributes."""
+        return self._line_attributes
 
 
 class _GryfInputSensorBase(SensorEntity):
     """Gryf smart input sensor Base."""
 
     _state = "0"
-    _device: _GryfDevice
+    _device: GryfDevice
+    _function = DriverFunctions.INPUTS
     _attr_icon = "mdi:light-switch-off"
     _attr_device_class = SensorDeviceClass.ENUM
     _attr_options = ["0", "1", "2", "3"]
@@ -212,6 +434,9 @@ class _GryfInputSensorBase(SensorEntity):
     async def async_update(self, data):
         """Update state."""
 
+        if not self._publish_value(data):
+            return
+
         self._state = str(data)
         self.async_write_ha_state()
 
@@ -240,13 +465,12 @@ class GryfConfigFlowInput(GryfConfigFlowEntity, _GryfInputSensorBase):
 
     def __init__(
         self,
-        device: _GryfDevice,
+        device: GryfDevice,
         config_entry: ConfigEntry,
     ) -> None:
         """Init the gryf input."""
 
         super().__init__(config_entry, device)
-        device.subscribe(self.async_update)
 
 
 class GryfYamlInput(GryfYamlEntity, _GryfInputSensorBase):
@@ -254,25 +478,29 @@ class GryfYamlInput(GryfYamlEntity, _GryfInputSensorBase):
 
     def __init__(
         self,
-        device: _GryfDevice,
+        device: GryfDevice,
     ) -> None:
         """Init the gryf input line."""
 
         super().__init__(device)
-        device.subscribe(self.async_update)
 
 
 class _GryfTemperatureSensorBase(SensorEntity):
     """Gryf Smart temperature sensor base."""
 
     _state = "0.0"
-    _device: _GryfDevice
+    _device: GryfDevice
+    _function = DriverFunctions.TEMP
     _attr_device_class = SensorDeviceClass.TEMPERATURE
     _attr_native_unit_of_measurement = "°C"
+    _deadband = DEFAULT_TEMPERATURE_DEADBAND
 
     async def async_update(self, data):
         """Update state."""
 
+        if not self._publish_value(data, self._deadband):
+            return
+
         self._state = data
         self.async_write_ha_state()
 
@@ -288,12 +516,13 @@ class GryfConfigFlowTemperature(GryfConfigFlowEntity, _GryfTemperatureSensorBase
 
     def __init__(
         self,
-        device: _GryfDevice,
+        device: GryfDevice,
         config_entry: ConfigEntry,
+        deadband: float,
     ) -> None:
         """Init the gryf temperature."""
         super().__init__(config_entry, device)
-        device.subscribe(self.async_update)
+        self._deadband = deadband
 
 
 class GryfYamlTemperature(GryfYamlEntity, _GryfTemperatureSensorBase):
@@ -301,9 +530,49 @@ class GryfYamlTemperature(GryfYamlEntity, _GryfTemperatureSensorBase):
 
     def __init__(
         self,
-        device: _GryfDevice,
+        device: GryfDevice,
+        deadband: float,
     ) -> None:
         """Init the gryf input line."""
 
         super().__init__(device)
-        device.subscribe(self.async_update)
+        self._deadband = deadband
+
+
+class GryfMetricSensor(SensorEntity):
+    """Diagnostic sensor showing a metric of the bus on the hub device."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    entity_description: GryfMetricSensorDescription
+
+    def __init__(
+        self,
+        config_entry: ConfigEntry,
+        description: GryfMetricSensorDescription,
+    ) -> None:
+        """Init the metric sensor."""
+
+        self.entity_description = description
+        self._metrics: GryfMetrics = config_entry.runtime_data[CONF_METRICS]
+        self._attr_unique_id = f"{description.key} {config_entry.unique_id}"
+        self._attr_device_info = config_entry.runtime_data[CONF_DEVICE_DATA]
+
+    async def async_added_to_hass(self) -> None:
+        """Write the state whenever the metrics were updated."""
+
+        self.async_on_remove(self._metrics.async_add_listener(self.async_write_ha_state))
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the metric."""
+        return self.entity_description.value_fn(self._metrics)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the details of the metric."""
+
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(self._metrics)
@@ -0,0 +1,80 @@
+"""Persistent snapshot of the last states reported on a Gryf Smart port."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from pygryfsmart.const import DriverFunctions
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import slugify
+
+from .const import DOMAIN, SNAPSHOT_SAVE_DELAY
+from .dispatcher import GryfDispatcher
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+# A shutter's reported state is its motion, which is over after a restart.
+_TRANSIENT_FUNCTIONS = {DriverFunctions.COVER}
+
+
+class GryfSnapshot:
+    """Keep the dispatcher's state cache across restarts.
+
+    The cache is stored as a flat list of [module, pin, function, value]
+    SNAPSHOT_SAVE_DELAY seconds after a state changed. Changes while a save
+    is pending don't push it back, so a busy bus still gets saved.
+    Loading it seeds the dispatcher before the entities are added, so they
+    pick up their last known state with the states reported on the bus,
+    in one pass and before the first sweep answered.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, dispatcher: GryfDispatcher, port: str
+    ) -> None:
+        """Init the snapshot."""
+
+        self._dispatcher = dispatcher
+        self._save_pending = False
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.snapshot_{slugify(port)}"
+        )
+
+        dispatcher.add_state_listener(self._async_state_changed)
+
+    async def async_load(self) -> None:
+        """Seed the dispatcher with the states stored before."""
+
+        if (data := await self._store.async_load()) is None:
+            return
+
+        self._dispatcher.seed(
+            {(module, pin, function): value for module, pin, function, value in data["states"]}
+        )
+        _LOGGER.debug("Restored %s states", len(data["states"]))
+
+    @callback
+    def _async_state_changed(self) -> None:
+        """Save the states a little later, unless a save is pending."""
+
+        if self._save_pending:
+            return
+
+        self._save_pending = True
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the states to store."""
+
+        self._save_pending = False
+        return {
+            "states": [
+                [module, pin, function, value]
+                for (module, pin, function), value in self._dispatcher.states.items()
+                if function not in _TRANSIENT_FUNCTIONS
+            ]
+        }
@@ -1,8 +1,6 @@
 """Handle the Gryf Smart Switch platform functionality."""
 
-import asyncio
-from pygryfsmart import GryfApi
-from pygryfsmart.device import _GryfDevice, GryfInput , GryfOutput
+from pygryfsmart.const import DriverFunctions, OutputActions
 
 from homeassistant.components.switch import SwitchEntity , SwitchDeviceClass
 from homeassistant.config_entries import ConfigEntry
@@ -12,15 +10,18 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import ConfigType , DiscoveryInfoType
 from homeassistant.helpers.restore_state import RestoreEntity
 
+from .device import GryfDevice
 from .entity import GryfYamlEntity , GryfConfigFlowEntity
+from .pulse import GryfPulse
 from .const import (
-    CONF_API,
     CONF_DEVICE_CLASS,
     CONF_DEVICES,
     CONF_EXTRA,
     CONF_ID,
     CONF_INPUTS,
     CONF_NAME,
+    CONF_PULSE_WIDTH,
+    DEFAULT_PULSE_WIDTH,
     DOMAIN,
     SWITCH_DEVICE_CLASS,
     Platforms
@@ -37,22 +38,26 @@ async def async_setup_platform(
     switches = []
 
     for conf in hass.data[DOMAIN].get(Platforms.SWITCH, []):
-        device = GryfOutput(
+        device = GryfDevice(
             conf.get(CONF_NAME),
             conf.get(CONF_ID) // 10,
             conf.get(CONF_ID) % 10,
-            hass.data[DOMAIN][CONF_API],
         )
         switches.append(GryfYamlSwitch(device , conf.get(CONF_DEVICE_CLASS, 0)))
 
     for conf in hass.data[DOMAIN].get(Platforms.GATE, []):
-        device = GryfOutput(
+        device = GryfDevice(
             conf.get(CONF_NAME),
             conf.get(CONF_ID) // 10,
             conf.get(CONF_ID) % 10,
-            hass.data[DOMAIN][CONF_API],
         )
-        switches.append(GryfGateYaml(device, conf.get(CONF_INPUTS), hass.data[DOMAIN][CONF_API]))
+        switches.append(
+            GryfGateYaml(
+                device,
+                conf.get(CONF_INPUTS),
+                conf.get(CONF_PULSE_WIDTH, DEFAULT_PULSE_WIDTH),
+            )
+        )
 
     async_add_entities(switches)
 
@@ -66,21 +71,26 @@ async def async_setup_entry(
     switches = []
     for conf in config_entry.data[CONF_DEVICES]:
         if conf.get(CONF_TYPE) == Platforms.SWITCH:
-            device = GryfOutput(
+            device = GryfDevice(
                 conf.get(CONF_NAME),
                 conf.get(CONF_ID) // 10,
                 conf.get(CONF_ID) % 10,
-                config_entry.runtime_data[CONF_API],
             )
             switches.append(GryfConfigFlowSwitch(device , config_entry , conf.get(CONF_EXTRA, 0)))
         if conf.get(CONF_TYPE) == Platforms.GATE:
-            device = GryfOutput(
+            device = GryfDevice(
                 conf.get(CONF_NAME),
                 conf.get(CONF_ID) // 10,
                 conf.get(CONF_ID) % 10,
-                config_entry.runtime_data[CONF_API],
             )
-            switches.append(GryfGateConfigFlow(device, config_entry, conf.get(CONF_EXTRA, 0)))
+            switches.append(
+                GryfGateConfigFlow(
+                    device,
+                    config_entry,
+                    conf.get(CONF_EXTRA, 0),
+                    conf.get(CONF_PULSE_WIDTH, DEFAULT_PULSE_WIDTH),
+                )
+            )
 
     async_add_entities(switches)
     
@@ -89,10 +99,24 @@ class GryfGateBase(SwitchEntity):
     _attr_is_on = False
     _attr_icon = "mdi:boom-gate"
 
-    _device: GryfOutput
-    _input_device: GryfInput
+    _device: GryfDevice
+    _input_device: GryfDevice | None = None
     _input_negation = 0
     _output_state = 0
+    _pulse_width = DEFAULT_PULSE_WIDTH
+    _pulse: GryfPulse
+
+    def _subscriptions(self):
+        """Listen to the gate output and its optional position input."""
+
+        subscriptions = [
+            (self._device.id, self._device.pin, DriverFunctions.OUTPUTS, self.async_update_output)
+        ]
+        if self._input_device is not None:
+            subscriptions.append(
+                (self._input_device.id, self._input_device.pin, DriverFunctions.INPUTS, self.async_update_input)
+            )
+        return subscriptions
 
     async def async_update_output(self, is_on):
         self._output_state = is_on
@@ -110,26 +134,30 @@ class GryfGateBase(SwitchEntity):
         if self.hass is not None:
             self.async_write_ha_state()
 
-    async def async_turn_on(self, **kwargs):
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
 
-        await self._device.turn_on()
+        self._pulse = GryfPulse(
+            self.hass,
+            self._batcher,
+            self._device.id,
+            self._device.pin,
+            self._pulse_width,
+        )
+        self.async_on_remove(self._pulse.async_cancel)
 
-        await asyncio.sleep(1)
+    async def async_turn_on(self, **kwargs):
 
-        await self._device.turn_off()
+        self._pulse.async_start()
 
     async def async_toggle(self, **kwargs) -> None:
 
-        await self._device.turn_on()
-
-        await asyncio.sleep(1)
-
-        await self._device.turn_off()
+        self._pulse.async_start()
 
     async def async_turn_off(self, **kwargs) -> None:
         pass
 
-    def extra_parm(self, extra: str, api):
+    def extra_parm(self, extra: str):
 
         filtred_extra = ""
         if extra:
@@ -142,63 +170,69 @@ class GryfGateBase(SwitchEntity):
             if filtred_extra.strip().isdigit:
                 id = int(filtred_extra)
                 if id > 11:
-                    self._input_device = GryfInput(
+                    self._input_device = GryfDevice(
                         "input",
                         id // 10,
                         id % 10,
-                        api
                     )
 
-                self._input_device.subscribe(self.async_update_input)
-
 class GryfGateConfigFlow(GryfConfigFlowEntity, GryfGateBase):
     
     def __init__(
         self,
-        device: _GryfDevice,
+        device: GryfDevice,
         config_entry: ConfigEntry,
         extra_parm: str,
+        pulse_width: float,
     ) -> None:
 
         super().__init__(config_entry, device)
-        self._device.subscribe(self.async_update_output)
-        self.extra_parm(extra_parm, config_entry.runtime_data[CONF_API])
+        self._pulse_width = pulse_width
+        self.extra_parm(extra_parm)
 
 class GryfGateYaml(GryfYamlEntity, GryfGateBase):
 
     def __init__(
         self,
-        device: _GryfDevice,
+        device: GryfDevice,
         extra_parm: str,
-        api: GryfApi,
+        pulse_width: float,
     ) -> None:
 
         super().__init__(device)
-        self._device.subscribe(self.async_update_output)
-        self.extra_parm(extra_parm, api)
+        self._pulse_width = pulse_width
+        self.extra_parm(extra_parm)
 
 class GryfSwitchBase(SwitchEntity, RestoreEntity):
     """Gryf Switch entity base."""
 
     _is_on = False
-    _device: _GryfDevice
+    _device: GryfDevice
+    _function = DriverFunctions.OUTPUTS
     _attr_device_class = SwitchDeviceClass.SWITCH
 
     @property
     def is_on(self):
         """Property is on."""
 
-        return self._is_on
+        return self._optimistic_state(self._is_on)
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
 
-        if(last_state := await self.async_get_last_state()) is not None:
-            self._attr_is_on = last_state.state == "on"
+        # The state snapshot seeds the dispatcher, fall back to the last
+        # state only for pins it doesn't know yet.
+        if self._dispatcher.state(
+            self._device.id, self._device.pin, self._function
+        ) is None and (last_state := await self.async_get_last_state()) is not None:
+            self._is_on = last_state.state == "on"
 
     async def async_update(self , is_on):
         """Update state."""
 
+        if not self._publish_value(is_on):
+            return
+
         self._is_on = is_on
         if self.hass is not None:
             self.async_write_ha_state()
@@ -206,24 +240,31 @@ class GryfSwitchBase(SwitchEntity, RestoreEntity):
     async def async_turn_on(self , **kwargs):
         """Turn on switch."""
     
-        await self._device.turn_on()
+        await self._async_set_output(OutputActions.ON, True)
 
     async def async_turn_off(self , **kwargs):
         """Turn off switch."""
     
-        await self._device.turn_off()
+        await self._async_set_output(OutputActions.OFF, False)
 
     async def async_toggle(self , **kwargs):
         """Toggle switch."""
     
-        await self._device.toggle()
+        # The module toggles on its own, unless the new state is to be shown
+        # right away, which needs to know which way the pin goes.
+        if not self._optimistic:
+            await self._batcher.async_set_out(self._device.id, self._device.pin, OutputActions.TOGGLE)
+        elif self.is_on:
+            await self.async_turn_off()
+        else:
+            await self.async_turn_on()
 
 class GryfConfigFlowSwitch(GryfConfigFlowEntity , GryfSwitchBase):
     """Gryf Smart config flow Switch class."""
 
     def __init__(
         self,
-        device: _GryfDevice,
+        device: GryfDevice,
         config_entry: ConfigEntry,
         device_class: str
     ) -> None:
@@ -231,7 +272,6 @@ class GryfConfigFlowSwitch(GryfConfigFlowEntity , GryfSwitchBase):
 
         self._config_entry = config_entry
         super().__init__(config_entry , device)
-        self._device.subscribe(self.async_update)
 
         self._attr_device_class = device_class
 
@@ -241,12 +281,11 @@ class GryfYamlSwitch(GryfYamlEntity , GryfSwitchBase):
 
     def __init__(
         self,
-        device: _GryfDevice,
+        device: GryfDevice,
         device_class: str,
     ) -> None:
         """Init the Gryf Switch."""
 
         super().__init__(device)
-        self._device.subscribe(self.async_update)
 
         self._attr_device_class = device_class
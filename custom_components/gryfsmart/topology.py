@@ -0,0 +1,129 @@
+"""Persistent cache of the modules found on a Gryf Smart port."""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+from pygryfsmart.api import GryfApi
+from pygryfsmart.const import DriverFunctions
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import slugify
+
+from .const import (
+    DOMAIN,
+    TOPOLOGY_EXPIRY,
+    TOPOLOGY_SAVE_DELAY,
+    TOPOLOGY_SEEN_RESOLUTION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+# Frames listing the state of every pin tell how many pins a module has.
+_PIN_COUNTS = {
+    DriverFunctions.INPUTS: "inputs",
+    DriverFunctions.OUTPUTS: "outputs",
+    DriverFunctions.COVER: "shutters",
+}
+# Frames of a single pin tell that the module has that pin.
+_PINS = {
+    DriverFunctions.PWM: "pwm",
+    DriverFunctions.TEMP: "temperature",
+}
+
+
+class GryfTopology:
+    """Remember which modules answered on a port and what they can do.
+
+    Search answers give a module's MAC and model, state frames give its
+    pin counts. The cache is kept in Home Assistant storage so a restart
+    only has to sweep the modules known to be present. Modules not heard
+    for TOPOLOGY_EXPIRY seconds are dropped when the cache is loaded.
+    """
+
+    def __init__(self, hass: HomeAssistant, api: GryfApi, port: str) -> None:
+        """Init the topology."""
+
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.topology_{slugify(port)}"
+        )
+        self.modules: dict[int, dict[str, Any]] = {}
+
+        api.subscribe_input_message(self._async_frame_in)
+
+    async def async_load(self) -> None:
+        """Load the modules found before."""
+
+        if (data := await self._store.async_load()) is None:
+            return
+
+        expired = time.time() - TOPOLOGY_EXPIRY
+        self.modules = {
+            int(module): info
+            for module, info in data["modules"].items()
+            if info["last_seen"] > expired
+        }
+        _LOGGER.debug("Known modules: %s", sorted(self.modules))
+
+    def _module(self, module: int) -> tuple[dict[str, Any], bool]:
+        """Return the cached module and whether it is new."""
+
+        if (info := self.modules.get(module)) is not None:
+            return info, False
+
+        info = self.modules[module] = {"last_seen": 0.0}
+        return info, True
+
+    async def _async_frame_in(self, line: str) -> None:
+        """Learn about the module which sent the frame."""
+
+        function, _, payload = line.partition("=")
+        function = function.upper()
+        states = payload.split(";")[0].split(",")
+
+        try:
+            module = int(states[0])
+            if function == DriverFunctions.FIND:
+                update = {"mac": int(states[1]), "model": int(states[2])}
+            elif function in _PIN_COUNTS:
+                update = {_PIN_COUNTS[function]: len(states) - 1}
+            elif function in _PINS:
+                pin = int(states[1])
+                update = {}
+            elif function == DriverFunctions.PONG:
+                update = {}
+            else:
+                return
+        except (IndexError, ValueError):
+            return
+
+        info, changed = self._module(module)
+
+        for key, value in update.items():
+            if info.get(key) != value:
+                info[key] = value
+                changed = True
+
+        if function in _PINS:
+            pins = info.setdefault(_PINS[function], [])
+            if pin not in pins:
+                pins.append(pin)
+                pins.sort()
+                changed = True
+
+        now = time.time()
+        if now - info["last_seen"] > TOPOLOGY_SEEN_RESOLUTION:
+            info["last_seen"] = now
+            changed = True
+
+        if changed:
+            self._store.async_delay_save(self._data_to_save, TOPOLOGY_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the cache to store."""
+        return {"modules": self.modules}
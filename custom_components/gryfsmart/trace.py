@@ -0,0 +1,114 @@
+"""Bounded trace of the raw frames on a Gryf Smart port."""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+import struct
+import time
+from typing import Any
+
+from pygryfsmart.api import GryfApi
+
+from homeassistant.core import CALLBACK_TYPE
+from homeassistant.util import dt as dt_util
+
+from .const import FRAME_TRACE_FRAME_BYTES, FRAME_TRACE_SIZE
+
+# Every slot holds the wall clock time, the direction and the stored length
+# of the frame, followed by at most FRAME_TRACE_FRAME_BYTES of the frame.
+_HEADER = struct.Struct("<dBB")
+_DIRECTION_IN = 0
+_DIRECTION_OUT = 1
+_DIRECTIONS = ("in", "out")
+
+FrameListener = Callable[[str], Awaitable[None]]
+
+
+class GryfFrameTrace:
+    """Keep the last frames in and out of a port in a preallocated buffer.
+
+    Frames are written into fixed size slots of a single bytearray, so
+    tracing doesn't allocate per frame and the memory use is known up
+    front. Longer frames are truncated.
+
+    The api can't drop its subscribers, so entities which want the raw
+    frames listen here instead and unsubscribe when they are removed.
+    """
+
+    def __init__(
+        self,
+        api: GryfApi,
+        size: int = FRAME_TRACE_SIZE,
+        frame_bytes: int = FRAME_TRACE_FRAME_BYTES,
+    ) -> None:
+        """Init the trace."""
+
+        self._size = size
+        self._frame_bytes = min(frame_bytes, 255)
+        self._slot = _HEADER.size + self._frame_bytes
+        self._buffer = bytearray(self._slot * size)
+        self._next = 0
+        self._count = 0
+        self._listeners: tuple[list[FrameListener], list[FrameListener]] = ([], [])
+
+        api.subscribe_input_message(self._async_frame_in)
+        api.subscribe_output_message(self._async_frame_out)
+
+    def __len__(self) -> int:
+        """Return the number of frames held."""
+        return self._count
+
+    def subscribe(self, outgoing: bool, listener: FrameListener) -> CALLBACK_TYPE:
+        """Call back with every frame read from, or written to, the port."""
+
+        listeners = self._listeners[_DIRECTION_OUT if outgoing else _DIRECTION_IN]
+        listeners.append(listener)
+
+        def unsubscribe() -> None:
+            if listener in listeners:
+                listeners.remove(listener)
+
+        return unsubscribe
+
+    async def _async_frame_in(self, line: str) -> None:
+        self.record(_DIRECTION_IN, line)
+        for listener in tuple(self._listeners[_DIRECTION_IN]):
+            await listener(line)
+
+    async def _async_frame_out(self, line: str) -> None:
+        self.record(_DIRECTION_OUT, line)
+        for listener in tuple(self._listeners[_DIRECTION_OUT]):
+            await listener(line)
+
+    def record(self, direction: int, line: str) -> None:
+        """Store a frame over the oldest one."""
+
+        frame = line.strip().encode("ascii", "replace")[: self._frame_bytes]
+        offset = self._next * self._slot
+
+        _HEADER.pack_into(self._buffer, offset, time.time(), direction, len(frame))
+        start = offset + _HEADER.size
+        self._buffer[start : start + len(frame)] = frame
+
+        self._next = (self._next + 1) % self._size
+        self._count = min(self._count + 1, self._size)
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return the frames held, oldest first."""
+
+        frames = []
+        first = (self._next - self._count) % self._size
+
+        for index in range(self._count):
+            offset = (first + index) % self._size * self._slot
+            timestamp, direction, length = _HEADER.unpack_from(self._buffer, offset)
+            start = offset + _HEADER.size
+            frames.append(
+                {
+                    "time": dt_util.utc_from_timestamp(timestamp).isoformat(),
+                    "direction": _DIRECTIONS[direction],
+                    "frame": self._buffer[start : start + length].decode("ascii"),
+                }
+            )
+
+        return frames
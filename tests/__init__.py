@@ -0,0 +1 @@
+"""Tests for the Gryf Smart integration."""
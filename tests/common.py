@@ -0,0 +1,143 @@
+"""Helpers for the Gryf Smart tests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+import logging
+from types import ModuleType
+from typing import Any
+
+from pygryfsmart.const import OutputActions
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import EntityPlatform
+
+from custom_components.gryfsmart.connection import GryfConnection
+from custom_components.gryfsmart.const import (
+    CONF_API,
+    CONF_BATCHER,
+    CONF_DISPATCHER,
+    CONF_FADER,
+    CONF_METRICS,
+    CONF_OPTIMISTIC,
+    CONF_POLLER,
+    CONF_SCHEDULER,
+    CONF_TRACE,
+    DOMAIN,
+)
+
+
+class FakeApi:
+    """Stand in for GryfApi on the port side.
+
+    Written frames are recorded, and the respond callback, if set, gets to
+    answer each of them the way a module would, after the write returned.
+    """
+
+    def __init__(self) -> None:
+        """Init the api."""
+
+        self.sent: list[str] = []
+        self.closed = False
+        self.respond: Callable[[str], Awaitable[None]] | None = None
+        self._responses: set[asyncio.Task[None]] = set()
+        self._input_subscribers: list[Callable[[str], Awaitable[None]]] = []
+        self._output_subscribers: list[Callable[[str], Awaitable[None]]] = []
+
+    def subscribe_input_message(self, func: Callable[[str], Awaitable[None]]) -> None:
+        """Call back with every frame read from the bus."""
+        self._input_subscribers.append(func)
+
+    def subscribe_output_message(self, func: Callable[[str], Awaitable[None]]) -> None:
+        """Call back with every frame written to the bus."""
+        self._output_subscribers.append(func)
+
+    def set_module_count(self, module_count: int) -> None:
+        """Accept the module count like the port api does."""
+
+    async def start_connection(self) -> None:
+        """Open the port."""
+
+    async def stop_connection(self) -> None:
+        """Close the port."""
+        self.closed = True
+
+    async def send_data(self, frame: str) -> None:
+        """Write a frame."""
+
+        self.sent.append(frame)
+        for subscriber in self._output_subscribers:
+            await subscriber(frame)
+        if self.respond is not None:
+            task = asyncio.create_task(self.respond(frame))
+            self._responses.add(task)
+            task.add_done_callback(self._responses.discard)
+
+    async def async_feed(self, line: str) -> None:
+        """Hand a frame read from the bus to the subscribers."""
+
+        for subscriber in self._input_subscribers:
+            await subscriber(line)
+
+
+
+def answer_outputs(api: FakeApi, ignored_pins: set[int] = frozenset()) -> None:
+    """Let module 1 carry out AT+SetOut frames and report its outputs.
+
+    Pins in ignored_pins keep their state, as if the relay was stuck.
+    """
+
+    outputs = [0] * 6
+
+    async def async_respond(frame: str) -> None:
+        if not frame.startswith("AT+SetOut="):
+            return
+        module, *actions = (int(value) for value in frame.strip().split("=")[1].split(","))
+        assert module == 1
+        for pin, action in enumerate(actions, 1):
+            if pin in ignored_pins:
+                continue
+            if action == OutputActions.ON:
+                outputs[pin - 1] = 1
+            elif action == OutputActions.OFF:
+                outputs[pin - 1] = 0
+        await api.async_feed("O=1," + ",".join(str(state) for state in outputs))
+
+    api.respond = async_respond
+
+
+async def async_setup_yaml_platform(
+    hass: HomeAssistant,
+    connection: GryfConnection,
+    platform: ModuleType,
+    config: dict[str, Any],
+) -> list[Entity]:
+    """Set up the YAML entities of a platform module on the connection."""
+
+    hass.data[DOMAIN] = {
+        CONF_OPTIMISTIC: False,
+        **config,
+        CONF_API: connection.api,
+        CONF_SCHEDULER: connection.scheduler,
+        CONF_POLLER: connection.poller,
+        CONF_DISPATCHER: connection.dispatcher,
+        CONF_BATCHER: connection.batcher,
+        CONF_FADER: connection.fader,
+        CONF_METRICS: connection.metrics,
+        CONF_TRACE: connection.trace,
+    }
+    entity_platform = EntityPlatform(
+        hass=hass,
+        logger=logging.getLogger(__name__),
+        domain=platform.__name__.rsplit(".", 1)[-1],
+        platform_name=DOMAIN,
+        platform=platform,
+        scan_interval=timedelta(seconds=30),
+        entity_namespace=None,
+    )
+    await entity_platform.async_setup({})
+    await hass.async_block_till_done()
+    return list(entity_platform.entities.values())
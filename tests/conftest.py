@@ -0,0 +1,57 @@
+"""Fixtures for the Gryf Smart tests."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import (
+    device_registry as dr,
+    entity as entity_helper,
+    entity_registry as er,
+    restore_state,
+)
+
+from custom_components.gryfsmart.connection import GryfConnection
+
+from .common import FakeApi
+
+
+@pytest.fixture
+async def hass(tmp_path) -> AsyncIterator[HomeAssistant]:
+    """Run a core with just the helpers entities need for a test."""
+
+    hass = HomeAssistant(str(tmp_path))
+    hass.data["integrations"] = {}
+    entity_helper.async_setup(hass)
+    await dr.async_load(hass)
+    await er.async_load(hass)
+    await restore_state.async_load(hass)
+    try:
+        yield hass
+    finally:
+        await hass.async_stop(force=True)
+
+
+@pytest.fixture
+def api() -> FakeApi:
+    """Return an api recording the frames written to the port."""
+    return FakeApi()
+
+
+@pytest.fixture
+async def connection(hass: HomeAssistant, api: FakeApi) -> AsyncIterator[GryfConnection]:
+    """Return a started connection of one module on the fake port.
+
+    The poller is left to a long interval, so it doesn't add frames of
+    its own.
+    """
+
+    connection = GryfConnection(hass, api, "/dev/null", 1, 3600, 3600)
+    connection.start()
+    try:
+        yield connection
+    finally:
+        await connection.async_close()
@@ -0,0 +1,69 @@
+"""Tests for the Gryf Smart output batcher."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from pygryfsmart.const import OutputActions
+
+from custom_components.gryfsmart import batcher as batcher_module
+from custom_components.gryfsmart.connection import GryfConnection
+from custom_components.gryfsmart.const import OUTPUT_RETRIES
+
+from .common import FakeApi, answer_outputs
+
+
+@pytest.fixture(autouse=True)
+def fast_confirm_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Don't wait the full confirmation timeout for silent modules."""
+    monkeypatch.setattr(batcher_module, "OUTPUT_CONFIRM_TIMEOUT", 0.01)
+
+
+async def test_confirmed(api: FakeApi, connection: GryfConnection) -> None:
+    """Test commands of a loop iteration share a frame and get confirmed."""
+
+    answer_outputs(api)
+
+    results = await asyncio.gather(
+        connection.batcher.async_set_out(1, 1, OutputActions.ON),
+        connection.batcher.async_set_out(1, 3, OutputActions.ON),
+    )
+
+    assert results == [True, True]
+    assert api.sent == ["AT+SetOut=1,1,0,1,0,0,0\n\r"]
+    assert not connection.metrics.command_timeouts
+
+
+async def test_retry_unconfirmed_pins(api: FakeApi, connection: GryfConnection) -> None:
+    """Test the frame is repeated for the pins the module did not confirm."""
+
+    answer_outputs(api, ignored_pins={2})
+
+    unconfirmed = await connection.batcher.async_set_outputs(
+        {(1, 1): OutputActions.ON, (1, 2): OutputActions.ON}
+    )
+
+    assert unconfirmed == {(1, 2)}
+    assert api.sent == ["AT+SetOut=1,1,1,0,0,0,0\n\r"] + [
+        "AT+SetOut=1,0,1,0,0,0,0\n\r"
+    ] * (OUTPUT_RETRIES - 1)
+    assert connection.metrics.command_timeouts == {1: 1}
+
+
+async def test_silent_module(api: FakeApi, connection: GryfConnection) -> None:
+    """Test a command to a module that never answers is given up."""
+
+    assert not await connection.batcher.async_set_out(1, 1, OutputActions.OFF)
+
+    assert api.sent == ["AT+SetOut=1,2,0,0,0,0,0\n\r"] * OUTPUT_RETRIES
+    assert connection.metrics.command_timeouts == {1: 1}
+
+
+async def test_toggle_not_confirmed(api: FakeApi, connection: GryfConnection) -> None:
+    """Test a toggle is written once, its outcome can't be expected."""
+
+    assert await connection.batcher.async_set_out(1, 1, OutputActions.TOGGLE)
+
+    assert api.sent == ["AT+SetOut=1,3,0,0,0,0,0\n\r"]
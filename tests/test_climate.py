@@ -0,0 +1,104 @@
+"""Tests for the Gryf Smart thermostat."""
+
+from __future__ import annotations
+
+import pytest
+
+from homeassistant.components.climate import HVACMode
+from homeassistant.core import HomeAssistant, State
+from homeassistant.helpers import restore_state
+from homeassistant.util import dt as dt_util
+
+from custom_components.gryfsmart import batcher as batcher_module, climate
+from custom_components.gryfsmart.connection import GryfConnection
+from custom_components.gryfsmart.const import CONF_NAME, CONF_OUT, CONF_TEMP, Platforms
+
+from .common import FakeApi, answer_outputs, async_setup_yaml_platform
+
+ENTITY_ID = "climate.thermostat"
+HEATING_ON = "AT+SetOut=1,1,0,0,0,0,0\n\r"
+HEATING_OFF = "AT+SetOut=1,2,0,0,0,0,0\n\r"
+
+
+@pytest.fixture(autouse=True)
+def fast_confirm_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Don't wait the full confirmation timeout for silent modules."""
+    monkeypatch.setattr(batcher_module, "OUTPUT_CONFIRM_TIMEOUT", 0.01)
+
+
+async def async_setup_thermostat(
+    hass: HomeAssistant,
+    connection: GryfConnection,
+    last_state: State | None = None,
+) -> climate.GryfYamlClimate:
+    """Set up a thermostat on output 1 and thermometer 1 of module 1."""
+
+    if last_state is not None:
+        restore_state.async_get(hass).last_states[ENTITY_ID] = restore_state.StoredState(
+            last_state, None, dt_util.utcnow()
+        )
+
+    (thermostat,) = await async_setup_yaml_platform(
+        hass,
+        connection,
+        climate,
+        {Platforms.CLIMATE: [{CONF_NAME: "Thermostat", CONF_OUT: 11, CONF_TEMP: 11}]},
+    )
+    await hass.async_block_till_done()
+    return thermostat
+
+
+async def test_restore_off_switches_heating_off(
+    hass: HomeAssistant, api: FakeApi, connection: GryfConnection
+) -> None:
+    """Test a thermostat restored as off turns off heating left on."""
+
+    answer_outputs(api)
+    await api.async_feed("O=1,1,0,0,0,0,0")
+
+    thermostat = await async_setup_thermostat(
+        hass, connection, State(ENTITY_ID, HVACMode.OFF, {"temperature": 23.5})
+    )
+
+    assert thermostat.hvac_mode == HVACMode.OFF
+    assert thermostat.target_temperature == 23.5
+    assert api.sent == [HEATING_OFF]
+
+
+async def test_restore_heat_regulates(
+    hass: HomeAssistant, api: FakeApi, connection: GryfConnection
+) -> None:
+    """Test a thermostat restored as heating regulates right away."""
+
+    answer_outputs(api)
+    await api.async_feed("O=1,0,0,0,0,0,0")
+    await api.async_feed("T=1,1,19,0")
+
+    thermostat = await async_setup_thermostat(
+        hass, connection, State(ENTITY_ID, HVACMode.HEAT, {"temperature": 22})
+    )
+
+    assert thermostat.hvac_mode == HVACMode.HEAT
+    assert api.sent == [HEATING_ON]
+
+
+async def test_set_hvac_mode(
+    hass: HomeAssistant, api: FakeApi, connection: GryfConnection
+) -> None:
+    """Test turning the thermostat on regulates and off stops the heating."""
+
+    answer_outputs(api)
+    await api.async_feed("O=1,0,0,0,0,0,0")
+    await api.async_feed("T=1,1,19,0")
+    thermostat = await async_setup_thermostat(hass, connection)
+    assert api.sent == []
+
+    await thermostat.async_set_hvac_mode(HVACMode.HEAT)
+    assert api.sent == [HEATING_ON]
+
+    # Setting the same mode again doesn't write anything.
+    await thermostat.async_set_hvac_mode(HVACMode.HEAT)
+    assert api.sent == [HEATING_ON]
+
+    await thermostat.async_set_hvac_mode(HVACMode.OFF)
+    assert api.sent == [HEATING_ON, HEATING_OFF]
@@ -0,0 +1,82 @@
+"""Tests for the shared Gryf Smart port connections."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.gryfsmart import connection as connection_module, sensor
+from custom_components.gryfsmart.connection import (
+    GryfConnection,
+    async_get_connection_pool,
+)
+from custom_components.gryfsmart.const import CONF_LINE_WRITE_INTERVAL
+
+from .common import FakeApi, async_setup_yaml_platform
+
+
+@pytest.fixture
+def apis(monkeypatch: pytest.MonkeyPatch) -> list[FakeApi]:
+    """Open fake ports instead of serial ones, return the opened apis."""
+
+    apis = []
+
+    def create_api(port: str) -> FakeApi:
+        apis.append(FakeApi())
+        return apis[-1]
+
+    monkeypatch.setattr(connection_module, "GryfApi", create_api)
+    monkeypatch.setattr(connection_module, "CONNECTION_RELEASE_DELAY", 0.05)
+    return apis
+
+
+async def test_release_delay(hass: HomeAssistant, apis: list[FakeApi]) -> None:
+    """Test a port released and acquired again right away stays open."""
+
+    pool = async_get_connection_pool(hass)
+
+    first = await pool.async_acquire("/dev/ttyS0", 1, 3600, 3600)
+    await pool.async_release("/dev/ttyS0")
+    again = await pool.async_acquire("/dev/ttyS0", 2, 3600, 3600)
+
+    assert again is first
+    assert again.module_count == 2
+    await asyncio.sleep(0.1)
+    assert len(apis) == 1
+    assert not apis[0].closed
+
+    await pool.async_release("/dev/ttyS0")
+    await asyncio.sleep(0.1)
+    assert apis[0].closed
+
+    reopened = await pool.async_acquire("/dev/ttyS0", 1, 3600, 3600)
+    assert reopened is not first
+    assert len(apis) == 2
+
+    await pool.async_release("/dev/ttyS0")
+    await asyncio.sleep(0.1)
+
+
+async def test_line_sensors_unsubscribe(
+    hass: HomeAssistant, api: FakeApi, connection: GryfConnection
+) -> None:
+    """Test removed line sensors no longer listen to a reused connection."""
+
+    line_in, line_out = await async_setup_yaml_platform(
+        hass, connection, sensor, {CONF_LINE_WRITE_INTERVAL: 0}
+    )
+
+    await api.async_feed("O=1,1,0,0,0,0,0")
+    await connection.api.send_data("AT+SetOut=1,1,0,0,0,0,0\n\r")
+    assert line_in.native_value == "O=1,1,0,0,0,0,0"
+    assert line_out.native_value == "AT+SetOut=1,1,0,0,0,0,0\n\r"
+
+    await line_in.async_remove()
+    await line_out.async_remove()
+    await api.async_feed("O=1,0,0,0,0,0,0")
+
+    assert line_in.native_value == "O=1,1,0,0,0,0,0"
+    assert connection.trace._listeners == ([], [])
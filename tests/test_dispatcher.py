@@ -0,0 +1,86 @@
+"""Tests for the Gryf Smart frame dispatcher."""
+
+from __future__ import annotations
+
+import pytest
+
+from pygryfsmart.const import DriverFunctions
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.gryfsmart.dispatcher import GryfDispatcher, parse_frame
+from custom_components.gryfsmart.metrics import GryfMetrics
+from custom_components.gryfsmart.scheduler import GryfCommandScheduler
+
+from .common import FakeApi
+
+
+@pytest.mark.parametrize(
+    ("line", "expected"),
+    [
+        (
+            "O=1,1,0,0,0,0,1",
+            [((1, pin, DriverFunctions.OUTPUTS), int(pin in (1, 6))) for pin in range(1, 7)],
+        ),
+        (
+            "i=2,0,1;",
+            [((2, 1, DriverFunctions.INPUTS), 0), ((2, 2, DriverFunctions.INPUTS), 1)],
+        ),
+        (
+            "R=3,0,1,2,0",
+            [
+                ((3, pin, DriverFunctions.COVER), state)
+                for pin, state in ((1, 0), (2, 1), (3, 2), (4, 0))
+            ],
+        ),
+        ("PS=4,3", [((4, 3, DriverFunctions.INPUTS), 2)]),
+        ("PL=4,3", [((4, 3, DriverFunctions.INPUTS), 3)]),
+        ("T=5,2,21,5", [((5, 2, DriverFunctions.TEMP), 21.5)]),
+        ("LED=6,1,75", [((6, 1, DriverFunctions.PWM), 75)]),
+        ("PONG=7", []),
+    ],
+)
+def test_parse_frame(line: str, expected: list) -> None:
+    """Test frames are split into values keyed by module, pin and function."""
+
+    assert parse_frame(line) == expected
+
+
+@pytest.mark.parametrize("line", ["O=x,1", "T=5,2", "LED=6"])
+def test_parse_malformed_frame(line: str) -> None:
+    """Test malformed frames raise."""
+
+    with pytest.raises((IndexError, ValueError)):
+        parse_frame(line)
+
+
+async def test_dispatch(hass: HomeAssistant, api: FakeApi) -> None:
+    """Test frames reach their subscribers and changed states are cached."""
+
+    metrics = GryfMetrics(hass, api, GryfCommandScheduler(hass, api))
+    dispatcher = GryfDispatcher(api, metrics)
+
+    received = []
+    changes = []
+
+    async def async_update(state) -> None:
+        received.append(state)
+
+    unsubscribe = dispatcher.subscribe(1, 2, DriverFunctions.OUTPUTS, async_update)
+    dispatcher.add_state_listener(lambda: changes.append(True))
+
+    await api.async_feed("O=1,0,1,0,0,0,0")
+    await api.async_feed("O=1,0,1,0,0,0,0")
+    await api.async_feed("PS=1,2")
+    await api.async_feed("O=1,bad")
+
+    assert received == [1, 1]
+    assert changes == [True]
+    assert dispatcher.state(1, 2, DriverFunctions.OUTPUTS) == 1
+    assert dispatcher.state(1, 2, DriverFunctions.INPUTS) is None
+    assert metrics.malformed_frames[1] == 1
+
+    unsubscribe()
+    await api.async_feed("O=1,0,0,0,0,0,0")
+    assert received == [1, 1]
+    assert dispatcher.state(1, 2, DriverFunctions.OUTPUTS) == 0
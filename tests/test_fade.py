@@ -0,0 +1,77 @@
+"""Tests for the Gryf Smart PWM fades."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.gryfsmart import fade as fade_module
+from custom_components.gryfsmart.connection import GryfConnection
+
+from .common import FakeApi
+
+
+@pytest.fixture(autouse=True)
+def fast_tick(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Step the fades every 10 ms, at most one frame per step."""
+
+    monkeypatch.setattr(fade_module, "FADE_TICK", 0.01)
+    monkeypatch.setattr(fade_module, "FADE_MAX_RATE", 100)
+
+
+def steps(api: FakeApi, pin: int) -> list[int]:
+    """Return the levels written to a pin of module 1."""
+
+    return [
+        int(frame.split(",")[2])
+        for frame in api.sent
+        if frame.startswith(f"SetLED=1,{pin},")
+    ]
+
+
+async def test_fade(api: FakeApi, connection: GryfConnection) -> None:
+    """Test a fade steps up to its target and asks for the levels once."""
+
+    connection.fader.fade(1, 1, 0, 100, 0.1)
+    assert connection.fader.is_fading(1, 1)
+
+    await asyncio.sleep(0.2)
+
+    levels = steps(api, 1)
+    assert len(levels) > 2
+    assert levels == sorted(levels)
+    assert levels[-1] == 100
+    assert api.sent[-1] == "stateLED=1\n\r"
+    assert api.sent.count("stateLED=1\n\r") == 1
+    assert not connection.fader.is_fading(1, 1)
+
+
+async def test_rate_limit(api: FakeApi, connection: GryfConnection) -> None:
+    """Test the fades furthest behind are stepped first within the rate."""
+
+    connection.fader.fade(1, 1, 0, 100, 0.05)
+    connection.fader.fade(1, 2, 0, 10, 0.05)
+
+    await asyncio.sleep(0.015)
+    assert steps(api, 1) and not steps(api, 2)
+
+    await asyncio.sleep(0.2)
+    assert steps(api, 1)[-1] == 100
+    assert steps(api, 2)[-1] == 10
+    assert api.sent.count("stateLED=1\n\r") == 1
+
+
+async def test_cancel(api: FakeApi, connection: GryfConnection) -> None:
+    """Test a cancelled fade stops and returns the last level sent."""
+
+    connection.fader.fade(1, 1, 0, 100, 1)
+    await asyncio.sleep(0.1)
+
+    last = connection.fader.cancel(1, 1)
+    assert last == steps(api, 1)[-1]
+    assert 0 < last < 100
+
+    await asyncio.sleep(0.05)
+    assert steps(api, 1)[-1] == last
+    assert connection.fader.cancel(1, 1) is None
@@ -0,0 +1,90 @@
+"""Tests for the Gryf Smart PWM lights."""
+
+from __future__ import annotations
+
+import asyncio
+
+from homeassistant.components.light import ATTR_BRIGHTNESS
+from homeassistant.core import HomeAssistant
+from homeassistant.util.color import brightness_to_value
+
+from custom_components.gryfsmart import light
+from custom_components.gryfsmart.connection import GryfConnection
+from custom_components.gryfsmart.const import (
+    CONF_ID,
+    CONF_NAME,
+    CONF_PWM_DEBOUNCE,
+    Platforms,
+)
+
+from .common import FakeApi, async_setup_yaml_platform
+
+DEBOUNCE = 0.1
+
+
+async def async_setup_pwm(
+    hass: HomeAssistant, connection: GryfConnection
+) -> light.GryfYamlPwm:
+    """Set up a PWM light on pin 1 of module 1."""
+
+    (pwm,) = await async_setup_yaml_platform(
+        hass,
+        connection,
+        light,
+        {
+            Platforms.PWM: [{CONF_NAME: "Dimmer", CONF_ID: 11}],
+            CONF_PWM_DEBOUNCE: DEBOUNCE,
+        },
+    )
+    return pwm
+
+
+def level(brightness: int) -> int:
+    """Return the PWM level of a brightness."""
+    return int(brightness_to_value((0, 100), brightness))
+
+
+def levels(api: FakeApi) -> list[int]:
+    """Return the levels of the SetLED frames written."""
+
+    return [
+        int(frame.split(",")[2]) for frame in api.sent if frame.startswith("SetLED=")
+    ]
+
+
+async def test_debounce(hass: HomeAssistant, api: FakeApi, connection: GryfConnection) -> None:
+    """Test a dragged slider sends its first and last level only."""
+
+    pwm = await async_setup_pwm(hass, connection)
+
+    for brightness in (51, 102, 153, 204):
+        await pwm.async_turn_on(**{ATTR_BRIGHTNESS: brightness})
+
+    assert levels(api) == [level(51)]
+    assert pwm.is_on
+
+    await asyncio.sleep(DEBOUNCE + 0.05)
+    assert levels(api) == [level(51), level(204)]
+
+    # Once the window passed the next level goes out right away.
+    await asyncio.sleep(DEBOUNCE)
+    await pwm.async_turn_off()
+    assert levels(api) == [level(51), level(204), 0]
+
+
+async def test_report_during_window_ignored(
+    hass: HomeAssistant, api: FakeApi, connection: GryfConnection
+) -> None:
+    """Test a level reported while a newer one waits doesn't show."""
+
+    pwm = await async_setup_pwm(hass, connection)
+
+    await pwm.async_turn_on(**{ATTR_BRIGHTNESS: 255})
+    await pwm.async_turn_on(**{ATTR_BRIGHTNESS: 102})
+    await api.async_feed("LED=1,1,100")
+
+    brightness = pwm.brightness
+    assert brightness < 255
+    await asyncio.sleep(DEBOUNCE + 0.05)
+    assert levels(api) == [100, level(102)]
+    assert pwm.brightness == brightness
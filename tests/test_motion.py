@@ -0,0 +1,92 @@
+"""Tests for the Gryf Smart shutter position model."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.gryfsmart import motion as motion_module
+from custom_components.gryfsmart.const import COVER_CLOSING, COVER_OPENING
+from custom_components.gryfsmart.motion import GryfCoverMotion
+
+TRAVEL_TIME = 20
+TILT_TIME = 2
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """Replace the monotonic clock the motion reads."""
+
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(
+        motion_module, "time", SimpleNamespace(monotonic=lambda: clock.now)
+    )
+    return clock
+
+
+@pytest.mark.parametrize(
+    ("position", "tilt", "target", "seconds"),
+    [
+        # Closing from open turns the slats first.
+        (100, 100, {"position": 50}, TILT_TIME + TRAVEL_TIME / 2),
+        (100, 0, {"position": 50}, TRAVEL_TIME / 2),
+        (0, 0, {"position": 100}, TILT_TIME + TRAVEL_TIME),
+        (40, 50, {"position": 60}, TILT_TIME / 2 + TRAVEL_TIME / 5),
+        (50, 100, {"tilt": 25}, TILT_TIME * 0.75),
+        (50, 100, {}, 0),
+    ],
+)
+def test_time_to(clock, position, tilt, target, seconds) -> None:
+    """Test the time to reach a position or a tilt from a stop."""
+
+    motion = GryfCoverMotion(TRAVEL_TIME, TILT_TIME, position, tilt)
+
+    assert motion.time_to(**target) == pytest.approx(seconds)
+
+
+def test_time_to_without_tilt(clock) -> None:
+    """Test shutters without slats only travel."""
+
+    motion = GryfCoverMotion(TRAVEL_TIME, 0, 100, 100)
+
+    assert motion.time_to(position=0) == pytest.approx(TRAVEL_TIME)
+    assert motion.time_to(tilt=0) == 0
+
+
+def test_time_to_milestone(clock) -> None:
+    """Test the moving shutter crosses every step in turn."""
+
+    motion = GryfCoverMotion(TRAVEL_TIME, TILT_TIME, 100, 100)
+    assert motion.time_to_milestone(10) is None
+
+    motion.start(COVER_CLOSING)
+    assert motion.time_to_milestone(10) == pytest.approx(TILT_TIME + 2)
+
+    clock.now += TILT_TIME + 2
+    assert motion.position == pytest.approx(90)
+    assert motion.tilt == 0
+    assert motion.time_to_milestone(10) == pytest.approx(2)
+
+    clock.now += 1
+    assert motion.time_to_milestone(10) == pytest.approx(1)
+
+    clock.now += 17
+    assert motion.position == 0
+    assert motion.time_to_milestone(10) is None
+
+
+def test_time_to_milestone_opening(clock) -> None:
+    """Test an opening shutter counts up to the next step and stops at 100."""
+
+    motion = GryfCoverMotion(TRAVEL_TIME, TILT_TIME, 85, 100)
+    motion.start(COVER_OPENING)
+
+    assert motion.time_to_milestone(10) == pytest.approx(1)
+
+    clock.now += 1
+    assert motion.time_to_milestone(10) == pytest.approx(2)
+
+    clock.now += 2
+    assert motion.position == 100
+    assert motion.time_to_milestone(10) is None
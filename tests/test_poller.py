@@ -0,0 +1,160 @@
+"""Tests for the Gryf Smart state poller."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.gryfsmart import poller as poller_module
+from custom_components.gryfsmart.metrics import GryfMetrics
+from custom_components.gryfsmart.poller import GryfPoller
+from custom_components.gryfsmart.scheduler import GryfCommandScheduler
+
+from .common import FakeApi
+
+
+@pytest.fixture(autouse=True)
+def no_command_delay(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Don't space the poll frames out."""
+    monkeypatch.setattr(poller_module, "POLL_COMMAND_DELAY", 0)
+
+
+def create_poller(
+    hass: HomeAssistant, api: FakeApi, interval: float = 30, stale_timeout: float = 30
+) -> tuple[GryfPoller, GryfCommandScheduler]:
+    """Return a poller of two modules writing through a running scheduler."""
+
+    scheduler = GryfCommandScheduler(hass, api)
+    metrics = GryfMetrics(hass, api, scheduler)
+    scheduler.start()
+    return GryfPoller(hass, api, scheduler, metrics, 2, interval, stale_timeout), scheduler
+
+
+async def test_poll_shutter_modules(hass: HomeAssistant, api: FakeApi) -> None:
+    """Test modules with shutters are asked for their shutter states too."""
+
+    poller, scheduler = create_poller(hass, api)
+
+    unwatch = poller.watch_shutters(2)
+    await poller._async_poll(1)
+    await poller._async_poll(2)
+
+    assert api.sent == [
+        "AT+StanIN=1\n\r",
+        "AT+StanOUT=1\n\r",
+        "AT+StanIN=2\n\r",
+        "AT+StanOUT=2\n\r",
+        "AT+StanROL=2\n\r",
+    ]
+
+    api.sent.clear()
+    unwatch()
+    await poller._async_poll(2)
+
+    assert api.sent == ["AT+StanIN=2\n\r", "AT+StanOUT=2\n\r"]
+    await scheduler.async_stop()
+
+
+async def test_stalest_module(hass: HomeAssistant, api: FakeApi) -> None:
+    """Test only a module quiet for longer than the budget is due a poll."""
+
+    poller, scheduler = create_poller(hass, api)
+
+    await api.async_feed("O=1,0,0,0,0,0,0")
+    await api.async_feed("O=2,0,0,0,0,0,0")
+    assert poller._stalest_module() is None
+
+    poller._last_seen[1] -= 40
+    poller._last_seen[2] -= 60
+    assert poller._stalest_module() == 2
+
+    await scheduler.async_stop()
+
+
+async def test_busy_bus_backoff(hass: HomeAssistant, api: FakeApi) -> None:
+    """Test polling backs off while the bus is busy, and recovers."""
+
+    poller, scheduler = create_poller(hass, api, interval=0.01, stale_timeout=0)
+    poller.start()
+
+    for _ in range(3):
+        await api.async_feed("O=1,0,0,0,0,0,0")
+        await asyncio.sleep(0.01 * poller.as_dict()["backoff"] + 0.005)
+    assert poller.as_dict()["backoff"] > 1
+    assert api.sent == []
+
+    await asyncio.sleep(0.01 * poller.as_dict()["backoff"] + 0.02)
+    assert poller.as_dict()["backoff"] == 1
+    assert api.sent
+
+    await poller.async_stop()
+    await scheduler.async_stop()
+
+
+async def test_silent_module_unavailable(
+    hass: HomeAssistant, api: FakeApi, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a module not answering its poll goes unavailable and is probed later."""
+
+    monkeypatch.setattr(poller_module, "POLL_ANSWER_TIMEOUT", 0.02)
+    monkeypatch.setattr(poller_module, "POLL_BUSY_FRAME_RATE", 10000)
+    poller, scheduler = create_poller(hass, api, interval=0.01, stale_timeout=0)
+    changes = []
+    poller.subscribe_availability(1, lambda: changes.append(poller.module_available(1)))
+
+    # Module 2 answers every poll, module 1 never does.
+    async def async_respond(frame: str) -> None:
+        if frame == "AT+StanOUT=2\n\r":
+            await api.async_feed("O=2,0,0,0,0,0,0")
+
+    api.respond = async_respond
+    poller.start()
+    await asyncio.sleep(0.15)
+    await poller.async_stop()
+
+    assert changes == [False]
+    assert not poller.module_available(1)
+    assert poller.module_available(2)
+    assert poller.as_dict()["unavailable"] == [1]
+    assert 0 < poller.as_dict()["next_probe_in"][1] <= poller_module.REPROBE_MIN_INTERVAL
+    await scheduler.async_stop()
+
+
+async def test_reprobe_backoff(hass: HomeAssistant, api: FakeApi) -> None:
+    """Test the delay between probes of a silent module doubles up to a cap."""
+
+    poller, scheduler = create_poller(hass, api)
+
+    delays = []
+    for _ in range(12):
+        poller._module_failed(1)
+        delays.append(poller._retry_delay[1])
+
+    assert delays[:3] == [
+        poller_module.REPROBE_MIN_INTERVAL,
+        poller_module.REPROBE_MIN_INTERVAL * 2,
+        poller_module.REPROBE_MIN_INTERVAL * 4,
+    ]
+    assert delays[-1] == poller_module.REPROBE_MAX_INTERVAL
+    await scheduler.async_stop()
+
+
+async def test_unsolicited_frame_resyncs(hass: HomeAssistant, api: FakeApi) -> None:
+    """Test a silent module speaking up is available again and polled."""
+
+    poller, scheduler = create_poller(hass, api)
+    changes = []
+    poller.subscribe_availability(1, lambda: changes.append(poller.module_available(1)))
+    poller._module_failed(1)
+
+    await api.async_feed("I=1,0,0,0,0,0,0")
+    await asyncio.sleep(0.01)
+
+    assert changes == [False, True]
+    assert poller.module_available(1)
+    assert poller.as_dict()["next_probe_in"] == {}
+    assert api.sent == ["AT+StanIN=1\n\r", "AT+StanOUT=1\n\r"]
+    await scheduler.async_stop()
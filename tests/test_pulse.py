@@ -0,0 +1,67 @@
+"""Tests for the Gryf Smart output pulses."""
+
+from __future__ import annotations
+
+import asyncio
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.gryfsmart.connection import GryfConnection
+from custom_components.gryfsmart.pulse import GryfPulse
+
+from .common import FakeApi, answer_outputs
+
+OUTPUT_ON = "AT+SetOut=1,1,0,0,0,0,0\n\r"
+OUTPUT_OFF = "AT+SetOut=1,2,0,0,0,0,0\n\r"
+
+
+async def test_pulse(hass: HomeAssistant, api: FakeApi, connection: GryfConnection) -> None:
+    """Test the release is timed from the written on frame."""
+
+    answer_outputs(api)
+    pulse = GryfPulse(hass, connection.batcher, 1, 1, 0.05)
+
+    pulse.async_start()
+    assert api.sent == []
+    assert not pulse.active
+
+    await asyncio.sleep(0.02)
+    assert api.sent == [OUTPUT_ON]
+    assert pulse.active
+
+    await asyncio.sleep(0.1)
+    assert api.sent == [OUTPUT_ON, OUTPUT_OFF]
+    assert not pulse.active
+
+
+async def test_restart(hass: HomeAssistant, api: FakeApi, connection: GryfConnection) -> None:
+    """Test starting a running pulse restarts its width."""
+
+    answer_outputs(api)
+    pulse = GryfPulse(hass, connection.batcher, 1, 1, 0.2)
+
+    pulse.async_start()
+    await asyncio.sleep(0.1)
+
+    pulse.async_start()
+    await asyncio.sleep(0.15)
+    assert pulse.active
+    assert OUTPUT_OFF not in api.sent
+
+    await asyncio.sleep(0.1)
+    assert api.sent[-1] == OUTPUT_OFF
+
+
+async def test_cancel(hass: HomeAssistant, api: FakeApi, connection: GryfConnection) -> None:
+    """Test cancelling a pulse releases the output right away."""
+
+    answer_outputs(api)
+    pulse = GryfPulse(hass, connection.batcher, 1, 1, 10)
+
+    pulse.async_start()
+    await asyncio.sleep(0.02)
+    pulse.async_cancel()
+    await asyncio.sleep(0.02)
+
+    assert api.sent == [OUTPUT_ON, OUTPUT_OFF]
+    assert not pulse.active
@@ -0,0 +1,96 @@
+"""Tests for the Gryf Smart write queue."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.gryfsmart.const import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_COMMAND,
+    PRIORITY_POLL,
+)
+from custom_components.gryfsmart.scheduler import GryfCommandScheduler
+
+from .common import FakeApi
+
+
+async def test_same_key_replaces_pending_frame(hass: HomeAssistant, api: FakeApi) -> None:
+    """Test a frame queued under a pending key replaces it."""
+
+    scheduler = GryfCommandScheduler(hass, api)
+
+    first = asyncio.create_task(scheduler.async_send("SetLED=1,1,10,1", key="led"))
+    second = asyncio.create_task(scheduler.async_send("SetLED=1,1,20,1", key="led"))
+    other = asyncio.create_task(scheduler.async_send("SetLED=1,2,30,1", key="other"))
+    await asyncio.sleep(0)
+    assert scheduler.depth == 2
+
+    scheduler.start()
+    await asyncio.gather(first, second, other)
+
+    assert api.sent == ["SetLED=1,1,20,1", "SetLED=1,2,30,1"]
+    await scheduler.async_stop()
+
+
+async def test_priority_order(hass: HomeAssistant, api: FakeApi) -> None:
+    """Test frames are written by priority, then in the order queued."""
+
+    scheduler = GryfCommandScheduler(hass, api)
+
+    sends = [
+        asyncio.create_task(scheduler.async_send(frame, priority))
+        for frame, priority in (
+            ("poll", PRIORITY_POLL),
+            ("fade", PRIORITY_BACKGROUND),
+            ("command 1", PRIORITY_COMMAND),
+            ("command 2", PRIORITY_COMMAND),
+        )
+    ]
+    await asyncio.sleep(0)
+
+    scheduler.start()
+    await asyncio.gather(*sends)
+
+    assert api.sent == ["command 1", "command 2", "fade", "poll"]
+    await scheduler.async_stop()
+
+
+async def test_stop_fails_queued_frames(hass: HomeAssistant, api: FakeApi) -> None:
+    """Test frames still queued when the scheduler stops are cancelled."""
+
+    scheduler = GryfCommandScheduler(hass, api)
+
+    send = asyncio.create_task(scheduler.async_send("poll", PRIORITY_POLL))
+    await asyncio.sleep(0)
+    await scheduler.async_stop()
+
+    with pytest.raises(asyncio.CancelledError):
+        await send
+    assert api.sent == []
+    assert scheduler.depth == 0
+
+
+async def test_stop_fails_frame_being_written(hass: HomeAssistant, api: FakeApi) -> None:
+    """Test stopping during a write doesn't leave its sender waiting."""
+
+    writing = asyncio.Event()
+
+    async def async_send_data(frame: str) -> None:
+        writing.set()
+        await asyncio.Event().wait()
+
+    api.send_data = async_send_data
+    scheduler = GryfCommandScheduler(hass, api)
+    scheduler.start()
+
+    send = asyncio.create_task(scheduler.async_send("AT+SetOut=1,1,0,0,0,0,0\n\r"))
+    await writing.wait()
+    await scheduler.async_stop()
+
+    with pytest.raises(asyncio.CancelledError):
+        async with asyncio.timeout(1):
+            await send
@@ -0,0 +1,45 @@
+"""Tests for the Gryf Smart module search."""
+
+from __future__ import annotations
+
+from homeassistant.core import Event, HomeAssistant
+
+from custom_components.gryfsmart.connection import GryfConnection
+from custom_components.gryfsmart.const import EVENT_MODULE_FOUND
+
+from .common import FakeApi
+
+
+async def test_search(hass: HomeAssistant, api: FakeApi, connection: GryfConnection) -> None:
+    """Test answering modules are found and announced, silent ones listed."""
+
+    answering = {1: 1001, 3: 1003}
+    waiting = []
+
+    async def async_respond(frame: str) -> None:
+        waiting.append(len(connection.search._waiters))
+        module = int(frame.strip().split(",")[1])
+        if module in answering:
+            await api.async_feed(f"AT+FIND={module},{answering[module]},7")
+
+    api.respond = async_respond
+    events: list[Event] = []
+    hass.bus.async_listen(EVENT_MODULE_FOUND, events.append)
+
+    result = await connection.search.async_search(range(1, 6), concurrency=2, timeout=0.05)
+    await hass.async_block_till_done()
+
+    assert result == {
+        "modules": [
+            {"id": 1, "mac": 1001, "model": 7},
+            {"id": 3, "mac": 1003, "model": 7},
+        ],
+        "missing": [2, 4, 5],
+    }
+    assert api.sent == [f"AT+Search=0,{module}\n\r" for module in range(1, 6)]
+    assert max(waiting) <= 2
+    assert [event.data for event in events] == [
+        {"port": "/dev/null", "id": 1, "mac": 1001, "model": 7},
+        {"port": "/dev/null", "id": 3, "mac": 1003, "model": 7},
+    ]
+    assert connection.search._waiters == {}
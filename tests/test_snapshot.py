@@ -0,0 +1,77 @@
+"""Tests for the Gryf Smart state snapshot."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from pygryfsmart.const import DriverFunctions
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.gryfsmart import snapshot as snapshot_module
+from custom_components.gryfsmart.dispatcher import GryfDispatcher
+from custom_components.gryfsmart.metrics import GryfMetrics
+from custom_components.gryfsmart.scheduler import GryfCommandScheduler
+from custom_components.gryfsmart.snapshot import GryfSnapshot
+
+from .common import FakeApi
+
+PORT = "/dev/ttyS0"
+SAVE_DELAY = 0.05
+
+
+@pytest.fixture(autouse=True)
+def short_save_delay(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Save the snapshot shortly after a change."""
+    monkeypatch.setattr(snapshot_module, "SNAPSHOT_SAVE_DELAY", SAVE_DELAY)
+
+
+def create_dispatcher(hass: HomeAssistant, api: FakeApi) -> GryfDispatcher:
+    """Return a dispatcher of the frames read from api."""
+    return GryfDispatcher(api, GryfMetrics(hass, api, GryfCommandScheduler(hass, api)))
+
+
+def stored_states(hass: HomeAssistant) -> list | None:
+    """Return the states saved to disk, if any."""
+
+    path = Path(hass.config.path(".storage", "gryfsmart.snapshot_dev_ttys0"))
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())["data"]["states"]
+
+
+async def test_restore(hass: HomeAssistant, api: FakeApi) -> None:
+    """Test the states are saved and seed a new dispatcher, shutters excepted."""
+
+    dispatcher = create_dispatcher(hass, api)
+    GryfSnapshot(hass, dispatcher, PORT)
+
+    await api.async_feed("O=1,1,0,0,0,0,0")
+    await api.async_feed("T=2,1,21,5")
+    await api.async_feed("R=3,1,0,0,0")
+    await asyncio.sleep(SAVE_DELAY * 2)
+
+    restarted = create_dispatcher(hass, FakeApi())
+    await GryfSnapshot(hass, restarted, PORT).async_load()
+
+    assert restarted.state(1, 1, DriverFunctions.OUTPUTS) == 1
+    assert restarted.state(1, 2, DriverFunctions.OUTPUTS) == 0
+    assert restarted.state(2, 1, DriverFunctions.TEMP) == 21.5
+    assert restarted.state(3, 1, DriverFunctions.COVER) is None
+
+
+async def test_save_not_pushed_back(hass: HomeAssistant, api: FakeApi) -> None:
+    """Test states changing all the time still get saved."""
+
+    dispatcher = create_dispatcher(hass, api)
+    GryfSnapshot(hass, dispatcher, PORT)
+
+    for step in range(10):
+        await api.async_feed(f"O=1,{step % 2},0,0,0,0,0")
+        await asyncio.sleep(SAVE_DELAY / 2)
+
+    assert stored_states(hass) is not None
@@ -0,0 +1,75 @@
+"""Tests for the Gryf Smart module cache."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from custom_components.gryfsmart import topology as topology_module
+from custom_components.gryfsmart.const import TOPOLOGY_EXPIRY
+from custom_components.gryfsmart.topology import STORAGE_VERSION, GryfTopology
+
+from .common import FakeApi
+
+PORT = "/dev/ttyS0"
+
+
+@pytest.fixture(autouse=True)
+def no_save_delay(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Save the cache right away."""
+    monkeypatch.setattr(topology_module, "TOPOLOGY_SAVE_DELAY", 0)
+
+
+async def test_learn_and_persist(hass: HomeAssistant, api: FakeApi) -> None:
+    """Test modules are learned from frames and loaded after a restart."""
+
+    topology = GryfTopology(hass, api, PORT)
+
+    await api.async_feed("AT+FIND=1,123456,7")
+    await api.async_feed("I=1,0,0,0,0,0,0,0,0")
+    await api.async_feed("O=1,0,0,0,0,0,0")
+    await api.async_feed("T=1,2,21,5")
+    await api.async_feed("LED=2,1,50")
+    await api.async_feed("O=x,bad")
+    await asyncio.sleep(0.01)
+
+    assert set(topology.modules) == {1, 2}
+    assert topology.modules[1] | {"last_seen": 0} == {
+        "mac": 123456,
+        "model": 7,
+        "inputs": 8,
+        "outputs": 6,
+        "temperature": [2],
+        "last_seen": 0,
+    }
+    assert topology.modules[2]["pwm"] == [1]
+
+    restarted = GryfTopology(hass, FakeApi(), PORT)
+    await restarted.async_load()
+
+    assert restarted.modules == topology.modules
+
+
+async def test_expired_modules_dropped(hass: HomeAssistant) -> None:
+    """Test modules not heard from for too long are forgotten on load."""
+
+    store = Store(hass, STORAGE_VERSION, "gryfsmart.topology_dev_ttys0")
+    now = time.time()
+    await store.async_save(
+        {
+            "modules": {
+                "1": {"last_seen": now - 60, "outputs": 6},
+                "2": {"last_seen": now - TOPOLOGY_EXPIRY - 60, "outputs": 6},
+            }
+        }
+    )
+
+    topology = GryfTopology(hass, FakeApi(), PORT)
+    await topology.async_load()
+
+    assert list(topology.modules) == [1]
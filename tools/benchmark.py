@@ -0,0 +1,377 @@
+"""Measure command latency against the bus emulator.
+
+Run ``python -m tools.benchmark --output results.json`` from the repository
+root. For every size the entities are split between switches, PWM lights
+and covers, set up on a bare Home Assistant core and driven through their
+entity methods. The emulator runs in a subprocess, so the CPU time per
+frame only counts the integration side.
+
+Latency is measured from the entity call until the module's answer
+reached the entity's async_update, which is the confirmed state.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+import json
+import logging
+import math
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any
+
+from pygryfsmart.const import DriverFunctions
+
+from homeassistant.const import __version__ as HA_VERSION
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import (
+    device_registry as dr,
+    entity as entity_helper,
+    entity_registry as er,
+    restore_state,
+)
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import EntityPlatform
+from homeassistant.util.color import brightness_to_value
+
+from custom_components.gryfsmart import cover, light, switch
+from custom_components.gryfsmart.connection import (
+    GryfConnection,
+    async_get_connection_pool,
+)
+from custom_components.gryfsmart.const import (
+    CONF_API,
+    CONF_BATCHER,
+    CONF_FADER,
+    CONF_DISPATCHER,
+    CONF_ID,
+    CONF_NAME,
+    CONF_POLLER,
+    CONF_SCHEDULER,
+    CONF_TEMPERATURE_DEADBAND,
+    CONF_PWM_DEBOUNCE,
+    CONF_OPTIMISTIC,
+    CONF_TIME,
+    DEFAULT_STALE_TIMEOUT,
+    DEFAULT_TEMPERATURE_DEADBAND,
+    DEFAULT_PWM_DEBOUNCE,
+    DEFAULT_OPTIMISTIC,
+    DEFAULT_UPDATE_INTERVAL,
+    DOMAIN,
+    Platforms,
+)
+
+from .emulator import MODULE_PINS, MODULE_SHUTTERS
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_SIZES = (10, 100, 1000)
+DEFAULT_SAMPLES = 200
+CONFIRM_TIMEOUT = 5
+COVER_TIME = 100
+PWM_BRIGHTNESS = 128
+
+# Share of switches and PWM lights in every size, the rest are covers.
+SWITCH_SHARE = 0.6
+PWM_SHARE = 0.2
+
+
+def _percentiles(samples: list[float]) -> dict[str, Any]:
+    """Return p50/p95/p99 of latencies in milliseconds."""
+
+    if not samples:
+        return {"samples": 0}
+
+    ordered = sorted(samples)
+
+    def percentile(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, math.ceil(p * len(ordered)) - 1)] * 1000, 3)
+
+    return {
+        "samples": len(ordered),
+        "p50": percentile(0.50),
+        "p95": percentile(0.95),
+        "p99": percentile(0.99),
+        "mean": round(statistics.fmean(ordered) * 1000, 3),
+    }
+
+
+def _layout(size: int) -> tuple[dict[str, list[dict[str, Any]]], int]:
+    """Return the YAML entity config for a size and the module count."""
+
+    switches = round(size * SWITCH_SHARE)
+    pwms = round(size * PWM_SHARE)
+    covers = size - switches - pwms
+    config: dict[str, list[dict[str, Any]]] = {}
+    module = 0
+
+    for platform_name, count, pins in (
+        (Platforms.SWITCH, switches, MODULE_PINS),
+        (Platforms.PWM, pwms, MODULE_PINS),
+        (Platforms.COVER, covers, MODULE_SHUTTERS),
+    ):
+        config[platform_name] = []
+        for index in range(count):
+            if index % pins == 0:
+                module += 1
+            conf = {
+                CONF_NAME: f"{platform_name} {index}",
+                CONF_ID: module * 10 + index % pins + 1,
+            }
+            if platform_name == Platforms.COVER:
+                conf[CONF_TIME] = COVER_TIME
+            config[platform_name].append(conf)
+
+    return config, module
+
+
+async def _async_create_hass(config_dir: str) -> HomeAssistant:
+    """Return a core with just the helpers entities need."""
+
+    hass = HomeAssistant(config_dir)
+    entity_helper.async_setup(hass)
+    await dr.async_load(hass)
+    await er.async_load(hass)
+    await restore_state.async_load(hass)
+    return hass
+
+
+async def _async_add_entities(hass: HomeAssistant) -> dict[str, list[Entity]]:
+    """Run the YAML platform setups and add their entities."""
+
+    added: dict[str, list[Entity]] = {}
+
+    for domain, module in (("switch", switch), ("light", light), ("cover", cover)):
+        entity_platform = EntityPlatform(
+            hass=hass,
+            logger=_LOGGER,
+            domain=domain,
+            platform_name=DOMAIN,
+            platform=module,
+            scan_interval=timedelta(seconds=30),
+            entity_namespace=None,
+        )
+        await entity_platform.async_setup({})
+        added[domain] = list(entity_platform.entities.values())
+
+    return added
+
+
+async def _async_confirmed(
+    connection: GryfConnection,
+    entity: Entity,
+    function: str,
+    expected: int,
+    action: Callable[[], Awaitable[Any]],
+) -> float | None:
+    """Run the action, return the time until the module confirmed it."""
+
+    confirmed = asyncio.get_running_loop().create_future()
+
+    async def async_confirm(value) -> None:
+        if value == expected and not confirmed.done():
+            confirmed.set_result(time.perf_counter())
+
+    unsubscribe = connection.dispatcher.subscribe(
+        entity._device.id, entity._device.pin, function, async_confirm
+    )
+    try:
+        start = time.perf_counter()
+        await action()
+        async with asyncio.timeout(CONFIRM_TIMEOUT):
+            return await confirmed - start
+    except TimeoutError:
+        return None
+    finally:
+        unsubscribe()
+
+
+async def _async_measure(
+    connection: GryfConnection,
+    entities: dict[str, list[Entity]],
+    samples: int,
+) -> tuple[dict[str, Any], int]:
+    """Drive every entity kind, return latencies and the timeout count."""
+
+    latencies: dict[str, list[float]] = {"switch": [], "pwm": [], "cover": []}
+    closing: dict[Entity, bool] = {}
+    timeouts = 0
+
+    for index in range(samples):
+        runs = []
+
+        if entities["switch"]:
+            entity = entities["switch"][index % len(entities["switch"])]
+            on = not entity.is_on
+            runs.append(
+                (
+                    "switch",
+                    entity,
+                    DriverFunctions.OUTPUTS,
+                    int(on),
+                    entity.async_turn_on if on else entity.async_turn_off,
+                )
+            )
+
+        if entities["light"]:
+            entity = entities["light"][index % len(entities["light"])]
+            if entity.is_on:
+                runs.append(("pwm", entity, DriverFunctions.PWM, 0, entity.async_turn_off))
+            else:
+                level = int(brightness_to_value((0, 100), PWM_BRIGHTNESS))
+
+                async def async_turn_on(entity=entity) -> None:
+                    await entity.async_turn_on(brightness=PWM_BRIGHTNESS)
+
+                runs.append(("pwm", entity, DriverFunctions.PWM, level, async_turn_on))
+
+        if entities["cover"]:
+            entity = entities["cover"][index % len(entities["cover"])]
+            # Alternate the direction so every sample moves the shutter.
+            close = closing[entity] = not closing.get(entity, False)
+
+            async def async_move(entity=entity, close=close) -> None:
+                await entity.async_set_cover_position(position=0 if close else 100)
+
+            runs.append(("cover", entity, DriverFunctions.COVER, 2 if close else 1, async_move))
+
+        for kind, entity, function, expected, action in runs:
+            latency = await _async_confirmed(connection, entity, function, expected, action)
+            if latency is None:
+                timeouts += 1
+            else:
+                latencies[kind].append(latency)
+
+            if kind == "cover":
+                await _async_confirmed(
+                    connection, entity, function, 0, entity.async_stop_cover
+                )
+
+    return {kind: _percentiles(values) for kind, values in latencies.items()}, timeouts
+
+
+async def _async_run_size(size: int, samples: int, link: str) -> dict[str, Any]:
+    """Benchmark a single entity count."""
+
+    config, module_count = _layout(size)
+
+    emulator = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "tools.emulator",
+        "--modules",
+        str(module_count),
+        "--link",
+        link,
+        stdout=asyncio.subprocess.PIPE,
+    )
+    await emulator.stdout.readline()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await _async_create_hass(config_dir)
+        connection = await async_get_connection_pool(hass).async_acquire(
+            link, module_count, DEFAULT_UPDATE_INTERVAL, DEFAULT_STALE_TIMEOUT
+        )
+
+        frames = 0
+
+        async def async_count(line: str) -> None:
+            nonlocal frames
+            frames += 1
+
+        connection.api.subscribe_input_message(async_count)
+        connection.api.subscribe_output_message(async_count)
+
+        hass.data[DOMAIN] = {
+            **config,
+            CONF_TEMPERATURE_DEADBAND: DEFAULT_TEMPERATURE_DEADBAND,
+            CONF_PWM_DEBOUNCE: DEFAULT_PWM_DEBOUNCE,
+            CONF_OPTIMISTIC: DEFAULT_OPTIMISTIC,
+            CONF_API: connection.api,
+            CONF_SCHEDULER: connection.scheduler,
+            CONF_POLLER: connection.poller,
+            CONF_DISPATCHER: connection.dispatcher,
+            CONF_BATCHER: connection.batcher,
+            CONF_FADER: connection.fader,
+        }
+
+        try:
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            entities = await _async_add_entities(hass)
+            memory = tracemalloc.get_traced_memory()[0] - before
+            tracemalloc.stop()
+
+            await connection.poller.async_sweep()
+
+            frames = 0
+            started, cpu_started = time.perf_counter(), time.process_time()
+            latency, timeouts = await _async_measure(connection, entities, samples)
+            elapsed = time.perf_counter() - started
+            cpu = time.process_time() - cpu_started
+        finally:
+            await connection.async_close()
+            await hass.async_stop(force=True)
+            emulator.terminate()
+            await emulator.wait()
+
+    return {
+        "entities": size,
+        "modules": module_count,
+        "latency_ms": latency,
+        "timeouts": timeouts,
+        "frames": frames,
+        "frames_per_second": round(frames / elapsed, 1),
+        "cpu_us_per_frame": round(cpu / frames * 1e6, 1) if frames else None,
+        "memory_bytes_per_entity": round(memory / size),
+    }
+
+
+async def _async_main(args: argparse.Namespace) -> dict[str, Any]:
+    link = os.path.join(tempfile.gettempdir(), "gryfsmart-benchmark", "dev", "ttyGRYF0")
+
+    return {
+        "python": platform.python_version(),
+        "homeassistant": HA_VERSION,
+        "samples": args.samples,
+        "results": [
+            await _async_run_size(size, args.samples, link) for size in args.sizes
+        ],
+    }
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="entity counts"
+    )
+    parser.add_argument(
+        "--samples", type=int, default=DEFAULT_SAMPLES, help="calls per entity kind"
+    )
+    parser.add_argument("--output", help="write the JSON here instead of stdout")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    # The library rejects LED frames of modules above 8 with a traceback.
+    logging.getLogger("pygryfsmart").setLevel(logging.CRITICAL)
+    results = json.dumps(asyncio.run(_async_main(args)), indent=2)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            output.write(results + "\n")
+    else:
+        print(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,441 @@
+"""Emulate a Gryf Smart bus on a pseudo terminal.
+
+Run ``python -m tools.emulator --modules 64`` from the repository root and
+use the printed port as CONF_PORT. GryfApi picks the serial transport by the
+``/dev/tty`` part of the path, so the pty is exposed through a symlink
+ending in ``dev/ttyGRYF0``.
+
+Script lines, one command each, drive the virtual inputs:
+
+    sleep 0.5
+    input 3 2 1         # module 3, input 2 goes high
+    press 3 2           # short press and release, "press 3 2 long" for long
+    temp 4 1 21.5       # thermometer 1 of module 4 reads 21.5 °C
+    silent 5            # module 5 stops answering, "answer 5" undoes it
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+import logging
+import os
+import tempfile
+import tty
+
+from pygryfsmart.api.const import (
+    BAUDRATE,
+    DriverActions,
+    DriverFunctions,
+    ShutterStates,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_LINK = os.path.join(tempfile.gettempdir(), "gryfsmart", "dev", "ttyGRYF0")
+
+MODULE_PINS = 8
+MODULE_SHUTTERS = 4
+MODULE_THERMOMETERS = 2
+MODULE_MODEL = 0
+MODULE_MAC_BASE = 100000
+
+# Time a module takes to start answering a request.
+RESPONSE_DELAY = 0.005
+PRESS_TIME = 0.1
+LONG_PRESS_TIME = 1.5
+
+SHUTTER_STOPPED = 0
+SHUTTER_OPENING = 1
+SHUTTER_CLOSING = 2
+
+PWM_STATE_REQUEST = "stateLED"
+
+
+@dataclass
+class VirtualModule:
+    """State of a single emulated module."""
+
+    id: int
+    outputs: list[int] = field(default_factory=lambda: [0] * MODULE_PINS)
+    inputs: list[int] = field(default_factory=lambda: [0] * MODULE_PINS)
+    pwm: list[int] = field(default_factory=lambda: [0] * MODULE_PINS)
+    shutters: list[int] = field(default_factory=lambda: [SHUTTER_STOPPED] * MODULE_SHUTTERS)
+    temperatures: list[float] = field(
+        default_factory=lambda: [21.0] * MODULE_THERMOMETERS
+    )
+    shutter_timers: dict[int, asyncio.TimerHandle] = field(default_factory=dict)
+    last_direction: dict[int, int] = field(default_factory=dict)
+
+    def reset(self) -> None:
+        """Return to the power-on state."""
+
+        for timer in self.shutter_timers.values():
+            timer.cancel()
+        self.shutter_timers.clear()
+        self.outputs[:] = [0] * MODULE_PINS
+        self.pwm[:] = [0] * MODULE_PINS
+        self.shutters[:] = [SHUTTER_STOPPED] * MODULE_SHUTTERS
+
+
+def _states(values: Iterable[int]) -> str:
+    return ",".join(str(value) for value in values)
+
+
+class GryfBusEmulator:
+    """Answer Gryf Smart commands on a pty like modules 1..N would.
+
+    Every frame occupies the emulated half-duplex line for the time it
+    takes to transmit at BAUDRATE, and modules start answering
+    RESPONSE_DELAY after a request. Modules outside 1..N and modules made
+    silent don't answer at all.
+    """
+
+    def __init__(
+        self,
+        module_count: int,
+        response_delay: float = RESPONSE_DELAY,
+        baudrate: int = BAUDRATE,
+    ) -> None:
+        """Init the emulator."""
+
+        self.modules = {
+            module: VirtualModule(module) for module in range(1, module_count + 1)
+        }
+        self.silent: set[int] = set()
+        self.frames_in = 0
+        self.frames_out = 0
+        self._response_delay = response_delay
+        self._byte_time = 10 / baudrate
+        self._master: int | None = None
+        self._slave: int | None = None
+        self._link: str | None = None
+        self._buffer = b""
+        self._outgoing: asyncio.Queue[str] = asyncio.Queue()
+        self._writer: asyncio.Task | None = None
+        self._handlers = {
+            DriverActions.SET_OUT.upper(): self._set_out,
+            DriverActions.GET_IN_STATE.upper(): self._get_in_state,
+            DriverActions.GET_OUT_STATE.upper(): self._get_out_state,
+            DriverActions.SET_PWM.upper(): self._set_pwm,
+            PWM_STATE_REQUEST.upper(): self._get_pwm_state,
+            DriverActions.SET_COVER.upper(): self._set_cover,
+            DriverActions.GET_SHUTTER_STATE.upper(): self._get_shutter_state,
+            DriverActions.SEARCH.upper(): self._search,
+            DriverActions.RESET.upper(): self._reset,
+            DriverActions.PING.upper(): self._ping,
+        }
+
+    @property
+    def port(self) -> str | None:
+        """Return the path to hand to GryfApi."""
+
+        if self._link is not None:
+            return self._link
+        if self._slave is not None:
+            return os.ttyname(self._slave)
+        return None
+
+    async def async_start(self, link: str | None = DEFAULT_LINK) -> str:
+        """Open the pty, link it and start answering."""
+
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._master)
+        tty.setraw(self._slave)
+        os.set_blocking(self._master, False)
+
+        if link is not None:
+            os.makedirs(os.path.dirname(link), exist_ok=True)
+            if os.path.lexists(link):
+                os.remove(link)
+            os.symlink(os.ttyname(self._slave), link)
+            self._link = link
+
+        loop = asyncio.get_running_loop()
+        loop.add_reader(self._master, self._read)
+        self._writer = asyncio.create_task(self._async_write())
+
+        return self.port
+
+    async def async_stop(self) -> None:
+        """Stop answering and close the pty."""
+
+        if self._writer is not None:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+
+        for module in self.modules.values():
+            module.reset()
+
+        if self._master is not None:
+            asyncio.get_running_loop().remove_reader(self._master)
+            os.close(self._master)
+            os.close(self._slave)
+            self._master = self._slave = None
+
+        if self._link is not None:
+            os.remove(self._link)
+            self._link = None
+
+    def _read(self) -> None:
+        """Split what the client wrote into commands."""
+
+        try:
+            self._buffer += os.read(self._master, 4096)
+        except BlockingIOError:
+            return
+
+        *lines, self._buffer = self._buffer.split(b"\n")
+        for line in lines:
+            if command := line.decode(errors="replace").strip():
+                self.frames_in += 1
+                self._handle(command)
+
+    def _handle(self, command: str) -> None:
+        """Run a single command."""
+
+        name, _, payload = command.partition("=")
+        try:
+            args = [int(arg) for arg in payload.split(",")]
+        except ValueError:
+            _LOGGER.debug("Ignoring malformed command %s", command)
+            return
+
+        if (handler := self._handlers.get(name.upper())) is None:
+            _LOGGER.debug("Ignoring unsupported command %s", command)
+            return
+
+        handler(args)
+
+    def _module(self, module: int) -> VirtualModule | None:
+        """Return the module if it answers on the bus."""
+
+        if module in self.silent:
+            return None
+        return self.modules.get(module)
+
+    def send(self, frame: str) -> None:
+        """Queue an unsolicited or answer frame."""
+
+        self._outgoing.put_nowait(frame)
+
+    async def _async_write(self) -> None:
+        """Write queued frames one at a time, at the line speed."""
+
+        while True:
+            frame = await self._outgoing.get()
+            data = f"{frame}\r\n".encode()
+
+            await asyncio.sleep(self._response_delay + len(data) * self._byte_time)
+            try:
+                os.write(self._master, data)
+            except BlockingIOError:
+                _LOGGER.debug("Nobody is reading the port, dropped %s", frame)
+                continue
+            self.frames_out += 1
+
+    # Module answers.
+
+    def _send_inputs(self, module: VirtualModule) -> None:
+        self.send(f"{DriverFunctions.INPUTS}={module.id},{_states(module.inputs)}")
+
+    def _send_outputs(self, module: VirtualModule) -> None:
+        self.send(f"{DriverFunctions.OUTPUTS}={module.id},{_states(module.outputs)}")
+
+    def _send_shutters(self, module: VirtualModule) -> None:
+        self.send(f"{DriverFunctions.COVER}={module.id},{_states(module.shutters)}")
+
+    def _send_temperature(self, module: VirtualModule, pin: int) -> None:
+        whole, fraction = f"{module.temperatures[pin - 1]:.1f}".split(".")
+        self.send(f"{DriverFunctions.TEMP}={module.id},{pin},{whole},{fraction}")
+
+    def _set_out(self, args: list[int]) -> None:
+        if (module := self._module(args[0])) is None:
+            return
+
+        for pin, action in enumerate(args[1 : MODULE_PINS + 1], 1):
+            if action == 1:
+                module.outputs[pin - 1] = 1
+            elif action == 2:
+                module.outputs[pin - 1] = 0
+            elif action == 3:
+                module.outputs[pin - 1] ^= 1
+        self._send_outputs(module)
+
+    def _get_in_state(self, args: list[int]) -> None:
+        if (module := self._module(args[0])) is not None:
+            self._send_inputs(module)
+
+    def _get_out_state(self, args: list[int]) -> None:
+        if (module := self._module(args[0])) is not None:
+            self._send_outputs(module)
+
+    def _set_pwm(self, args: list[int]) -> None:
+        if (module := self._module(args[0])) is not None and 1 <= args[1] <= MODULE_PINS:
+            module.pwm[args[1] - 1] = max(0, min(100, args[2]))
+
+    def _get_pwm_state(self, args: list[int]) -> None:
+        if (module := self._module(args[0])) is None:
+            return
+
+        for pin, level in enumerate(module.pwm, 1):
+            self.send(f"{DriverFunctions.PWM}={module.id},{pin},{level}")
+
+    def _set_cover(self, args: list[int]) -> None:
+        if (module := self._module(args[0])) is None or len(args) != 7:
+            return
+
+        time, states, checksum = args[1], args[2:6], args[6]
+        if checksum != module.id + time + sum(states):
+            _LOGGER.debug("Bad checksum for module %s shutters", module.id)
+            return
+
+        loop = asyncio.get_running_loop()
+        for pin, operation in enumerate(states, 1):
+            if not operation:
+                continue
+
+            if (timer := module.shutter_timers.pop(pin, None)) is not None:
+                timer.cancel()
+
+            moving = module.shutters[pin - 1] != SHUTTER_STOPPED
+            if operation == ShutterStates.STEP_MODE:
+                if moving:
+                    operation = ShutterStates.STOP
+                elif module.last_direction.get(pin) == SHUTTER_OPENING:
+                    operation = ShutterStates.CLOSE
+                else:
+                    operation = ShutterStates.OPEN
+
+            if operation == ShutterStates.STOP:
+                module.shutters[pin - 1] = SHUTTER_STOPPED
+                continue
+
+            direction = SHUTTER_OPENING if operation == ShutterStates.OPEN else SHUTTER_CLOSING
+            module.shutters[pin - 1] = module.last_direction[pin] = direction
+            module.shutter_timers[pin] = loop.call_later(
+                time, self._stop_shutter, module, pin
+            )
+
+        self._send_shutters(module)
+
+    def _stop_shutter(self, module: VirtualModule, pin: int) -> None:
+        module.shutter_timers.pop(pin, None)
+        module.shutters[pin - 1] = SHUTTER_STOPPED
+        self._send_shutters(module)
+
+    def _get_shutter_state(self, args: list[int]) -> None:
+        if (module := self._module(args[0])) is not None:
+            self._send_shutters(module)
+
+    def _search(self, args: list[int]) -> None:
+        if len(args) > 1 and (module := self._module(args[1])) is not None:
+            mac = MODULE_MAC_BASE + module.id
+            self.send(f"{DriverFunctions.FIND}={module.id},{mac},{MODULE_MODEL}")
+
+    def _reset(self, args: list[int]) -> None:
+        for module in self.modules.values():
+            if args[0] in (0, module.id):
+                module.reset()
+
+    def _ping(self, args: list[int]) -> None:
+        if (module := self._module(args[0])) is not None:
+            self.send(f"{DriverFunctions.PONG}={module.id}")
+
+    # Scripted events.
+
+    def set_input(self, module: int, pin: int, state: int) -> None:
+        """Change an input and report it."""
+
+        if (virtual := self._module(module)) is None:
+            return
+
+        virtual.inputs[pin - 1] = state
+        self._send_inputs(virtual)
+
+    async def async_press(self, module: int, pin: int, long: bool = False) -> None:
+        """Press and release an input."""
+
+        self.set_input(module, pin, 1)
+        await asyncio.sleep(LONG_PRESS_TIME if long else PRESS_TIME)
+        self.set_input(module, pin, 0)
+
+        if self._module(module) is not None:
+            press = DriverFunctions.PRESS_LONG if long else DriverFunctions.PRESS_SHORT
+            self.send(f"{press}={module},{pin}")
+
+    def set_temperature(self, module: int, pin: int, value: float) -> None:
+        """Change a thermometer reading and report it."""
+
+        if (virtual := self._module(module)) is None:
+            return
+
+        virtual.temperatures[pin - 1] = value
+        self._send_temperature(virtual, pin)
+
+    async def async_run_script(self, lines: Iterable[str]) -> None:
+        """Run script lines, see the module docstring for the commands."""
+
+        for line in lines:
+            command, *args = line.split("#")[0].split() or [""]
+            if not command:
+                continue
+
+            if command == "sleep":
+                await asyncio.sleep(float(args[0]))
+            elif command == "input":
+                self.set_input(int(args[0]), int(args[1]), int(args[2]))
+            elif command == "press":
+                await self.async_press(int(args[0]), int(args[1]), args[2:] == ["long"])
+            elif command == "temp":
+                self.set_temperature(int(args[0]), int(args[1]), float(args[2]))
+            elif command == "silent":
+                self.silent.add(int(args[0]))
+            elif command == "answer":
+                self.silent.discard(int(args[0]))
+            else:
+                _LOGGER.warning("Unknown script command: %s", line.strip())
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    emulator = GryfBusEmulator(args.modules, args.delay)
+    port = await emulator.async_start(args.link)
+    print(f"Emulating {args.modules} modules on {port}", flush=True)
+
+    try:
+        if args.script:
+            with open(args.script, encoding="utf-8") as script:
+                await emulator.async_run_script(script.readlines())
+        await asyncio.Event().wait()
+    finally:
+        await emulator.async_stop()
+
+
+def main() -> None:
+    """Run the emulator from the command line."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", type=int, default=8, help="number of modules")
+    parser.add_argument("--link", default=DEFAULT_LINK, help="path of the port symlink")
+    parser.add_argument(
+        "--delay", type=float, default=RESPONSE_DELAY, help="module response delay (s)"
+    )
+    parser.add_argument("--script", help="file with input events to play")
+    parser.add_argument("--verbose", action="store_true", help="log every command")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+    try:
+        asyncio.run(_async_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()